@@ -4,16 +4,18 @@ FastAPI dependencies (DB sessions, etc.).
 
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session
 
-from scraper.storage.connection import get_engine
+from scraper.storage.connection import get_async_engine, get_engine
 
-# Reuse the same engine/session factory from scraper
-_engine = get_engine()
+# The API gets its own engine profile (larger pool, pre-ping)
+_engine = get_engine("api")
 _SessionLocal = None
+_AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
 
 def get_session_local():
     """Lazy initialization of session factory."""
@@ -42,5 +44,27 @@ def get_db() -> Session:
         session.close()
 
 
-# Type alias for convenience in route handlers
-DbSession = Annotated[Session, Depends(get_db)]
\ No newline at end of file
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency that provides an async database session.
+
+    Used by the async route handlers so queries don't hold a threadpool
+    worker; committed on success, rolled back on error.
+    """
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine("api"), autoflush=False, expire_on_commit=False
+        )
+    async with _AsyncSessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+# Type aliases for convenience in route handlers
+DbSession = Annotated[Session, Depends(get_db)]
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
@@ -7,18 +7,18 @@ from __future__ import annotations
 from fastapi import APIRouter, HTTPException
 from urllib.parse import unquote
 
-from app.dependencies import DbSession
+from app.dependencies import AsyncDbSession
 from app.schemas.card import CardUpdate
-from app.services.card_service import toggle_card_in_club
+from app.services.card_service import toggle_card_in_club_async
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
 
 @router.patch("/{card_slug:path}/club", status_code=204)
-def update_card_club_status(
+async def update_card_club_status(
     card_slug: str,
     update: CardUpdate,
-    db: DbSession,
+    db: AsyncDbSession,
 ) -> None:
     """
     Toggle a card's in_club status.
@@ -30,7 +30,7 @@ def update_card_club_status(
     """
     # Decode URL-encoded characters (like %2F -> /)
     card_slug = unquote(card_slug)
-    success = toggle_card_in_club(db, card_slug, update.in_club)
+    success = await toggle_card_in_club_async(db, card_slug, update.in_club)
     if not success:
         raise HTTPException(
             status_code=404, detail=f"Card with slug '{card_slug}' not found"
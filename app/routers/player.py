@@ -6,21 +6,21 @@ from __future__ import annotations
 
 from fastapi import APIRouter, HTTPException
 
-from app.dependencies import DbSession
+from app.dependencies import AsyncDbSession
 from app.schemas.player import PlayerDetail
-from app.services.player_service import get_player_by_slug
+from app.services.player_service import get_player_by_slug_async
 
 router = APIRouter(prefix="/players", tags=["players"])
 
 
 @router.get("/{slug}", response_model=PlayerDetail)
-def get_player(slug: str, db: DbSession) -> PlayerDetail:
+async def get_player(slug: str, db: AsyncDbSession) -> PlayerDetail:
     """
     Get detailed information about a specific player including all their cards.
     
     - **slug**: Player slug identifier (e.g., "ronald-araujo")
     """
-    player = get_player_by_slug(db, slug)
+    player = await get_player_by_slug_async(db, slug)
     if not player:
         raise HTTPException(status_code=404, detail=f"Player with slug '{slug}' not found")
     return player
\ No newline at end of file
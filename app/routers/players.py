@@ -8,39 +8,63 @@ from typing import Literal
 
 from fastapi import APIRouter, Query
 
-from app.dependencies import DbSession
-from app.schemas.player import PlayerListItem
-from app.services.player_service import get_players_list, get_player_counts
+from app.dependencies import AsyncDbSession
+from app.schemas.player import PlayerListItem, PlayerSuggestion
+from app.services.player_service import (
+    get_player_counts_async,
+    get_players_list_async,
+    suggest_players_async,
+)
 
 router = APIRouter(prefix="/players", tags=["players"])
 
 
 @router.get("", response_model=list[PlayerListItem])
-def list_players(
-    db: DbSession,
+async def list_players(
+    db: AsyncDbSession,
     search: str | None = Query(None, description="Search players by name (accent-insensitive)"),
     in_club: Literal["all", "in_club", "not_in_club"] | None = Query(
         "all", description="Filter by in_club status"
     ),
-    sort: Literal["asc", "desc"] = Query("desc", description="Sort by base card rating"),
+    sort: Literal["asc", "desc"] = Query("desc", description="Sort direction"),
+    sort_by: Literal["rating", "completion"] = Query(
+        "rating", description="Sort by base card rating or by share of cards in club"
+    ),
 ) -> list[PlayerListItem]:
     """
     Get list of all players with optional search, filtering, and sorting.
     
     - **search**: Search term for player names (case and accent insensitive)
     - **in_club**: Filter to show only players with cards in club, without, or all
-    - **sort**: Sort order by base card rating (ascending or descending)
+    - **sort**: Sort order (ascending or descending)
+    - **sort_by**: Sort key, base card rating or completion (cards in club / total cards)
     """
     in_club_filter = in_club if in_club != "all" else None
-    return get_players_list(
+    return await get_players_list_async(
         db,
         search=search,
         in_club_filter=in_club_filter,
         sort_by_rating=sort,
+        sort_by=sort_by,
     )
 
+@router.get("/suggest", response_model=list[PlayerSuggestion])
+async def suggest_players_endpoint(
+    db: AsyncDbSession,
+    q: str = Query(..., min_length=1, description="Partial player name as typed"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+) -> list[PlayerSuggestion]:
+    """
+    Typeahead suggestions for the search box, served from memory.
+    
+    - **q**: Partial name (case and accent insensitive, small typos tolerated)
+    - **limit**: Maximum number of suggestions
+    """
+    return await suggest_players_async(db, q, limit)
+
+
 @router.get("/counts")
-def get_player_counts_endpoint(db: DbSession) -> dict[str, int]:
+async def get_player_counts_endpoint(db: AsyncDbSession) -> dict[str, int]:
     """
     Get total player count and count of players with any_in_club=True.
     
@@ -48,4 +72,4 @@ def get_player_counts_endpoint(db: DbSession) -> dict[str, int]:
     - total: Total number of players
     - in_club: Number of players with any_in_club=True
     """
-    return get_player_counts(db)
\ No newline at end of file
+    return await get_player_counts_async(db)
\ No newline at end of file
@@ -26,6 +26,13 @@ class PlayerListItem(BaseModel):
     #     from_attributes = True
 
 
+class PlayerSuggestion(BaseModel):
+    """Typeahead match for the search box."""
+
+    slug: str
+    display_name: str
+
+
 class PlayerDetail(BaseModel):
     """Player representation for the detail page."""
 
@@ -1,10 +1,30 @@
 """Business logic services."""
 
-from .card_service import toggle_card_in_club
-from .player_service import get_player_by_slug, get_players_list
+from .card_service import toggle_card_in_club, toggle_card_in_club_async
+from .player_service import (
+    get_player_by_slug,
+    get_player_by_slug_async,
+    get_player_counts,
+    get_player_counts_async,
+    get_players_list,
+    get_players_list_async,
+    load_name_index,
+    load_name_index_async,
+    suggest_players,
+    suggest_players_async,
+)
 
 __all__ = [
     "get_players_list",
+    "get_players_list_async",
     "get_player_by_slug",
-    "toggle_card_in_clard",
-]
\ No newline at end of file
+    "get_player_by_slug_async",
+    "get_player_counts",
+    "get_player_counts_async",
+    "load_name_index",
+    "load_name_index_async",
+    "suggest_players",
+    "suggest_players_async",
+    "toggle_card_in_club",
+    "toggle_card_in_club_async",
+]
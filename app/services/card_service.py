@@ -5,6 +5,7 @@ Card operations business logic.
 from __future__ import annotations
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from scraper.models import PlayerCard
@@ -35,24 +36,29 @@ def toggle_card_in_club(db: Session, card_slug: str, in_club: bool) -> bool:
     card.in_club = in_club
     db.commit()
     
-    # Update player's any_in_club flag
+    # Update player's any_in_club flag; the card counters follow through
+    # the player_cards triggers.
     from scraper.storage.upserts import _refresh_any_in_club
-    from scraper.storage.payloads import CardPayload
-    
-    # Create a minimal payload just to trigger the refresh
-    # We only need player_slug for the refresh logic
-    dummy_payload = CardPayload(
-        player_slug=card.player.slug,
-        display_name=card.player.display_name,
-        card_slug=card.card_slug,
-        name=card.name,
-        rating=card.rating,
-        version=card.version,
-        card_url=card.card_url,
-        image_url=card.image_url,
-        in_club=in_club,
-    )
-    _refresh_any_in_club(db, [dummy_payload])
+
+    _refresh_any_in_club(db, [card.player_id])
     db.commit()
     
-    return True
\ No newline at end of file
+    return True
+
+
+async def toggle_card_in_club_async(db: AsyncSession, card_slug: str, in_club: bool) -> bool:
+    """Async version of :func:`toggle_card_in_club`."""
+    card = await db.scalar(select(PlayerCard).where(PlayerCard.card_slug == card_slug))
+    if not card:
+        return False
+
+    player_id = card.player_id
+    card.in_club = in_club
+    await db.commit()
+
+    from scraper.storage.upserts import _refresh_any_in_club
+
+    await db.run_sync(lambda session: _refresh_any_in_club(session, [player_id]))
+    await db.commit()
+
+    return True
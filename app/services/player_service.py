@@ -1,16 +1,23 @@
 """
 Player query and business logic.
+
+Each query has a sync version (scraper, scripts) and an async version used
+by the API routes; both build the same statements.
 """
 
 from __future__ import annotations
 
-from typing import Literal
+import time
+from typing import Literal, Sequence
 
-from sqlalchemy import func, or_, select, Integer, inspect
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.schemas.player import PlayerDetail, PlayerListItem
-from scraper.models import Player, PlayerCard
+from app.schemas.player import PlayerDetail, PlayerListItem, PlayerSuggestion
+from scraper.models import Player, PlayerCard, completion_ratio
+from scraper.name_index import NameIndex, current_name_index, set_name_index
+from scraper.names import fold_name
 
 
 def get_players_list(
@@ -19,6 +26,7 @@ def get_players_list(
     search: str | None = None,
     in_club_filter: Literal["all", "in_club", "not_in_club"] | None = None,
     sort_by_rating: Literal["asc", "desc"] = "desc",
+    sort_by: Literal["rating", "completion"] = "rating",
 ) -> list[PlayerListItem]:
     """
     Get paginated list of players with filters and sorting.
@@ -32,29 +40,53 @@ def get_players_list(
     in_club_filter
         Filter by any_in_club status
     sort_by_rating
-        Sort order by base_card_rating
+        Sort direction
+    sort_by
+        Sort key: base_card_rating, or the share of cards in club
+        (indexed, read from the maintained counters)
     """
+    query = _players_query(
+        search=search,
+        in_club_filter=in_club_filter,
+        sort_by_rating=sort_by_rating,
+        sort_by=sort_by,
+    )
+    return [_list_item(player) for player in db.scalars(query).all()]
+
+
+async def get_players_list_async(
+    db: AsyncSession,
+    *,
+    search: str | None = None,
+    in_club_filter: Literal["all", "in_club", "not_in_club"] | None = None,
+    sort_by_rating: Literal["asc", "desc"] = "desc",
+    sort_by: Literal["rating", "completion"] = "rating",
+) -> list[PlayerListItem]:
+    """Async version of :func:`get_players_list`."""
+    query = _players_query(
+        search=search,
+        in_club_filter=in_club_filter,
+        sort_by_rating=sort_by_rating,
+        sort_by=sort_by,
+    )
+    return [_list_item(player) for player in (await db.scalars(query)).all()]
+
+
+def _players_query(
+    *,
+    search: str | None,
+    in_club_filter: Literal["all", "in_club", "not_in_club"] | None,
+    sort_by_rating: Literal["asc", "desc"],
+    sort_by: Literal["rating", "completion"],
+) -> Select:
     query = select(Player)
     
-    # Apply search filter (accent-insensitive)
-    # Apply search filter (accent-insensitive)
+    # Apply search filter: search_name holds the folded display name
+    # (trigram-indexed on PostgreSQL), so fold the term the same way.
     if search:
-        search_normalized = search.lower().strip()
-        # Check if database supports unaccent (PostgreSQL only)
-        dialect_name = inspect(db.bind).dialect.name
-        
-        if dialect_name == "postgresql":
-            # Use unaccent for PostgreSQL
-            query = query.where(
-                func.unaccent(func.lower(Player.display_name)).contains(
-                    func.unaccent(search_normalized)
-                )
-            )
-        else:
-            # Fallback for SQLite and other databases
-            query = query.where(
-                func.lower(Player.display_name).contains(search_normalized)
-            )
+        search_folded = fold_name(search)
+        if search_folded:
+            query = query.where(Player.search_name.contains(search_folded, autoescape=True))
     
     # Apply in_club filter
     if in_club_filter == "in_club":
@@ -63,40 +95,23 @@ def get_players_list(
         query = query.where(Player.any_in_club == False)
     
     # Apply sorting
+    sort_key = completion_ratio if sort_by == "completion" else Player.base_card_rating
     if sort_by_rating == "desc":
-        query = query.order_by(Player.base_card_rating.desc().nulls_last())
-    else:
-        query = query.order_by(Player.base_card_rating.asc().nulls_last())
-    
-    players = db.scalars(query).all()
-    
-    # Build response with card counts
-    result = []
-    for player in players:
-        # Count cards
-        card_counts = db.execute(
-            select(
-                func.count(PlayerCard.id).label("total"),
-                func.sum(func.cast(PlayerCard.in_club, Integer)).label("in_club"),
-            ).where(PlayerCard.player_id == player.id)
-        ).one()
-        
-        total_cards = card_counts.total or 0
-        in_club_count = int(card_counts.in_club or 0)
-        
-        result.append(
-            PlayerListItem(
-                slug=player.slug,
-                display_name=player.display_name,
-                base_card_image_url=player.base_card_image_url,
-                base_card_rating=player.base_card_rating,
-                any_in_club=player.any_in_club,
-                in_club_count=in_club_count,
-                total_cards=total_cards,
-            )
-        )
-    
-    return result
+        return query.order_by(sort_key.desc().nulls_last())
+    return query.order_by(sort_key.asc().nulls_last())
+
+
+def _list_item(player: Player) -> PlayerListItem:
+    # Card counts are maintained on the players row
+    return PlayerListItem(
+        slug=player.slug,
+        display_name=player.display_name,
+        base_card_image_url=player.base_card_image_url,
+        base_card_rating=player.base_card_rating,
+        any_in_club=player.any_in_club,
+        in_club_count=player.in_club_count,
+        total_cards=player.total_cards,
+    )
 
 
 def get_player_by_slug(db: Session, slug: str) -> PlayerDetail | None:
@@ -113,35 +128,37 @@ def get_player_by_slug(db: Session, slug: str) -> PlayerDetail | None:
     player = db.scalar(select(Player).where(Player.slug == slug))
     if not player:
         return None
-    
-    # Get all cards for this player
-    cards = db.scalars(
+    return _player_detail(player, db.scalars(_cards_query(player.id)).all())
+
+
+async def get_player_by_slug_async(db: AsyncSession, slug: str) -> PlayerDetail | None:
+    """Async version of :func:`get_player_by_slug`."""
+    player = await db.scalar(select(Player).where(Player.slug == slug))
+    if not player:
+        return None
+    return _player_detail(player, (await db.scalars(_cards_query(player.id))).all())
+
+
+def _cards_query(player_id: int) -> Select:
+    return (
         select(PlayerCard)
-        .where(PlayerCard.player_id == player.id)
+        .where(PlayerCard.player_id == player_id)
         .order_by(PlayerCard.rating.asc(), PlayerCard.version)
-    ).all()
-    
-    # Count in_club cards
-    card_counts = db.execute(
-        select(
-            func.count(PlayerCard.id).label("total"),
-            func.sum(func.cast(PlayerCard.in_club, Integer)).label("in_club"),
-        ).where(PlayerCard.player_id == player.id)
-    ).one()
-    
-    total_cards = card_counts.total or 0
-    in_club_count = int(card_counts.in_club or 0)
-    
+    )
+
+
+def _player_detail(player: Player, cards: Sequence[PlayerCard]) -> PlayerDetail:
     from app.schemas.card import Card
     
     return PlayerDetail(
         slug=player.slug,
         display_name=player.display_name,
-        in_club_count=in_club_count,
-        total_cards=total_cards,
+        in_club_count=player.in_club_count,
+        total_cards=player.total_cards,
         cards=[Card.model_validate(card) for card in cards],
     )
 
+
 def get_player_counts(db: Session) -> dict[str, int]:
     """
     Get total count of players and count of players with any_in_club=True.
@@ -157,12 +174,126 @@ def get_player_counts(db: Session) -> dict[str, int]:
         - total: Total number of players
         - in_club: Number of players with any_in_club=True
     """
-    total = db.scalar(select(func.count(Player.id)))
-    in_club = db.scalar(
-        select(func.count(Player.id)).where(Player.any_in_club == True)
-    )
-    
+    total = db.scalar(_TOTAL_PLAYERS)
+    in_club = db.scalar(_IN_CLUB_PLAYERS)
     return {
         "total": total or 0,
         "in_club": in_club or 0,
-    }
\ No newline at end of file
+    }
+
+
+async def get_player_counts_async(db: AsyncSession) -> dict[str, int]:
+    """Async version of :func:`get_player_counts`."""
+    total = await db.scalar(_TOTAL_PLAYERS)
+    in_club = await db.scalar(_IN_CLUB_PLAYERS)
+    return {
+        "total": total or 0,
+        "in_club": in_club or 0,
+    }
+
+
+_TOTAL_PLAYERS = select(func.count(Player.id))
+_IN_CLUB_PLAYERS = select(func.count(Player.id)).where(Player.any_in_club == True)
+
+
+# How often (seconds) the suggest endpoint checks whether players changed
+# since the name index was built, e.g. by a CLI scrape in another process.
+NAME_INDEX_RECHECK_SECONDS = 60.0
+
+_name_index_signature: tuple | None = None
+_name_index_checked_at = 0.0
+
+
+def load_name_index(db: Session) -> NameIndex:
+    """
+    Build the in-memory name index from every player and make it current.
+
+    Called after each scrape in this process; scrapes elsewhere are picked up
+    by the periodic check in :func:`suggest_players`.
+    """
+    signature = tuple(db.execute(_NAME_INDEX_SIGNATURE).one())
+    index = NameIndex(db.execute(_PLAYER_NAMES).all())
+    set_name_index(index)
+    _mark_name_index_checked(signature)
+    return index
+
+
+async def load_name_index_async(db: AsyncSession) -> NameIndex:
+    """Async version of :func:`load_name_index`."""
+    signature = tuple((await db.execute(_NAME_INDEX_SIGNATURE)).one())
+    index = NameIndex((await db.execute(_PLAYER_NAMES)).all())
+    set_name_index(index)
+    _mark_name_index_checked(signature)
+    return index
+
+
+def suggest_players(db: Session, query: str, limit: int = 10) -> list[PlayerSuggestion]:
+    """
+    Typeahead suggestions for ``query`` from the in-memory name index.
+
+    Matching is accent- and case-insensitive on display names and slugs and
+    tolerates small typos. The database is only queried to build the index
+    and, at most every ``NAME_INDEX_RECHECK_SECONDS``, to compare the player
+    count and latest ``updated_at`` with the ones the index was built from;
+    the index is rebuilt when they differ.
+
+    Parameters
+    ----------
+    db
+        Database session, used to build and revalidate the index
+    query
+        Partial player name as typed
+    limit
+        Maximum number of suggestions
+    """
+    index = current_name_index()
+    if index is None:
+        index = load_name_index(db)
+    elif _name_index_due():
+        signature = tuple(db.execute(_NAME_INDEX_SIGNATURE).one())
+        if signature != _name_index_signature:
+            index = load_name_index(db)
+        else:
+            _mark_name_index_checked(signature)
+    return _suggestions(index, query, limit)
+
+
+async def suggest_players_async(
+    db: AsyncSession, query: str, limit: int = 10
+) -> list[PlayerSuggestion]:
+    """Async version of :func:`suggest_players`."""
+    index = current_name_index()
+    if index is None:
+        index = await load_name_index_async(db)
+    elif _name_index_due():
+        signature = tuple((await db.execute(_NAME_INDEX_SIGNATURE)).one())
+        if signature != _name_index_signature:
+            index = await load_name_index_async(db)
+        else:
+            _mark_name_index_checked(signature)
+    return _suggestions(index, query, limit)
+
+
+def _name_index_due() -> bool:
+    return time.monotonic() - _name_index_checked_at >= NAME_INDEX_RECHECK_SECONDS
+
+
+def _mark_name_index_checked(signature: tuple) -> None:
+    global _name_index_signature, _name_index_checked_at
+    _name_index_signature = signature
+    _name_index_checked_at = time.monotonic()
+
+
+def _suggestions(index: NameIndex, query: str, limit: int) -> list[PlayerSuggestion]:
+    return [
+        PlayerSuggestion(slug=match.slug, display_name=match.display_name)
+        for match in index.suggest(query, limit)
+    ]
+
+
+_PLAYER_NAMES = select(Player.slug, Player.display_name)
+# Changes when players are inserted (count, max id) or renamed (updated_at).
+# Archiving cards leaves names alone, so it does not affect the index.
+_NAME_INDEX_SIGNATURE = select(
+    func.count(Player.id), func.max(Player.id), func.max(Player.updated_at)
+)
@@ -7,7 +7,9 @@ from __future__ import annotations
 import logging
 import threading
 
+from app.services.player_service import load_name_index
 from scraper.main import main
+from scraper.storage import session_scope
 
 logger = logging.getLogger("ScrapeFutGG")
 
@@ -27,18 +29,28 @@ def run_scraper_task() -> None:
     Background task that runs the scraper.
     
     This function is called by FastAPI's BackgroundTasks and runs
-    the scraper's main() function to update the database.
+    the scraper's main() function to update the database. The HTTP session
+    is shared across runs so its connections stay warm. The in-memory name
+    index is rebuilt afterwards so suggestions include new players.
     """
     global _is_scraping
     try:
         with _scraping_lock:
             _is_scraping = True
         logger.info("Starting background scrape task")
-        main()
+        main(reuse_session=True)
+        rebuild_name_index()
         logger.info("Background scrape task completed successfully")
     except Exception as exc:
         logger.error("Background scrape task failed: %s", exc, exc_info=True)
         raise
     finally:
         with _scraping_lock:
-            _is_scraping = False
\ No newline at end of file
+            _is_scraping = False
+
+
+def rebuild_name_index() -> None:
+    """Reload the suggest endpoint's name index from the database."""
+    with session_scope() as session:
+        index = load_name_index(session)
+    logger.info("Rebuilt player name index (%s players)", len(index))
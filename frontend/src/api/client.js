@@ -75,6 +75,21 @@ export const getPlayers = async ({ search, in_club = 'all', sort = 'desc' } = {}
   return response.data;
 };
 
+/**
+ * Get typeahead suggestions for a partial player name.
+ *
+ * Served from the API's in-memory name index, so it is cheap to call on
+ * every keystroke.
+ *
+ * @param {string} q - Partial player name as typed
+ * @param {number} [limit=10] - Maximum number of suggestions
+ * @returns {Promise<Array>} Array of {slug, display_name} objects
+ */
+export const suggestPlayers = async (q, limit = 10) => {
+  const response = await apiClient.get('/players/suggest', { params: { q, limit } });
+  return response.data;
+};
+
 /**
  * Get detailed information about a specific player including all their cards.
  * 
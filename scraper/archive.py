@@ -0,0 +1,166 @@
+"""
+Compressed, append-only archive of raw listing pages for offline replay.
+
+Each run writes one data file holding zlib-compressed page bodies back to
+back, plus a JSON-lines index (``<archive>.idx``) mapping each page number
+to its offset and length in the data file. Both files are only ever
+appended to, so an interrupted run still leaves a readable archive.
+
+Readers memory-map the data file and decompress one page at a time, which
+lets ``python -m scraper.main --replay <archive>`` push recorded pages
+through the parser and storage at disk speed.
+
+Existing HTML files (e.g. ``tests/fixtures/live_page.html``) can be packed
+into an archive with::
+
+    python -m scraper.archive pack out.htmlz page1.html page2.html
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator, TextIO
+
+ARCHIVE_SUFFIX = ".htmlz"
+INDEX_SUFFIX = ".idx"
+_COMPRESSION_LEVEL = 6
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    page_number: int
+    url: str
+    offset: int
+    length: int
+    size: int
+    encoding: str
+
+
+def index_path_for(archive_path: Path) -> Path:
+    return archive_path.with_name(archive_path.name + INDEX_SUFFIX)
+
+
+def new_archive_path(directory: Path) -> Path:
+    """Return a fresh per-run archive path inside ``directory``."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return directory / f"pages-{stamp}{ARCHIVE_SUFFIX}"
+
+
+class PageArchiveWriter:
+    """Append compressed page bodies to an archive file and its index."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._data: BinaryIO = open(self.path, "ab")
+        self._index: TextIO = open(index_path_for(self.path), "a", encoding="utf-8")
+        self.pages_written = 0
+
+    def append(self, page_number: int, url: str, body: bytes, encoding: str | None) -> ArchiveEntry:
+        compressed = zlib.compress(body, _COMPRESSION_LEVEL)
+        entry = ArchiveEntry(
+            page_number=page_number,
+            url=url,
+            offset=self._data.tell(),
+            length=len(compressed),
+            size=len(body),
+            encoding=encoding or "utf-8",
+        )
+        self._data.write(compressed)
+        self._data.flush()
+        # The index line goes out only after its bytes are in the data file.
+        self._index.write(json.dumps(asdict(entry)) + "\n")
+        self._index.flush()
+        self.pages_written += 1
+        return entry
+
+    def close(self) -> None:
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> "PageArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class PageArchiveReader:
+    """Read pages back from an archive through a memory map."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        entries: dict[int, ArchiveEntry] = {}
+        with open(index_path_for(self.path), encoding="utf-8") as index:
+            for line in index:
+                if line.strip():
+                    entry = ArchiveEntry(**json.loads(line))
+                    entries[entry.page_number] = entry
+        self.entries = [entries[number] for number in sorted(entries)]
+
+        self._file = open(self.path, "rb")
+        self._map: mmap.mmap | None = None
+        if self.entries:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def read_bytes(self, entry: ArchiveEntry) -> bytes:
+        assert self._map is not None
+        return zlib.decompress(self._map[entry.offset : entry.offset + entry.length])
+
+    def read(self, entry: ArchiveEntry) -> str:
+        return self.read_bytes(entry).decode(entry.encoding, errors="replace")
+
+    def iter_pages(self) -> Iterator[tuple[int, str]]:
+        """Yield (page_number, html) in page order."""
+        for entry in self.entries:
+            yield entry.page_number, self.read(entry)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PageArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def pack_html_files(archive_path: Path, html_files: list[Path]) -> int:
+    """Build an archive from saved HTML files, numbering pages in argument order."""
+    with PageArchiveWriter(archive_path) as writer:
+        for page_number, html_file in enumerate(html_files, start=1):
+            writer.append(page_number, html_file.resolve().as_uri(), html_file.read_bytes(), "utf-8")
+        return writer.pages_written
+
+
+def _cli(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m scraper.archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack = commands.add_parser("pack", help="Pack saved HTML pages into an archive")
+    pack.add_argument("archive", type=Path)
+    pack.add_argument("html_files", type=Path, nargs="+")
+
+    listing = commands.add_parser("list", help="Show the pages stored in an archive")
+    listing.add_argument("archive", type=Path)
+
+    args = parser.parse_args(argv)
+    if args.command == "pack":
+        written = pack_html_files(args.archive, args.html_files)
+        print(f"Packed {written} pages into {args.archive}")
+    else:
+        with PageArchiveReader(args.archive) as reader:
+            for entry in reader.entries:
+                print(f"{entry.page_number:>4}  {entry.size:>9} -> {entry.length:>8} bytes  {entry.url}")
+
+
+if __name__ == "__main__":
+    _cli()
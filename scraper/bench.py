@@ -0,0 +1,284 @@
+"""
+Offline benchmarks for the scrape pipeline.
+
+    python -m scraper.bench parser [--engine lxml] [--repeat 5] [--scale 4] [--output run.json]
+    python -m scraper.bench compare before.json after.json
+    python -m scraper.bench payloads [--cards 1000]
+
+``parser`` runs ``parse_cards`` repeatedly over the bundled listing fixtures
+and a synthetic page made of ``--scale`` copies of ``sample_page.html`` (with
+card slugs rewritten so every copy yields new cards), once per engine. For
+each page it reports MB/s, cards/s, p50/p95 per-page latency, the peak of
+Python allocations while parsing and the peak RSS growth of a fresh process
+parsing the page once (libxml2 memory is only visible there). ``compare``
+prints the throughput and latency ratios between two saved ``parser`` runs.
+
+``payloads`` parses the bundled listing fixtures until ``--cards`` cards are
+held in memory and reports, per 1,000 cards, the bytes still allocated, the
+number of live allocations, the allocations made while parsing and the
+pickled size (what a parse worker process sends back). Results are printed
+as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import multiprocessing
+import pickle
+import platform
+import re
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .parser import etree, parse_cards
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "tests" / "fixtures"
+FIXTURE_PAGES = ("sample_page.html", "live_page.html")
+PARSER_ENGINES = ("lxml", "stream", "bs4")
+_CARD_HREF_BYTES_RE = re.compile(rb"""(href=["']/players/[^/"']+/[^/"']+)/""")
+
+
+def load_fixture_pages(directory: Path = FIXTURES_DIR) -> list[bytes]:
+    return [(directory / name).read_bytes() for name in FIXTURE_PAGES]
+
+
+def enlarge_page(html: bytes, factor: int) -> bytes:
+    """
+    Return ``html`` with its body repeated ``factor`` times.
+
+    Card hrefs in each extra copy get a ``-<copy>`` suffix on the card id so
+    the parsers do not collapse the copies as duplicates.
+    """
+    body_tag = html.find(b"<body")
+    body_start = html.find(b">", body_tag) + 1 if body_tag != -1 else 0
+    body_end = html.rfind(b"</body>")
+    if body_end < body_start:
+        body_end = len(html)
+    body = html[body_start:body_end]
+
+    copies = [body]
+    for copy in range(1, factor):
+        suffix = b"-%d/" % copy
+        copies.append(_CARD_HREF_BYTES_RE.sub(lambda match: match.group(1) + suffix, body))
+    return html[:body_start] + b"".join(copies) + html[body_end:]
+
+
+def benchmark_pages(directory: Path = FIXTURES_DIR, scale: int = 4) -> dict[str, bytes]:
+    """The fixture pages by name, plus the synthetic ``sample_page.html x<scale>``."""
+    pages = dict(zip(FIXTURE_PAGES, load_fixture_pages(directory)))
+    if scale > 1:
+        pages[f"{FIXTURE_PAGES[0]} x{scale}"] = enlarge_page(pages[FIXTURE_PAGES[0]], scale)
+    return pages
+
+
+def available_engines() -> tuple[str, ...]:
+    return PARSER_ENGINES if etree is not None else ("bs4",)
+
+
+def bench_parser(
+    pages: dict[str, bytes],
+    engines: tuple[str, ...] | None = None,
+    repeat: int = 5,
+    measure_rss: bool = True,
+) -> dict[str, Any]:
+    """Time ``parse_cards`` on every page with every engine."""
+    results = []
+    for engine in engines or available_engines():
+        for name, html in pages.items():
+            results.append(_bench_page(engine, name, html, repeat, measure_rss))
+    return {
+        "benchmark": "parser",
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _bench_page(
+    engine: str, name: str, html: bytes, repeat: int, measure_rss: bool
+) -> dict[str, Any]:
+    cards = len(parse_cards(html, engine=engine))  # warm-up, also the card count
+
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse_cards(html, engine=engine)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    total = sum(latencies)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        parse_cards(html, engine=engine)
+        _, peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "engine": engine,
+        "page": name,
+        "bytes": len(html),
+        "cards": cards,
+        "mb_per_s": round(len(html) * repeat / total / 1e6, 2),
+        "cards_per_s": round(cards * repeat / total, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "peak_traced_bytes": peak_traced,
+        "peak_rss_growth_bytes": _peak_rss_growth(engine, html) if measure_rss else None,
+    }
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _peak_rss_growth(engine: str, html: bytes) -> int | None:
+    """Peak RSS growth of a fresh process parsing ``html`` once."""
+    if resource is None:
+        return None
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_parse_and_report_rss, engine, html).result()
+
+
+def _parse_and_report_rss(engine: str, html: bytes) -> int:
+    before = _max_rss_bytes()
+    parse_cards(html, engine=engine)
+    return _max_rss_bytes() - before
+
+
+def _max_rss_bytes() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if platform.system() == "Darwin" else usage * 1024
+
+
+def compare_parser_runs(before: dict[str, Any], after: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Ratios between two ``bench_parser`` results, per engine and page.
+
+    ``speedup`` is the MB/s ratio (above 1 means ``after`` is faster); the
+    latency and memory ratios are ``after / before`` (below 1 is better).
+    """
+    baseline = {(row["engine"], row["page"]): row for row in before["results"]}
+    rows = []
+    for row in after["results"]:
+        old = baseline.get((row["engine"], row["page"]))
+        if old is None:
+            continue
+        rows.append(
+            {
+                "engine": row["engine"],
+                "page": row["page"],
+                "speedup": _ratio(row["mb_per_s"], old["mb_per_s"]),
+                "p50_ratio": _ratio(row["p50_ms"], old["p50_ms"]),
+                "p95_ratio": _ratio(row["p95_ms"], old["p95_ms"]),
+                "peak_traced_ratio": _ratio(row["peak_traced_bytes"], old["peak_traced_bytes"]),
+                "peak_rss_ratio": _ratio(
+                    row["peak_rss_growth_bytes"], old["peak_rss_growth_bytes"]
+                ),
+            }
+        )
+    return rows
+
+
+def _ratio(new: float | None, old: float | None) -> float | None:
+    if not new or not old:
+        return None
+    return round(new / old, 3)
+
+
+def bench_payloads(pages: list[bytes], cards: int = 1000) -> dict[str, Any]:
+    """Measure the memory held by ``cards`` parsed payloads."""
+    parse_cards(pages[0])  # warm up imports and the intern table
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        kept = []
+        page = 0
+        while len(kept) < cards:
+            kept.extend(parse_cards(pages[page % len(pages)]))
+            page += 1
+        gc.collect()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = snapshot.statistics("filename")
+    per_thousand = 1000 / len(kept)
+    return {
+        "benchmark": "payloads",
+        "cards": len(kept),
+        "pages_parsed": page,
+        "bytes_per_1000_cards": round(sum(stat.size for stat in stats) * per_thousand),
+        "live_allocations_per_1000_cards": round(sum(stat.count for stat in stats) * per_thousand),
+        "peak_bytes_while_parsing": peak,
+        "pickled_bytes_per_1000_cards": round(len(pickle.dumps(kept)) * per_thousand),
+    }
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scraper.bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parse = commands.add_parser("parser", help="Parser throughput, latency and memory")
+    parse.add_argument(
+        "--engine",
+        action="append",
+        choices=PARSER_ENGINES,
+        help="Engine to run (repeatable; default: all available)",
+    )
+    parse.add_argument("--repeat", type=int, default=5, help="Timed parses per page")
+    parse.add_argument(
+        "--scale", type=int, default=4, help="Copies of sample_page.html in the synthetic page"
+    )
+    parse.add_argument("--no-rss", action="store_true", help="Skip the per-process RSS probe")
+    parse.add_argument("--output", type=Path, help="Also write the JSON result to this file")
+
+    compare = commands.add_parser("compare", help="Compare two saved parser runs")
+    compare.add_argument("before", type=Path)
+    compare.add_argument("after", type=Path)
+
+    payloads = commands.add_parser("payloads", help="Memory held by parsed card payloads")
+    payloads.add_argument("--cards", type=int, default=1000, help="Cards to keep in memory")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    if args.command == "parser":
+        result = bench_parser(
+            benchmark_pages(scale=args.scale),
+            engines=tuple(args.engine) if args.engine else None,
+            repeat=args.repeat,
+            measure_rss=not args.no_rss,
+        )
+    elif args.command == "compare":
+        result = compare_parser_runs(
+            json.loads(args.before.read_text()), json.loads(args.after.read_text())
+        )
+    else:
+        result = bench_payloads(load_fixture_pages(), cards=args.cards)
+    output = json.dumps(result, indent=2)
+    if getattr(args, "output", None):
+        args.output.write_text(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,73 @@
 """
-HTTP client helpers (session, headers, retries, polite throttling).
+HTTP client helpers (session, headers, retries, adaptive throttling).
 """
 
 from __future__ import annotations
 
+import threading
 import time
 from contextlib import contextmanager
-from typing import Iterator
+from typing import TYPE_CHECKING, Iterator
 
 import requests
 from requests import Response, Session
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from tenacity.wait import wait_base
 
 from .config import get_settings
+from .ratelimit import AdaptiveRateController, get_rate_controller, parse_retry_after
+from .transport import TunedSession, mount_transport, requests_accept_encoding
+
+if TYPE_CHECKING:
+    from .storage.validators import ValidatorStore
 
 _settings = get_settings()
 
 DEFAULT_HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Encoding": requests_accept_encoding(),
     "Accept-Language": "en-US,en;q=0.5",
     "User-Agent": _settings.user_agent
     or "ScrapeFutGG/1.0 (+https://github.com/paubuyreureal/ScrapeFutGG)",
 }
 
 
-def build_session() -> Session:
-    session = requests.Session()
+_shared_session: TunedSession | None = None
+_shared_session_lock = threading.Lock()
+
+
+def build_session() -> TunedSession:
+    session = TunedSession()
     session.headers.update(DEFAULT_HEADERS)
+    mount_transport(
+        session,
+        backend=_settings.http_backend,
+        pool_size=_settings.http_pool_size,
+        keepalive_expiry=_settings.http_keepalive_expiry,
+        tcp_keepidle=_settings.http_tcp_keepidle,
+    )
     return session
 
 
+def get_shared_session() -> TunedSession:
+    """
+    Return a process-wide session that outlives individual scrapes.
+
+    The API process triggers scrapes repeatedly; reusing one session keeps
+    its pooled (and possibly HTTP/2) connections warm between runs.
+    """
+    global _shared_session  # pylint: disable=global-statement
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = build_session()
+        return _shared_session
+
+
 @contextmanager
-def throttled_session() -> Iterator[Session]:
+def throttled_session(*, shared: bool = False) -> Iterator[Session]:
+    if shared:
+        yield get_shared_session()
+        return
     session = build_session()
     try:
         yield session
@@ -40,20 +76,81 @@ def throttled_session() -> Iterator[Session]:
 
 
 class FetchError(RuntimeError):
-    pass
+    """A retryable fetch failure (429 or 5xx), optionally with a Retry-After delay."""
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    # Other 4xx answers (404/410 at the end of the listing) are final.
+    if isinstance(exc, requests.HTTPError):
+        return False
+    return isinstance(exc, (requests.RequestException, FetchError))
+
+
+class _wait_retry_after(wait_base):
+    """Honor the server's Retry-After when present, else back off exponentially."""
+
+    def __init__(self, fallback: wait_base) -> None:
+        self.fallback = fallback
+
+    def __call__(self, retry_state) -> float:  # type: ignore[no-untyped-def]
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(exc, FetchError) and exc.retry_after is not None:
+            return exc.retry_after
+        return self.fallback(retry_state)
 
 
 @retry(
     reraise=True,
-    retry=retry_if_exception_type((requests.RequestException, FetchError)),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
+    retry=retry_if_exception(_is_retryable),
+    wait=_wait_retry_after(wait_exponential(multiplier=1, min=1, max=10)),
     stop=stop_after_attempt(5),
 )
-def fetch_page(session: Session, url: str) -> Response:
-    response = session.get(url, timeout=15)
-    if response.status_code >= 500:
-        raise FetchError(f"Server error {response.status_code} for {url}")
-    if response.status_code != requests.codes.ok:  # type: ignore[attr-defined]
+def fetch_page(
+    session: Session,
+    url: str,
+    *,
+    validators: ValidatorStore | None = None,
+    controller: AdaptiveRateController | None = None,
+) -> Response:
+    """
+    GET a listing page, retrying transient failures.
+
+    Each request waits for a slot from the adaptive rate controller (the
+    process-wide one unless ``controller`` is given) and reports its status
+    and latency back to it. 429 and 5xx answers are retried, honoring
+    ``Retry-After``; other 4xx answers raise ``HTTPError`` immediately.
+
+    With ``validators`` the request is conditional: a page unchanged since the
+    last run comes back as a 304 response with an empty body. Callers record
+    the validators of a 200 response once the page has been stored.
+    """
+    controller = controller or get_rate_controller()
+    headers = validators.conditional_headers(url) if validators is not None else {}
+
+    controller.acquire()
+    started = time.monotonic()
+    try:
+        if headers:
+            response = session.get(url, timeout=15, headers=headers)
+        else:
+            response = session.get(url, timeout=15)
+    except requests.Timeout:
+        controller.record(504, time.monotonic() - started)
+        raise
+    status = response.status_code
+
+    if status == 429 or status >= 500:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        controller.record(status, time.monotonic() - started, retry_after)
+        raise FetchError(f"Server error {status} for {url}", retry_after=retry_after)
+    controller.record(status, time.monotonic() - started)
+    if status not in (
+        requests.codes.ok,  # type: ignore[attr-defined]
+        requests.codes.not_modified,  # type: ignore[attr-defined]
+    ):
         response.raise_for_status()
-    time.sleep(_settings.scrape_delay)
-    return response
\ No newline at end of file
+    return response
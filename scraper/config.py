@@ -30,15 +30,41 @@ class Settings:
     max_pages: Optional[int]
     log_level: str
     user_agent: Optional[str]
-
-
-def _to_float(value: str | None, default: float) -> float:
+    fetch_concurrency: int
+    archive_dir: Optional[Path]
+    http_backend: str
+    http_pool_size: int
+    http_keepalive_expiry: float
+    http_tcp_keepidle: float
+    rate_min: float
+    rate_max: float
+    rate_increase: float
+    scrape_mode: str
+    incremental_stop_pages: int
+    pipeline_queue_size: int
+    parse_workers: int
+    parser_engine: str
+    ingest_mode: str
+    write_batch_pages: int
+    write_batch_cards: int
+    write_transaction: str
+    retention_runs: int
+    db_driver: Optional[str]
+    db_liveness: Optional[str]
+    db_pool_size: Optional[int]
+    db_max_overflow: Optional[int]
+    db_pool_recycle: Optional[float]
+    db_insert_page_size: Optional[int]
+    db_statement_cache_size: Optional[int]
+
+
+def _to_float(value: str | None, default: float, name: str = "SCRAPE_DELAY") -> float:
     if value in (None, ""):
         return default
     try:
         return float(value)
     except ValueError as exc:
-        raise ValueError(f"SCRAPE_DELAY must be a number, got {value!r}") from exc
+        raise ValueError(f"{name} must be a number, got {value!r}") from exc
 
 
 def _to_int_or_none(value: str | None) -> Optional[int]:
@@ -50,6 +76,42 @@ def _to_int_or_none(value: str | None) -> Optional[int]:
         raise ValueError(f"MAX_PAGES must be an integer, got {value!r}") from exc
 
 
+def _to_positive_int(value: str | None, default: int, name: str) -> int:
+    if value in (None, ""):
+        return default
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from exc
+    if parsed < 1:
+        raise ValueError(f"{name} must be at least 1, got {value!r}")
+    return parsed
+
+
+def _to_non_negative_int(value: str | None, default: int, name: str) -> int:
+    if value in (None, ""):
+        return default
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from exc
+    if parsed < 0:
+        raise ValueError(f"{name} must not be negative, got {value!r}")
+    return parsed
+
+
+def _to_optional_int(value: str | None, name: str, minimum: int) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        parsed = int(value)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from exc
+    if parsed < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value!r}")
+    return parsed
+
+
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     database_url = os.getenv("DATABASE_URL")
@@ -58,11 +120,90 @@ def get_settings() -> Settings:
     max_pages = _to_int_or_none(os.getenv("MAX_PAGES"))
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     user_agent = os.getenv("USER_AGENT") or None
+    fetch_concurrency = _to_positive_int(
+        os.getenv("FETCH_CONCURRENCY"), default=1, name="FETCH_CONCURRENCY"
+    )
+    archive_dir = Path(os.environ["ARCHIVE_DIR"]) if os.getenv("ARCHIVE_DIR") else None
+    http_backend = os.getenv("HTTP_BACKEND", "requests").strip().lower() or "requests"
+    http_pool_size = _to_positive_int(
+        os.getenv("HTTP_POOL_SIZE"), default=max(10, fetch_concurrency), name="HTTP_POOL_SIZE"
+    )
+    http_keepalive_expiry = _to_float(
+        os.getenv("HTTP_KEEPALIVE_EXPIRY"), default=60.0, name="HTTP_KEEPALIVE_EXPIRY"
+    )
+    http_tcp_keepidle = _to_float(
+        os.getenv("HTTP_TCP_KEEPIDLE"), default=60.0, name="HTTP_TCP_KEEPIDLE"
+    )
+    rate_min = _to_float(os.getenv("RATE_MIN"), default=0.2, name="RATE_MIN")
+    rate_max = _to_float(os.getenv("RATE_MAX"), default=4.0, name="RATE_MAX")
+    rate_increase = _to_float(os.getenv("RATE_INCREASE"), default=0.1, name="RATE_INCREASE")
+    scrape_mode = os.getenv("SCRAPE_MODE", "full").strip().lower() or "full"
+    incremental_stop_pages = _to_positive_int(
+        os.getenv("INCREMENTAL_STOP_PAGES"), default=2, name="INCREMENTAL_STOP_PAGES"
+    )
+    pipeline_queue_size = _to_positive_int(
+        os.getenv("PIPELINE_QUEUE_SIZE"), default=4, name="PIPELINE_QUEUE_SIZE"
+    )
+    parse_workers = _to_non_negative_int(
+        os.getenv("PARSE_WORKERS"), default=0, name="PARSE_WORKERS"
+    )
+    parser_engine = os.getenv("PARSER_ENGINE", "lxml").strip().lower() or "lxml"
+    ingest_mode = os.getenv("INGEST_MODE", "upsert").strip().lower() or "upsert"
+    write_batch_pages = _to_positive_int(
+        os.getenv("WRITE_BATCH_PAGES"), default=1, name="WRITE_BATCH_PAGES"
+    )
+    write_batch_cards = _to_non_negative_int(
+        os.getenv("WRITE_BATCH_CARDS"), default=0, name="WRITE_BATCH_CARDS"
+    )
+    write_transaction = os.getenv("WRITE_TRANSACTION", "batch").strip().lower() or "batch"
+    retention_runs = _to_non_negative_int(
+        os.getenv("RETENTION_RUNS"), default=0, name="RETENTION_RUNS"
+    )
+    # Engine profile overrides; unset values keep each profile's default.
+    db_driver = os.getenv("DB_DRIVER", "").strip().lower() or None
+    db_liveness = os.getenv("DB_LIVENESS", "").strip().lower() or None
+    db_pool_size = _to_optional_int(os.getenv("DB_POOL_SIZE"), "DB_POOL_SIZE", minimum=1)
+    db_max_overflow = _to_optional_int(
+        os.getenv("DB_MAX_OVERFLOW"), "DB_MAX_OVERFLOW", minimum=0
+    )
+    db_pool_recycle = (
+        _to_float(os.getenv("DB_POOL_RECYCLE"), default=0.0, name="DB_POOL_RECYCLE")
+        if os.getenv("DB_POOL_RECYCLE")
+        else None
+    )
+    db_insert_page_size = _to_optional_int(
+        os.getenv("DB_INSERT_PAGE_SIZE"), "DB_INSERT_PAGE_SIZE", minimum=1
+    )
+    db_statement_cache_size = _to_optional_int(
+        os.getenv("DB_STATEMENT_CACHE_SIZE"), "DB_STATEMENT_CACHE_SIZE", minimum=0
+    )
 
     if not database_url:
         raise ValueError("DATABASE_URL is required (set it in .env)")
     if not base_url:
         raise ValueError("BASE_URL is required (set it in .env)")
+    if http_backend not in ("requests", "httpx"):
+        raise ValueError(f"HTTP_BACKEND must be 'requests' or 'httpx', got {http_backend!r}")
+    if parser_engine not in ("lxml", "stream", "bs4"):
+        raise ValueError(
+            f"PARSER_ENGINE must be 'lxml', 'stream' or 'bs4', got {parser_engine!r}"
+        )
+    if ingest_mode not in ("upsert", "copy"):
+        raise ValueError(f"INGEST_MODE must be 'upsert' or 'copy', got {ingest_mode!r}")
+    if write_transaction not in ("batch", "run"):
+        raise ValueError(
+            f"WRITE_TRANSACTION must be 'batch' or 'run', got {write_transaction!r}"
+        )
+    if db_driver not in (None, "psycopg2", "psycopg"):
+        raise ValueError(f"DB_DRIVER must be 'psycopg2' or 'psycopg', got {db_driver!r}")
+    if db_liveness not in (None, "pre_ping", "recycle"):
+        raise ValueError(f"DB_LIVENESS must be 'pre_ping' or 'recycle', got {db_liveness!r}")
+    if scrape_mode not in ("full", "incremental"):
+        raise ValueError(f"SCRAPE_MODE must be 'full' or 'incremental', got {scrape_mode!r}")
+    if not 0 < rate_min <= rate_max:
+        raise ValueError(
+            f"RATE_MIN/RATE_MAX must satisfy 0 < RATE_MIN <= RATE_MAX, got {rate_min}/{rate_max}"
+        )
 
     return Settings(
         database_url=database_url,
@@ -71,6 +212,32 @@ def get_settings() -> Settings:
         max_pages=max_pages,
         log_level=log_level,
         user_agent=user_agent,
+        fetch_concurrency=fetch_concurrency,
+        archive_dir=archive_dir,
+        http_backend=http_backend,
+        http_pool_size=http_pool_size,
+        http_keepalive_expiry=http_keepalive_expiry,
+        http_tcp_keepidle=http_tcp_keepidle,
+        rate_min=rate_min,
+        rate_max=rate_max,
+        rate_increase=rate_increase,
+        scrape_mode=scrape_mode,
+        incremental_stop_pages=incremental_stop_pages,
+        pipeline_queue_size=pipeline_queue_size,
+        parse_workers=parse_workers,
+        parser_engine=parser_engine,
+        ingest_mode=ingest_mode,
+        write_batch_pages=write_batch_pages,
+        write_batch_cards=write_batch_cards,
+        write_transaction=write_transaction,
+        retention_runs=retention_runs,
+        db_driver=db_driver,
+        db_liveness=db_liveness,
+        db_pool_size=db_pool_size,
+        db_max_overflow=db_max_overflow,
+        db_pool_recycle=db_pool_recycle,
+        db_insert_page_size=db_insert_page_size,
+        db_statement_cache_size=db_statement_cache_size,
     )
 
 
@@ -0,0 +1,78 @@
+"""
+Cheap content fingerprints for listing pages.
+
+A page's fingerprint covers only what ends up in the database: each card
+anchor's href plus the alt text and image source of its card image. Ads,
+scripts and build hashes elsewhere in the markup do not affect it, so a
+page whose card set is unchanged since the last run can skip parsing and
+upserting entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import NamedTuple
+
+_CARD_ANCHOR_RE = re.compile(
+    r"""<a\b[^>]*?\bhref=["'](/players/[^"']+)["'][^>]*>(.*?)</a>""",
+    re.IGNORECASE | re.DOTALL,
+)
+_IMG_TAG_RE = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_IMG_ATTR_RE = re.compile(r"""\b(alt|src|data-src)=["']([^"']*)["']""", re.IGNORECASE)
+_CARD_ANCHOR_BYTES_RE = re.compile(
+    _CARD_ANCHOR_RE.pattern.encode("ascii"), re.IGNORECASE | re.DOTALL
+)
+_IMG_TAG_BYTES_RE = re.compile(_IMG_TAG_RE.pattern.encode("ascii"), re.IGNORECASE)
+_IMG_ATTR_BYTES_RE = re.compile(_IMG_ATTR_RE.pattern.encode("ascii"), re.IGNORECASE)
+
+
+class PageFingerprint(NamedTuple):
+    digest: str
+    card_slugs: tuple[str, ...]
+
+
+def fingerprint_page(html: str | bytes) -> PageFingerprint:
+    """
+    Hash the sorted (href, alt, src) triples of the card anchors on a page.
+
+    Also returns the card slugs found, so callers can mark the page's cards
+    as seen without running the full parser. Accepts the raw UTF-8 response
+    body, which gives the same digest as its decoded text without decoding it.
+    """
+    if isinstance(html, bytes):
+        anchor_re, img_re, attr_re = _CARD_ANCHOR_BYTES_RE, _IMG_TAG_BYTES_RE, _IMG_ATTR_BYTES_RE
+        alt, src, data_src, empty, sep = b"alt", b"src", b"data-src", b"", b"/"
+    else:
+        anchor_re, img_re, attr_re = _CARD_ANCHOR_RE, _IMG_TAG_RE, _IMG_ATTR_RE
+        alt, src, data_src, empty, sep = "alt", "src", "data-src", "", "/"
+
+    entries: set[tuple] = set()
+    card_slugs: set = set()
+
+    for href, inner in anchor_re.findall(html):
+        for img in img_re.findall(inner):
+            attrs = {name.lower(): value for name, value in attr_re.findall(img)}
+            if alt not in attrs:
+                continue
+            parts = href.strip(sep).split(sep)
+            if len(parts) >= 3:
+                card_slugs.add(sep.join(parts[1:]))
+            entries.add((href, attrs[alt], attrs.get(src) or attrs.get(data_src, empty)))
+            break
+
+    # UTF-8 byte order matches code point order, so both inputs sort alike.
+    digest = hashlib.sha256()
+    for entry in sorted(entries):
+        digest.update(b"\t".join(_to_bytes(part) for part in entry))
+        digest.update(b"\n")
+    slugs = (_to_str(slug) for slug in card_slugs)
+    return PageFingerprint(digest.hexdigest(), tuple(sorted(slugs)))
+
+
+def _to_bytes(value: str | bytes) -> bytes:
+    return value if isinstance(value, bytes) else value.encode("utf-8")
+
+
+def _to_str(value: str | bytes) -> str:
+    return value if isinstance(value, str) else value.decode("utf-8", "replace")
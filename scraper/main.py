@@ -1,22 +1,55 @@
 """
 CLI entry point: orchestrates fetch → parse → store workflow.
+
+    python -m scraper.main                    # scrape FUT.GG
+    python -m scraper.main --incremental      # stop once pages only hold known cards
+    python -m scraper.main --replay <archive> # re-run parse/store offline
+    python -m scraper.main --recount          # rebuild the per-player card counters
+    python -m scraper.main --refresh-search-names  # recompute players.search_name
+
+Fetching, parsing and storing run as concurrent pipeline stages (see
+``scraper.pipeline``), so downloads continue while earlier pages are stored.
 """
 
 from __future__ import annotations
 
+import argparse
 import logging
-from contextlib import suppress
+from concurrent.futures import Future
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, NamedTuple
 
+from requests import Response
+from sqlalchemy.exc import SQLAlchemyError
+
+from scraper.archive import PageArchiveReader, PageArchiveWriter, new_archive_path
 from scraper.client import throttled_session
 from scraper.config import get_settings
-from scraper.pagination import iter_pages
-from scraper.parser import ParseError, parse_cards
+from scraper.fingerprint import PageFingerprint, fingerprint_page
+from scraper.pagination import build_page_url, select_page_iterator
+from scraper.parse_pool import ParsePool
+from scraper.parser import ParseError
+from scraper.pipeline import STOP, Stage, run_pipeline
+from scraper.ratelimit import get_rate_controller
+from scraper.transport import transport_stats
 from scraper.storage import (
+    BatchWriter,
     CardPayload,
-    upsert_players_and_cards,
+    CopyIngest,
+    FingerprintStore,
+    KnownCards,
+    ValidatorStore,
+    touch_cards_seen,
     normalize_duplicate_display_names,
     assign_base_cards,
+    recount_player_cards,
+    refresh_search_names,
+    record_run_start,
+    record_run_finish,
+    prune_stale_cards,
 )
+from scraper.storage.connection import get_engine
 
 settings = get_settings()
 
@@ -27,38 +60,365 @@ logger.addHandler(handler)
 logger.setLevel(getattr(logging, settings.log_level, logging.INFO))
 
 
-def main() -> None:
-    logger.info("Starting scrape for %s", settings.base_url)
+def main(
+    replay: Path | str | None = None,
+    *,
+    reuse_session: bool = False,
+    incremental: bool | None = None,
+) -> None:
+    """
+    Run a scrape, or replay a recorded archive when ``replay`` is given.
+
+    ``reuse_session`` keeps the HTTP session (and its connections) alive for
+    the next run instead of closing it; the API's background task uses it.
 
+    ``incremental`` (default: SCRAPE_MODE) stops the run after
+    INCREMENTAL_STOP_PAGES consecutive pages that only hold cards already
+    stored with the same rating, version and image. New promos show up on the
+    first pages, so a daily run only fetches a few of them; cards on the
+    pages never fetched keep their ``last_seen_at`` until the next full run.
+    """
+    if replay is not None:
+        replay_archive(Path(replay))
+        return
+
+    if incremental is None:
+        incremental = settings.scrape_mode == "incremental"
+    mode = _run_mode(incremental)
+    logger.info(
+        "Starting %s scrape for %s (fetch concurrency %s, parse workers %s)",
+        mode,
+        settings.base_url,
+        settings.fetch_concurrency,
+        settings.parse_workers,
+    )
+
+    run_id = record_run_start(mode)
     total_cards = 0
-    with throttled_session() as session:
-        for page_number, response in iter_pages(session):
-            logger.info("Fetched page %s (%s bytes)", page_number, len(response.text))
-            try:
-                cards = parse_cards(response.text)
-            except ParseError as exc:
-                logger.error("Parse error on page %s: %s", page_number, exc)
-                continue
+    failed_pages = 0
+    not_modified_pages = 0
+    same_fingerprint_pages = 0
+    known_pages = 0
+    seen_unchanged: list[str] = []
+    validators = ValidatorStore.load()
+    fingerprints = FingerprintStore.load()
+    known = KnownCards.load() if incremental else None
+    with ExitStack() as stack:
+        session = stack.enter_context(throttled_session(shared=reuse_session))
+        transport_before = transport_stats(session)
+        archive = None
+        if settings.archive_dir is not None:
+            archive = stack.enter_context(
+                PageArchiveWriter(new_archive_path(settings.archive_dir))
+            )
+            logger.info("Archiving raw pages to %s", archive.path)
+        parse_pool = stack.enter_context(ParsePool())
+        writer = _open_card_writer(stack)
+
+        def skip_known_page() -> object | None:
+            nonlocal known_pages
+            known_pages += 1
+            if incremental and _known_streak_complete(known_pages):
+                return STOP
+            return None
 
+        def decode_stage(item: tuple[int, Response]) -> _FetchedPage:
+            """Skip unchanged pages; hand the others to the parser."""
+            nonlocal not_modified_pages, same_fingerprint_pages
+            page_number, response = item
+            url = build_page_url(page_number)
+            if response.status_code == 304:
+                not_modified_pages += 1
+                seen_unchanged.extend(fingerprints.card_slugs(url))
+                logger.info("Page %s not modified since last run; skipping.", page_number)
+                return _FetchedPage(page_number, url, response.headers)
+
+            if archive is not None:
+                archive.append(page_number, url, response.content, response.encoding)
+
+            # Work from the raw body: the parser decodes (or streams) it itself.
+            body = response.content
+            logger.info(
+                "Fetched page %s (%s bytes, rate %.2f req/s)",
+                page_number,
+                len(body),
+                get_rate_controller().rate,
+            )
+            fingerprint = fingerprint_page(body)
+            if fingerprints.is_unchanged(url, fingerprint):
+                same_fingerprint_pages += 1
+                seen_unchanged.extend(fingerprint.card_slugs)
+                validators.remember(url, response.headers)
+                logger.info("Page %s cards unchanged since last run; skipping.", page_number)
+                return _FetchedPage(page_number, url, response.headers)
+
+            return _FetchedPage(
+                page_number,
+                url,
+                response.headers,
+                fingerprint,
+                parse_pool.submit(body, response.encoding),
+            )
+
+        def parse_stage(page: _FetchedPage) -> object | None:
+            """Wait for the parsed cards; only pages with cards to store go on."""
+            nonlocal known_pages, failed_pages
+            if page.cards is None:
+                return skip_known_page()
+
+            cards = _parse_result(page.page_number, page.cards)
+            if cards is None:
+                failed_pages += 1
+                return None
             if not cards:
-                logger.info("No cards found on page %s; stopping.", page_number)
-                break
+                logger.info("No cards found on page %s; stopping.", page.page_number)
+                return STOP
+
+            if known is not None and known.all_known(cards):
+                seen_unchanged.extend(card.card_slug for card in cards)
+                validators.remember(page.url, page.headers)
+                fingerprints.remember(page.url, page.fingerprint)
+                logger.info("Page %s only holds known cards; skipping.", page.page_number)
+                return skip_known_page()
 
-            payloads = [CardPayload(**card.__dict__) for card in cards]  # type: ignore[arg-type]
-            upsert_players_and_cards(payloads)
+            known_pages = 0
+            return page.url, page.headers, page.fingerprint, cards
+
+        def store_stage(item: tuple[str, Any, PageFingerprint, list[CardPayload]]) -> None:
+            nonlocal total_cards
+            url, headers, fingerprint, cards = item
+
+            def remember_page() -> None:
+                validators.remember(url, headers)
+                fingerprints.remember(url, fingerprint)
+
+            # The page only counts as stored (and skippable next run) once
+            # its batch is committed.
+            writer.add(cards, on_stored=remember_page)
             total_cards += len(cards)
-            logger.info("Stored %s cards (total %s)", len(cards), total_cards)
+            logger.info("Queued %s cards for writing (total %s)", len(cards), total_cards)
 
-        normalized = normalize_duplicate_display_names()
-        if normalized:
-            logger.info("Normalized %s duplicate display names.", normalized)
+        pipeline = run_pipeline(
+            select_page_iterator(session, validators=validators, batch_remaining=not incremental),
+            [
+                Stage("decode", decode_stage),
+                Stage("parse", parse_stage),
+                Stage("store", store_stage, isolate=_store_isolation(writer)),
+            ],
+            queue_size=settings.pipeline_queue_size,
+        )
+        logger.info("Pipeline: %s", pipeline.describe())
+        failed_pages += pipeline.stages[-1].failures
+        if mode == "full" and failed_pages:
+            logger.warning(
+                "%s pages failed to parse or store; recording the run as partial.",
+                failed_pages,
+            )
+            mode = "partial"
+        logger.info("Transport: %s", (transport_stats(session) - transport_before).describe())
+        logger.info("Request rate at end of run: %.2f req/s", get_rate_controller().rate)
+        _finish_writes(writer)
 
-        base_updates = assign_base_cards()
-        if base_updates:
-            logger.info("Updated base card data for %s players.", base_updates)
-    logger.info("Scrape complete: %s cards processed", total_cards)
+        touched = touch_cards_seen(seen_unchanged)
+        if touched:
+            logger.info("Marked %s cards on unchanged pages as seen.", touched)
 
+        _post_process(writer)
 
-if __name__ == "__main__":
-    main()
+        validators.save()
+        fingerprints.save()
+    record_run_finish(run_id, mode)
+    if mode == "full" and settings.retention_runs:
+        # Incremental and partial runs leave cards unseen, so only full runs prune.
+        archived = prune_stale_cards(settings.retention_runs)
+        if archived:
+            logger.info(
+                "Archived %s cards not seen in the last %s full scrapes.",
+                archived,
+                settings.retention_runs,
+            )
+    logger.info(
+        "Scrape complete: %s cards processed, %s pages skipped as unchanged "
+        "(%s not modified, %s with identical cards)",
+        total_cards,
+        not_modified_pages + same_fingerprint_pages,
+        not_modified_pages,
+        same_fingerprint_pages,
+    )
+
+
+def replay_archive(archive_path: Path) -> int:
+    """
+    Feed the pages of a recorded archive through parse and storage.
+
+    No network requests are made and no politeness delay applies. Validators
+    and fingerprints are bypassed so every page is parsed and stored again.
+    Returns the number of cards stored.
+    """
+    logger.info("Replaying archived pages from %s", archive_path)
+
+    total_cards = 0
+
+    def decode_stage(item: tuple[int, str]) -> tuple[int, Future[list[CardPayload]]]:
+        page_number, html = item
+        return page_number, parse_pool.submit(html)
+
+    def parse_stage(item: tuple[int, Future[list[CardPayload]]]) -> object | None:
+        page_number, result = item
+        cards = _parse_result(page_number, result)
+        if cards is not None and not cards:
+            logger.info("No cards found on archived page %s; stopping.", page_number)
+            return STOP
+        return cards
+
+    def store_stage(cards: list[CardPayload]) -> None:
+        nonlocal total_cards
+        writer.add(cards)
+        total_cards += len(cards)
+        logger.info("Queued %s cards for writing (total %s)", len(cards), total_cards)
 
+    with ExitStack() as stack:
+        archive = stack.enter_context(PageArchiveReader(archive_path))
+        parse_pool = stack.enter_context(ParsePool())
+        writer = _open_card_writer(stack)
+        pipeline = run_pipeline(
+            archive.iter_pages(),
+            [Stage("decode", decode_stage), Stage("parse", parse_stage), Stage("store", store_stage)],
+            queue_size=settings.pipeline_queue_size,
+            source_name="read",
+        )
+        _finish_writes(writer)
+    logger.info("Pipeline: %s", pipeline.describe())
+
+    _post_process(writer)
+    logger.info("Replay complete: %s cards processed", total_cards)
+    return total_cards
+
+
+def _run_mode(incremental: bool) -> str:
+    """The ``scrape_runs`` mode a run starts with; MAX_PAGES runs are partial."""
+    if incremental:
+        return "incremental"
+    return "partial" if settings.max_pages else "full"
+
+
+def _open_card_writer(stack: ExitStack) -> BatchWriter | CopyIngest:
+    """
+    The run's card writer.
+
+    INGEST_MODE=copy on PostgreSQL stages everything for one merge at the
+    end; otherwise cards are upserted in WRITE_BATCH_PAGES/WRITE_BATCH_CARDS
+    batches, committed per batch or once per run (WRITE_TRANSACTION).
+    """
+    if settings.ingest_mode == "copy":
+        dialect = get_engine().dialect.name
+        if dialect == "postgresql":
+            return stack.enter_context(CopyIngest())
+        logger.warning("INGEST_MODE=copy needs PostgreSQL (not %s); upserting in batches.", dialect)
+    return stack.enter_context(
+        BatchWriter(
+            max_pages=settings.write_batch_pages,
+            max_cards=settings.write_batch_cards,
+            run_transaction=settings.write_transaction == "run",
+        )
+    )
+
+
+def _store_isolation(writer: BatchWriter | CopyIngest) -> tuple[type[BaseException], ...]:
+    """
+    Database errors that only drop the current batch.
+
+    With one transaction per run (run-level batching or COPY ingest) a
+    failed write poisons the whole run, so it stops the pipeline instead.
+    """
+    if isinstance(writer, BatchWriter) and not writer.run_transaction:
+        return (SQLAlchemyError,)
+    return ()
+
+
+def _finish_writes(writer: BatchWriter | CopyIngest) -> None:
+    if isinstance(writer, CopyIngest):
+        staged = writer.staged
+        merged = writer.finish()
+        logger.info("Merged %s staged cards into %s card rows.", staged, merged)
+        return
+    written = writer.finish()
+    logger.info("Wrote %s cards in %s batches.", written, writer.flushes)
+
+
+def _known_streak_complete(known_pages: int) -> bool:
+    """True once an incremental run has seen enough consecutive known pages."""
+    if known_pages < settings.incremental_stop_pages:
+        return False
+    logger.info(
+        "%s consecutive pages held only known cards; stopping incremental run.", known_pages
+    )
+    return True
+
+
+class _FetchedPage(NamedTuple):
+    page_number: int
+    url: str
+    headers: Any
+    fingerprint: PageFingerprint | None = None
+    # None for pages skipped as unchanged.
+    cards: Future[list[CardPayload]] | None = None
+
+
+def _parse_result(page_number: int, result: Future[list[CardPayload]]) -> list[CardPayload] | None:
+    """Wait for one page's cards, logging and returning None on a ParseError."""
+    try:
+        return result.result()
+    except ParseError as exc:
+        logger.error("Parse error on page %s: %s", page_number, exc)
+        return None
+
+
+def _post_process(writer: BatchWriter | CopyIngest) -> None:
+    """Run the post-scrape passes over the players the run wrote cards for."""
+    # Display names only change when a player is inserted.
+    normalized = normalize_duplicate_display_names(writer.inserted_player_ids)
+    if normalized:
+        logger.info("Normalized %s duplicate display names.", normalized)
+
+    base_updates = assign_base_cards(writer.touched_player_ids)
+    if base_updates:
+        logger.info("Updated base card data for %s players.", base_updates)
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scraper.main")
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Parse and store pages from a recorded archive instead of fetching",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=None,
+        help="Stop after INCREMENTAL_STOP_PAGES pages of already known cards "
+        "(default: SCRAPE_MODE)",
+    )
+    parser.add_argument(
+        "--recount",
+        action="store_true",
+        help="Recompute players.total_cards/in_club_count from player_cards and exit",
+    )
+    parser.add_argument(
+        "--refresh-search-names",
+        action="store_true",
+        help="Recompute players.search_name from display_name and exit",
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.recount:
+        logger.info("Repaired card counters for %s players.", recount_player_cards())
+    elif args.refresh_search_names:
+        logger.info("Refreshed search names for %s players.", refresh_search_names())
+    else:
+        main(replay=args.replay, incremental=args.incremental)
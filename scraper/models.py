@@ -8,32 +8,57 @@ from datetime import datetime, timezone
 from typing import List
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
+    Text,
     UniqueConstraint,
+    cast,
+    event,
+    func,
+    literal_column,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from .names import fold_name
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
 
 
+def _fold_display_name(context) -> str:
+    return fold_name(context.get_current_parameters()["display_name"])
+
+
 class Player(Base):
     __tablename__ = "players"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     slug: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     display_name: Mapped[str] = mapped_column(String, nullable=False)
+    # fold_name(display_name); the column player search matches against.
+    search_name: Mapped[str] = mapped_column(
+        String, nullable=False, default=_fold_display_name
+    )
     any_in_club: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     base_card_slug: Mapped[str | None] = mapped_column(String, nullable=True)
     base_card_rating: Mapped[int | None] = mapped_column(Integer, nullable=True)
     base_card_version: Mapped[str | None] = mapped_column(String, nullable=True)
     base_card_image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Maintained by triggers on player_cards (see below and scripts/init_db.sql).
+    total_cards: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    in_club_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=datetime.now(timezone.utc)
     )
@@ -69,11 +94,13 @@ class PlayerCard(Base):
     card_url: Mapped[str] = mapped_column(String, nullable=False)
     image_url: Mapped[str | None] = mapped_column(String, nullable=True)
     in_club: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Set by the database at insert time; retention compares last_seen_at
+    # with the start of recent runs.
     scraped_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=datetime.now(timezone.utc)
+        DateTime(timezone=True), nullable=False, server_default=func.now()
     )
     last_seen_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=datetime.now(timezone.utc)
+        DateTime(timezone=True), nullable=False, server_default=func.now()
     )
 
     player: Mapped[Player] = relationship(back_populates="cards")
@@ -82,4 +109,183 @@ class PlayerCard(Base):
         return (
             f"<PlayerCard slug={self.card_slug!r} name={self.name} "
             f"version={self.version!r} rating={self.rating}>"
-        )
\ No newline at end of file
+        )
+
+
+# Share of a player's cards marked in_club; NULL for players without cards.
+# The literal 0 keeps the expression identical to the index definition.
+completion_ratio = cast(Player.in_club_count, Float) / func.nullif(
+    Player.total_cards, literal_column("0")
+)
+# Descending, as the list endpoint sorts best completion first by default.
+# PostgreSQL only: SQLite rejects NULLS LAST in CREATE INDEX.
+Index(
+    "ix_players_completion_ratio", completion_ratio.desc().nulls_last()
+).ddl_if(dialect="postgresql")
+
+
+# Trigram index so substring search on search_name (LIKE '%term%') is
+# index-backed on PostgreSQL; the extension must exist before the index.
+event.listen(
+    Player.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+Index(
+    "ix_players_search_name_trgm",
+    Player.search_name,
+    postgresql_using="gin",
+    postgresql_ops={"search_name": "gin_trgm_ops"},
+)
+
+
+# Keep players.total_cards / in_club_count in step with every write to
+# player_cards, whichever code path makes it.
+_SQLITE_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER trg_player_cards_count_insert AFTER INSERT ON player_cards
+    BEGIN
+        UPDATE players
+        SET total_cards = total_cards + 1, in_club_count = in_club_count + NEW.in_club
+        WHERE id = NEW.player_id;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_player_cards_count_delete AFTER DELETE ON player_cards
+    BEGIN
+        UPDATE players
+        SET total_cards = total_cards - 1, in_club_count = in_club_count - OLD.in_club
+        WHERE id = OLD.player_id;
+    END
+    """,
+    """
+    CREATE TRIGGER trg_player_cards_count_update
+    AFTER UPDATE OF in_club, player_id ON player_cards
+    BEGIN
+        UPDATE players
+        SET total_cards = total_cards - 1, in_club_count = in_club_count - OLD.in_club
+        WHERE id = OLD.player_id;
+        UPDATE players
+        SET total_cards = total_cards + 1, in_club_count = in_club_count + NEW.in_club
+        WHERE id = NEW.player_id;
+    END
+    """,
+)
+
+_POSTGRES_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION player_cards_maintain_counts() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE players
+            SET total_cards = total_cards - 1,
+                in_club_count = in_club_count - OLD.in_club::int
+            WHERE id = OLD.player_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE players
+            SET total_cards = total_cards + 1,
+                in_club_count = in_club_count + NEW.in_club::int
+            WHERE id = NEW.player_id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_player_cards_counts
+    AFTER INSERT OR DELETE OR UPDATE OF in_club, player_id ON player_cards
+    FOR EACH ROW EXECUTE FUNCTION player_cards_maintain_counts()
+    """,
+)
+
+for _statement in _SQLITE_COUNTER_TRIGGERS:
+    event.listen(
+        PlayerCard.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in _POSTGRES_COUNTER_TRIGGERS:
+    event.listen(
+        PlayerCard.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql")
+    )
+
+
+class PlayerCardArchive(Base):
+    """Cold storage for cards pruned from player_cards after going unseen."""
+
+    __tablename__ = "player_cards_archive"
+
+    # The card's id in player_cards; no foreign keys, so archived rows
+    # outlive their player.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    player_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    card_slug: Mapped[str] = mapped_column(String, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    rating: Mapped[int] = mapped_column(Integer, nullable=False)
+    version: Mapped[str] = mapped_column(String, nullable=False)
+    card_url: Mapped[str] = mapped_column(String, nullable=False)
+    image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    in_club: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    scraped_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<PlayerCardArchive slug={self.card_slug!r} last_seen_at={self.last_seen_at}>"
+
+
+class ScrapeRun(Base):
+    """One scrape; full runs that finished define the card retention window."""
+
+    __tablename__ = "scrape_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    mode: Mapped[str] = mapped_column(String, nullable=False)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<ScrapeRun id={self.id} mode={self.mode!r} started_at={self.started_at}>"
+
+
+Index("ix_player_cards_last_seen_at", PlayerCard.last_seen_at)
+
+
+class PageValidator(Base):
+    """HTTP cache validators remembered per listing page URL between runs."""
+
+    __tablename__ = "page_validators"
+
+    url: Mapped[str] = mapped_column(String, primary_key=True)
+    etag: Mapped[str | None] = mapped_column(String, nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Page count advertised by the pagination links of the response these
+    # validators came with, reused when the page answers 304.
+    page_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<PageValidator url={self.url!r} etag={self.etag!r}>"
+
+
+class PageFingerprintRecord(Base):
+    """Card-content fingerprint of a listing page as stored by the last run."""
+
+    __tablename__ = "page_fingerprints"
+
+    url: Mapped[str] = mapped_column(String, primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String, nullable=False)
+    # Newline-separated card slugs on the page, used to mark them as seen
+    # when the page is skipped.
+    card_slugs: Mapped[str] = mapped_column(Text, nullable=False, default="")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<PageFingerprintRecord url={self.url!r} fingerprint={self.fingerprint[:12]!r}>"
@@ -0,0 +1,280 @@
+"""
+In-memory typeahead index over player names.
+
+Built once from every player's display name and slug, then answers
+``suggest()`` calls without touching the database:
+
+- a prefix trie over the folded full names ("martin ode" → Martin Ødegaard),
+- a prefix trie over the individual name and slug words ("ode", "odegaard"),
+- a bigram index over those words, whose candidates are checked with a
+  bounded prefix edit distance so small typos still match ("odegard",
+  "odegaadr").
+
+Indexes are immutable; :func:`set_name_index` swaps the process-wide one in
+a single assignment, so readers never see a half-built index.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Mapping, NamedTuple
+
+from .names import fold_name
+
+_WORD_SPLIT = re.compile(r"[\s\-'.]+")
+
+
+class Suggestion(NamedTuple):
+    slug: str
+    display_name: str
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        # Entry ids of every key below this node, in rank order.
+        self.ids: list[int] = []
+
+
+class _Trie:
+    """Prefix trie whose nodes hold the ranked ids of all keys below them."""
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+
+    def add(self, key: str, entry_id: int) -> None:
+        # Ids are added in ascending order, so each node's list stays sorted.
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            if not node.ids or node.ids[-1] != entry_id:
+                node.ids.append(entry_id)
+
+    def lookup(self, prefix: str) -> list[int]:
+        """Ranked ids of the keys starting with ``prefix``."""
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.ids
+
+
+def _words(folded: str) -> list[str]:
+    return [word for word in _WORD_SPLIT.split(folded) if word]
+
+
+def _bigrams(word: str) -> list[str]:
+    # The leading marker anchors the first letter, as matches are prefixes.
+    padded = "^" + word
+    return [padded[i : i + 2] for i in range(len(padded) - 1)]
+
+
+def _max_typos(word: str) -> int:
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) < 8 else 2
+
+
+def _prefix_distance(query: str, word: str, limit: int) -> int | None:
+    """
+    Edit distance between ``query`` and the closest prefix of ``word``.
+
+    Uses optimal string alignment, so swapping two adjacent letters ("tset")
+    costs one edit rather than two. Returns None as soon as it is certain to
+    exceed ``limit``.
+    """
+    before: list[int] = []
+    previous = list(range(len(word) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        for j, word_char in enumerate(word, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (query_char != word_char),
+            )
+            if (
+                i > 1
+                and j > 1
+                and query_char == word[j - 2]
+                and query[i - 2] == word_char
+            ):
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        # A transposition reaches back two rows, so both must be over the limit.
+        if min(current) > limit and min(previous) >= limit:
+            return None
+        before, previous = previous, current
+    distance = min(previous)
+    return distance if distance <= limit else None
+
+
+class NameIndex:
+    """
+    Immutable typeahead index over (slug, display name) pairs.
+
+    Entries are ranked shortest folded name first, so the closest match to
+    a short query comes first among equally good matches.
+    """
+
+    def __init__(self, players: Iterable[tuple[str, str]] = ()) -> None:
+        names = dict(players)
+        ranked = sorted(names.items(), key=lambda item: (len(fold_name(item[1])), item))
+        self._entries = [Suggestion(slug, name) for slug, name in ranked]
+        self._names = _Trie()
+        self._word_trie = _Trie()
+        self._entry_words: list[tuple[str, ...]] = []
+        word_ids: dict[str, int] = {}
+        self._word_entries: list[list[int]] = []
+        # Bigram → (word id, position) for every word containing it.
+        self._bigram_words: dict[str, list[tuple[int, int]]] = {}
+        self._words: list[str] = []
+
+        for entry_id, (slug, display_name) in enumerate(self._entries):
+            folded = fold_name(display_name)
+            slug_words = _words(fold_name(slug))
+            self._names.add(folded, entry_id)
+            self._names.add(" ".join(slug_words), entry_id)
+
+            words = tuple(dict.fromkeys([*_words(folded), *slug_words]))
+            self._entry_words.append(words)
+            for word in words:
+                self._word_trie.add(word, entry_id)
+                word_id = word_ids.get(word)
+                if word_id is None:
+                    word_id = word_ids[word] = len(self._words)
+                    self._words.append(word)
+                    self._word_entries.append([])
+                    for position, bigram in enumerate(_bigrams(word)):
+                        self._bigram_words.setdefault(bigram, []).append((word_id, position))
+                self._word_entries[word_id].append(entry_id)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def players(self) -> dict[str, str]:
+        """Slug → display name of every indexed player."""
+        return {entry.slug: entry.display_name for entry in self._entries}
+
+    def with_names(self, display_names: Mapping[str, str]) -> "NameIndex":
+        """A new index with the display names of the given slugs replaced."""
+        players = self.players()
+        players.update(
+            (slug, name) for slug, name in display_names.items() if slug in players
+        )
+        return NameIndex(players.items())
+
+    def suggest(self, query: str, limit: int = 10) -> list[Suggestion]:
+        """
+        Up to ``limit`` players matching ``query``, best first.
+
+        Players whose name starts with the query come first, then players
+        with a word starting with each query word, then (for words of four
+        letters or more) matches within one or two typos.
+        """
+        folded = fold_name(query)
+        words = _words(folded)
+        if not words or limit <= 0:
+            return []
+
+        found: list[int] = []
+        seen: set[int] = set()
+
+        def take(entry_ids: Iterable[int]) -> bool:
+            for entry_id in entry_ids:
+                if entry_id not in seen:
+                    seen.add(entry_id)
+                    found.append(entry_id)
+                    if len(found) == limit:
+                        return True
+            return False
+
+        if not take(self._names.lookup(folded)) and not take(self._word_matches(words)):
+            take(self._fuzzy_matches(words))
+        return [self._entries[entry_id] for entry_id in found]
+
+    def _word_matches(self, words: list[str]) -> Iterable[int]:
+        """Ranked ids of entries with a word starting with each query word."""
+        candidates = [self._word_trie.lookup(word) for word in words]
+        shortest = min(range(len(words)), key=lambda i: len(candidates[i]))
+        others = [word for i, word in enumerate(words) if i != shortest]
+        for entry_id in candidates[shortest]:
+            entry_words = self._entry_words[entry_id]
+            if all(any(w.startswith(word) for w in entry_words) for word in others):
+                yield entry_id
+
+    def _fuzzy_matches(self, words: list[str]) -> list[int]:
+        """Entries matching every query word within its typo budget, fewest typos first."""
+        if not any(_max_typos(word) for word in words):
+            return []
+        typos: dict[int, int] | None = None
+        for word in words:
+            matches = self._fuzzy_word(word)
+            if typos is None:
+                typos = matches
+            else:
+                typos = {
+                    entry_id: count + matches[entry_id]
+                    for entry_id, count in typos.items()
+                    if entry_id in matches
+                }
+            if not typos:
+                return []
+        return sorted(typos, key=lambda entry_id: (typos[entry_id], entry_id))
+
+    def _fuzzy_word(self, word: str) -> dict[int, int]:
+        """Entry id → typos for the entries with a word close to ``word``."""
+        matches = dict.fromkeys(self._word_trie.lookup(word), 0)
+        limit = _max_typos(word)
+        if not limit:
+            return matches
+
+        # Each typo breaks at most three of the query's bigrams (two for an
+        # edit, three for a swap of adjacent letters) and shifts the others by
+        # at most one position.
+        grams = _bigrams(word)
+        needed = max(1, len(grams) - 3 * limit)
+        shared: dict[int, int] = {}
+        for position, gram in enumerate(grams):
+            hits = {
+                word_id
+                for word_id, word_position in self._bigram_words.get(gram, ())
+                if abs(word_position - position) <= limit
+            }
+            for word_id in hits:
+                shared[word_id] = shared.get(word_id, 0) + 1
+
+        for word_id, count in shared.items():
+            if count < needed:
+                continue
+            candidate = self._words[word_id][: len(word) + limit]
+            distance = _prefix_distance(word, candidate, limit)
+            if not distance:
+                continue
+            for entry_id in self._word_entries[word_id]:
+                if distance < matches.get(entry_id, limit + 1):
+                    matches[entry_id] = distance
+        return matches
+
+
+_current: NameIndex | None = None
+
+
+def current_name_index() -> NameIndex | None:
+    """The process-wide index, or None until one has been built."""
+    return _current
+
+
+def set_name_index(index: NameIndex | None) -> None:
+    global _current
+    _current = index
+
+
+def patch_display_names(display_names: Mapping[str, str]) -> None:
+    """Apply renamed display names (slug → name) to the process-wide index, if built."""
+    index = _current
+    if index is not None and display_names:
+        set_name_index(index.with_names(display_names))
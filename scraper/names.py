@@ -0,0 +1,40 @@
+"""
+Name folding for accent- and case-insensitive player search.
+
+``players.search_name`` holds :func:`fold_name` of the display name, and
+search terms are folded the same way before matching, so searching behaves
+identically on PostgreSQL and SQLite and never depends on database
+extensions such as ``unaccent``.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+
+# Letters that carry no combining mark under NFKD but read as a base letter.
+_FOLD_LETTERS = str.maketrans(
+    {
+        "ø": "o",
+        "đ": "d",
+        "ð": "d",
+        "ł": "l",
+        "ı": "i",
+        "æ": "ae",
+        "œ": "oe",
+        "þ": "th",
+    }
+)
+
+
+def fold_name(name: str) -> str:
+    """
+    Fold ``name`` for searching: case-folded, accents stripped, whitespace collapsed.
+
+    >>> fold_name("  Martin ØDEGAARD ")
+    'martin odegaard'
+    >>> fold_name("Vinícius Júnior")
+    'vinicius junior'
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.translate(_FOLD_LETTERS).split())
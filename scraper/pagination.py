@@ -4,16 +4,23 @@ Pagination utilities for iterating FUT.GG pages until no cards remain.
 
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Tuple
+import asyncio
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Iterator, Tuple
 
 import requests
 from requests import Response, Session
 
 from .client import fetch_page
 from .config import get_settings
+from .parser import parse_page_count
+
+if TYPE_CHECKING:
+    from .storage.validators import ValidatorStore
 
 _settings = get_settings()
 
+_END_OF_LISTING = {404, 410}
+
 
 def build_page_url(page_number: int) -> str:
     """Return the absolute URL for a given page."""
@@ -26,27 +33,193 @@ def iter_pages(
     session: Session,
     *,
     max_pages: int | None = None,
+    validators: ValidatorStore | None = None,
 ) -> Iterator[Tuple[int, Response]]:
     """
-    Yield (page_number, response) pairs until we hit the configured max pages
-    or the site returns a 404/410 (no more pages).
+    Yield (page_number, response) pairs until we hit the configured max pages,
+    the last page advertised by the pagination links, or a 404/410.
 
-    The caller is responsible for breaking once the parsed content is empty.
+    When page 1 links to its last page, no request is spent probing past it;
+    without pagination markup we probe until a 404/410 and the caller breaks
+    once the parsed content is empty. With ``validators`` a response may be a
+    304 for a page unchanged since the last run; that is not the end of the
+    listing, and the page count stored with its validators bounds the run
+    just like the links of a 200 would.
     """
     limit = max_pages or _settings.max_pages
+    last_page: int | None = None
     page_number = 1
 
     while True:
         if limit is not None and page_number > limit:
             break
+        if last_page is not None and page_number > last_page:
+            break
 
         url = build_page_url(page_number)
         try:
-            response = fetch_page(session, url)
+            response = fetch_page(session, url, validators=validators)
         except requests.HTTPError as exc:
-            if exc.response is not None and exc.response.status_code in {404, 410}:
+            if exc.response is not None and exc.response.status_code in _END_OF_LISTING:
                 break
             raise
+        last_page = _extend_last_page(last_page, url, response, validators)
         yield page_number, response
         page_number += 1
 
+
+def _extend_last_page(
+    last_page: int | None,
+    url: str,
+    response: Response,
+    validators: ValidatorStore | None,
+) -> int | None:
+    """
+    Raise the known last page from the pagination links of ``response``.
+
+    A 304 has no body; its page count is the one stored with the validators
+    of the unchanged page, so repeat runs still know where the listing ends.
+    """
+    if response.status_code == requests.codes.ok:  # type: ignore[attr-defined]
+        advertised = parse_page_count(response.content)
+        if advertised is not None and validators is not None:
+            validators.note_page_count(url, advertised)
+    elif (
+        response.status_code == requests.codes.not_modified  # type: ignore[attr-defined]
+        and validators is not None
+    ):
+        advertised = validators.page_count(url)
+    else:
+        return last_page
+    if advertised is None:
+        return last_page
+    return max(advertised, last_page or 0)
+
+
+async def iter_pages_async(
+    session: Session,
+    *,
+    max_pages: int | None = None,
+    concurrency: int | None = None,
+    validators: ValidatorStore | None = None,
+    batch_remaining: bool = True,
+) -> AsyncIterator[Tuple[int, Response]]:
+    """
+    Async counterpart of :func:`iter_pages` with up to ``concurrency`` requests in flight.
+
+    Pages are requested ahead of the consumer but always yielded in page
+    order. The blocking ``fetch_page`` runs in worker threads, so retries
+    behave exactly as in the sequential path, and every worker draws its
+    request slots from the same adaptive rate controller: concurrency hides
+    latency without raising the request rate.
+
+    Until the last page is known, at most ``concurrency`` pages are requested
+    ahead. As soon as page 1 reveals the page count through its pagination
+    links (or, for a 304, the count stored with its validators), every
+    remaining page is scheduled in one batch (the semaphore still caps
+    requests in flight) and nothing is requested past the end.
+    Without pagination markup (or with ``batch_remaining=False``, for
+    consumers likely to stop early) the fetcher keeps probing ahead; once a
+    page answers 404/410, requests already issued for later pages are
+    cancelled.
+    """
+    limit = max_pages or _settings.max_pages
+    window = concurrency or _settings.fetch_concurrency
+    semaphore = asyncio.Semaphore(window)
+
+    async def fetch(page_number: int) -> Response:
+        async with semaphore:
+            return await asyncio.to_thread(
+                fetch_page, session, build_page_url(page_number), validators=validators
+            )
+
+    pending: dict[int, asyncio.Task[Response]] = {}
+    next_to_schedule = 1
+    last_page: int | None = None
+    page_number = 1
+    try:
+        while limit is None or page_number <= limit:
+            if last_page is not None and page_number > last_page:
+                break
+
+            if last_page is not None and batch_remaining:
+                horizon = last_page
+            else:
+                # Probing: keep at most `window` pages requested but not yet
+                # consumed, so a slow consumer also bounds buffered bodies.
+                horizon = page_number + window - 1
+            if last_page is not None:
+                horizon = min(horizon, last_page)
+            if limit is not None:
+                horizon = min(horizon, limit)
+            while next_to_schedule <= horizon:
+                pending[next_to_schedule] = asyncio.create_task(fetch(next_to_schedule))
+                next_to_schedule += 1
+
+            task = pending.pop(page_number)
+            try:
+                response = await task
+            except requests.HTTPError as exc:
+                if exc.response is not None and exc.response.status_code in _END_OF_LISTING:
+                    break
+                raise
+            last_page = _extend_last_page(
+                last_page, build_page_url(page_number), response, validators
+            )
+            yield page_number, response
+            page_number += 1
+    finally:
+        for task in pending.values():
+            task.cancel()
+        await asyncio.gather(*pending.values(), return_exceptions=True)
+
+
+def iter_pages_concurrent(
+    session: Session,
+    *,
+    max_pages: int | None = None,
+    concurrency: int | None = None,
+    validators: ValidatorStore | None = None,
+    batch_remaining: bool = True,
+) -> Iterator[Tuple[int, Response]]:
+    """
+    Drive :func:`iter_pages_async` from synchronous code.
+
+    Requests already handed to worker threads keep downloading while the
+    caller parses and stores the previous page.
+    """
+    loop = asyncio.new_event_loop()
+    pages = iter_pages_async(
+        session,
+        max_pages=max_pages,
+        concurrency=concurrency,
+        validators=validators,
+        batch_remaining=batch_remaining,
+    )
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(pages.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(pages.aclose())
+        loop.close()
+
+
+def select_page_iterator(
+    session: Session,
+    *,
+    max_pages: int | None = None,
+    validators: ValidatorStore | None = None,
+    batch_remaining: bool = True,
+) -> Iterable[Tuple[int, Response]]:
+    """Return the concurrent fetcher when FETCH_CONCURRENCY > 1, else the sequential one."""
+    if _settings.fetch_concurrency > 1:
+        return iter_pages_concurrent(
+            session,
+            max_pages=max_pages,
+            validators=validators,
+            batch_remaining=batch_remaining,
+        )
+    return iter_pages(session, max_pages=max_pages, validators=validators)
@@ -0,0 +1,62 @@
+"""
+Optional process pool for parsing listing pages.
+
+Building a BeautifulSoup tree for a 1–2 MB listing page is pure-Python work
+that holds the GIL. With PARSE_WORKERS > 0, pages are parsed in worker
+processes. Only the compact ``CardPayload`` lists come back to the parent.
+With the default of 0, pages are parsed in the calling thread.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List
+
+from .config import get_settings
+from .parser import parse_cards
+from .storage import CardPayload
+
+_settings = get_settings()
+
+
+class ParsePool:
+    """Hand out parse results as futures, whether parsed in-process or not."""
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = _settings.parse_workers if workers is None else workers
+        self._executor: ProcessPoolExecutor | None = None
+        if self.workers > 0:
+            # spawn, not fork: the scraper runs inside threaded processes
+            # (the pipeline stages, the API server).
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    def submit(self, html: str | bytes, encoding: str | None = None) -> Future[List[CardPayload]]:
+        """
+        Parse ``html`` (text, or a raw body in ``encoding``) with the
+        configured engine; a ``ParseError`` surfaces from ``result()``.
+        """
+        if self._executor is not None:
+            return self._executor.submit(parse_cards, html, None, encoding)
+        future: Future[List[CardPayload]] = Future()
+        try:
+            future.set_result(parse_cards(html, encoding=encoding))
+        except Exception as exc:  # pylint: disable=broad-except
+            future.set_exception(exc)
+        return future
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+__all__ = ["ParsePool"]
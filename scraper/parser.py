@@ -1,56 +1,217 @@
 """
-BeautifulSoup parsing helpers that convert FUT.GG HTML into structured data.
+Parsing helpers that convert FUT.GG HTML into structured data.
+
+Three engines produce identical card lists, selected with PARSER_ENGINE:
+
+- ``lxml`` (default): ``lxml.html`` with precompiled XPath, no soup objects.
+- ``stream``: an incremental lxml pull parser fed raw byte chunks. Cards
+  are emitted as their anchors close and finished subtrees are discarded,
+  so memory stays flat however large the page is.
+- ``bs4``: the original BeautifulSoup implementation, kept as the reference
+  and as the fallback when lxml is unavailable.
 """
 
 from __future__ import annotations
 
 import re
-from typing import Iterable, List
-from urllib.parse import urljoin
+from typing import Iterable, Iterator, List
+from urllib.parse import urljoin, urlparse
 
 from bs4 import BeautifulSoup, Tag
 
 from .config import get_settings
 from .storage import CardPayload
 
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover - lxml ships with the requirements
+    etree = None  # type: ignore[assignment]
+    lxml_html = None  # type: ignore[assignment]
+
 _settings = get_settings()
 _CARD_HREF_RE = re.compile(r"^/players/([^/]+)/")
+_PAGE_LINK_RE = re.compile(r"""href=["']([^"'?]*)\?(?:[^"']*[&;])?page=(\d+)""")
+_PAGE_LINK_BYTES_RE = re.compile(_PAGE_LINK_RE.pattern.encode("ascii"))
 FUTGG_ROOT = "https://www.fut.gg"
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 class ParseError(RuntimeError):
     """Raised when we cannot interpret the FUT.GG card structure."""
 
 
-def parse_cards(html: str) -> List[CardPayload]:
+if etree is not None:
+    # Card anchors, in document order, that contain an <img alt=...>.
+    _CARD_ANCHORS_XPATH = etree.XPath("//a[starts-with(@href, '/players/')][.//img[@alt]]")
+    _FIRST_CARD_IMAGE_XPATH = etree.XPath("(.//img[@alt])[1]")
+
+
+def parse_cards(
+    html: str | bytes, engine: str | None = None, encoding: str | None = None
+) -> List[CardPayload]:
     """
     Parse a FUT.GG player listing page and return card payloads.
 
     Parameters
     ----------
     html:
-        Raw HTML returned by FUT.GG for a Past & Present listing page.
+        Raw HTML returned by FUT.GG for a Past & Present listing page, as
+        text or as the undecoded response body.
+    engine:
+        ``"lxml"``, ``"stream"`` or ``"bs4"``; defaults to the PARSER_ENGINE
+        setting.
+    encoding:
+        Declared encoding of ``html`` when given as bytes (UTF-8 if omitted).
 
     Returns
     -------
     list[CardPayload]
         Structured card data ready to be persisted.
     """
-    soup = BeautifulSoup(html, "lxml")
+    engine = engine or _settings.parser_engine
+    if etree is None:
+        engine = "bs4"
+    encoding = encoding or "utf-8"
+    if engine == "stream":
+        if isinstance(html, str):
+            html, encoding = html.encode("utf-8"), "utf-8"
+        chunks = (html[i : i + STREAM_CHUNK_SIZE] for i in range(0, len(html), STREAM_CHUNK_SIZE))
+        return list(iter_cards_streaming(chunks, encoding))
+    if engine == "lxml":
+        return _dedupe(_iter_lxml_payloads(html, encoding))
+    return _dedupe(_iter_bs4_payloads(html, encoding))
+
+
+def iter_cards_streaming(
+    chunks: Iterable[bytes], encoding: str | None = None
+) -> Iterator[CardPayload]:
+    """
+    Yield card payloads while the page is still being fed to the parser.
+
+    ``chunks`` are raw body bytes (e.g. ``response.iter_content()``) in
+    ``encoding`` (UTF-8 if omitted); the body is never decoded into one
+    string. Each card is emitted when its
+    anchor closes. Every other finished element is then cleared and unlinked,
+    so only the open ancestors of the current position stay in memory.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding or "utf-8")
+    seen_slugs: set[str] = set()
+    open_anchors = 0
+
+    def drain() -> Iterator[CardPayload]:
+        nonlocal open_anchors
+        for event, element in parser.read_events():
+            is_card_anchor = element.tag == "a" and (element.get("href") or "").startswith(
+                "/players/"
+            )
+            if event == "start":
+                open_anchors += is_card_anchor
+                continue
+            if is_card_anchor:
+                open_anchors -= 1
+                payload = _payload_from_lxml_anchor(element)
+                if payload is not None and payload.card_slug not in seen_slugs:
+                    seen_slugs.add(payload.card_slug)
+                    yield payload
+            if not open_anchors:
+                _discard_finished(element)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:  # empty document
+        return
+    yield from drain()
+
+
+def _discard_finished(element: "etree._Element") -> None:
+    """Free a closed element and the already processed siblings before it."""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _dedupe(payloads: Iterable[CardPayload]) -> List[CardPayload]:
+    """Keep the first card per slug, in page order."""
     cards: list[CardPayload] = []
     seen_slugs: set[str] = set()
+    for payload in payloads:
+        if payload.card_slug in seen_slugs:
+            continue
+        seen_slugs.add(payload.card_slug)
+        cards.append(payload)
+    return cards
+
 
+def _iter_bs4_payloads(html: str | bytes, encoding: str) -> Iterable[CardPayload]:
+    if isinstance(html, bytes):
+        soup = BeautifulSoup(html, "lxml", from_encoding=encoding)
+    else:
+        soup = BeautifulSoup(html, "lxml")
     for anchor in _iter_card_anchors(soup):
         try:
-            payload = _parse_anchor(anchor)
+            yield _parse_anchor(anchor)
         except ParseError:
             continue
-        if payload.card_slug in seen_slugs:
-            continue
-        seen_slugs.add(payload.card_slug)
-        cards.append(payload)
 
-    return cards
+
+def _iter_lxml_payloads(html: str | bytes, encoding: str) -> Iterable[CardPayload]:
+    parser = None
+    if isinstance(html, bytes):
+        parser = lxml_html.HTMLParser(encoding=encoding)
+    try:
+        root = lxml_html.document_fromstring(html, parser=parser)
+    except etree.ParserError:  # empty document
+        return
+    for anchor in _CARD_ANCHORS_XPATH(root):
+        payload = _payload_from_lxml_anchor(anchor)
+        if payload is not None:
+            yield payload
+
+
+def _payload_from_lxml_anchor(anchor: "etree._Element") -> CardPayload | None:
+    """Payload for an lxml card anchor, or None if it is not a valid card."""
+    images = _FIRST_CARD_IMAGE_XPATH(anchor)
+    if not images:
+        return None
+    image = images[0]
+    try:
+        return _build_payload(
+            anchor.get("href"), image.get("alt"), image.get("src") or image.get("data-src")
+        )
+    except ParseError:
+        return None
+
+
+def parse_page_count(html: str | bytes) -> int | None:
+    """
+    Return the highest page number linked from a listing page's pagination.
+
+    Only links back to the configured listing (or bare ``?page=N`` links)
+    count. Returns None when the page has no pagination markup, in which
+    case callers fall back to probing until a 404 or an empty page. Accepts
+    the raw response bytes so the body need not be decoded just for this.
+    """
+    listing_path = urlparse(_settings.base_url).path.rstrip("/")
+    if isinstance(html, bytes):
+        matches = [
+            (path.decode("ascii", "replace"), number)
+            for path, number in _PAGE_LINK_BYTES_RE.findall(html)
+        ]
+    else:
+        matches = _PAGE_LINK_RE.findall(html)
+
+    pages = [
+        int(number)
+        for path, number in matches
+        if not path or urlparse(path).path.rstrip("/") == listing_path
+    ]
+    return max(pages) if pages else None
 
 
 def _iter_card_anchors(soup: BeautifulSoup) -> Iterable[Tag]:
@@ -66,7 +227,16 @@ def _iter_card_anchors(soup: BeautifulSoup) -> Iterable[Tag]:
 
 
 def _parse_anchor(anchor: Tag) -> CardPayload:
-    href = anchor.get("href")
+    image = anchor.find("img", alt=True)
+    if image is None:
+        raise ParseError("Card anchor missing img/alt")
+    return _build_payload(
+        anchor.get("href"), image["alt"], image.get("src") or image.get("data-src")
+    )
+
+
+def _build_payload(href: str | None, alt_text: str, raw_image_url: str | None) -> CardPayload:
+    """Build a payload from a card anchor's href and its image's alt and src."""
     if not href:
         raise ParseError("Anchor missing href")
 
@@ -78,15 +248,9 @@ def _parse_anchor(anchor: Tag) -> CardPayload:
     card_slug = "/".join(parts[1:])  # e.g. "231443-ousmane-dembele/26-50563091"
     player_slug = _derive_player_slug(player_segment)
 
-    image = anchor.find("img", alt=True)
-    if image is None:
-        raise ParseError("Card anchor missing img/alt")
-
-    alt_text = image["alt"].strip()
-    name, rating, version = _split_alt_text(alt_text)
+    name, rating, version = _split_alt_text(alt_text.strip())
 
     card_url = urljoin(FUTGG_ROOT, href)
-    raw_image_url = image.get("src") or image.get("data-src")
     if not raw_image_url:
         raise ParseError("Card image missing src/data-src")
     image_url = urljoin(FUTGG_ROOT, raw_image_url)
@@ -0,0 +1,214 @@
+"""
+Staged fetch → parse → store pipeline connected by bounded queues.
+
+The source (page fetching) and every stage but the last run in their own
+thread; the last stage runs in the calling thread, so database work stays
+where the caller opened its stores. Each queue holds at most ``queue_size``
+items, so a slow stage makes the stages before it wait instead of
+buffering the whole listing. With one worker per stage, items reach every
+stage in source order.
+
+A stage returns the item for the next stage, ``None`` to drop the item, or
+:data:`STOP` to end the run after the current item. On STOP, items already
+handed to later stages are still processed, and earlier stages (and the
+source) shut down. Exceptions listed in a stage's ``isolate`` are logged and
+only drop the item that raised them. Any other exception stops every stage
+and is re-raised by :func:`run_pipeline`. A failing source ends the run
+after the already fetched items have been processed.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, NamedTuple, Sequence
+
+logger = logging.getLogger("ScrapeFutGG")
+
+STOP = object()
+_END = object()
+_POLL_SECONDS = 0.1
+
+
+class Stage(NamedTuple):
+    name: str
+    handle: Callable[[Any], Any]
+    isolate: tuple[type[BaseException], ...] = ()
+
+
+@dataclass
+class StageStats:
+    name: str
+    items: int = 0
+    failures: int = 0
+    busy: float = 0.0
+
+
+@dataclass
+class PipelineStats:
+    stages: list[StageStats] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def describe(self) -> str:
+        parts = []
+        for stage in self.stages:
+            part = f"{stage.name} {stage.busy:.2f}s busy ({stage.items} items"
+            if stage.failures:
+                part += f", {stage.failures} failed"
+            parts.append(part + ")")
+        return f"{self.elapsed:.2f}s wall clock; " + ", ".join(parts)
+
+
+class _Pipeline:
+    def __init__(
+        self, source: Iterable[Any], stages: Sequence[Stage], source_name: str, queue_size: int
+    ) -> None:
+        self.source = source
+        self.stages = stages
+        self.queues: list[queue.Queue[Any]] = [queue.Queue(queue_size) for _ in stages]
+        self.stats = PipelineStats(
+            stages=[StageStats(source_name)] + [StageStats(stage.name) for stage in stages]
+        )
+        self._lock = threading.Lock()
+        # Stages before this index (the source is -1) stop taking new work.
+        self._stop_before: float | None = None
+        self._error: BaseException | None = None
+
+    def _stop(self, before: float) -> None:
+        with self._lock:
+            if self._stop_before is None or before > self._stop_before:
+                self._stop_before = before
+
+    def _fail(self, exc: BaseException, *, abort: bool) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = exc
+        if abort:
+            self._stop(math.inf)
+
+    def _abandoned(self, index: int) -> bool:
+        stop_before = self._stop_before
+        return stop_before is not None and index < stop_before
+
+    def _put(self, index: int, item: Any) -> bool:
+        """Hand ``item`` from stage ``index`` to the next one; False if abandoned."""
+        outbox = self.queues[index + 1]
+        while not self._abandoned(index):
+            try:
+                outbox.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, index: int) -> Any:
+        inbox = self.queues[index]
+        while not self._abandoned(index):
+            try:
+                return inbox.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _END
+
+    def run_source(self) -> None:
+        stats = self.stats.stages[0]
+        iterator = iter(self.source)
+        try:
+            while not self._abandoned(-1):
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    stats.busy += time.perf_counter() - started
+                stats.items += 1
+                if not self._put(-1, item):
+                    break
+        except BaseException as exc:  # pylint: disable=broad-except
+            self._fail(exc, abort=False)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            self._put(-1, _END)
+
+    def run_stage(self, index: int) -> None:
+        stage = self.stages[index]
+        stats = self.stats.stages[index + 1]
+        last = index == len(self.stages) - 1
+        try:
+            while True:
+                item = self._get(index)
+                if item is _END:
+                    break
+                started = time.perf_counter()
+                try:
+                    result = stage.handle(item)
+                except stage.isolate as exc:
+                    stats.failures += 1
+                    logger.error("%s stage dropped an item: %s", stage.name, exc)
+                    continue
+                finally:
+                    stats.busy += time.perf_counter() - started
+                stats.items += 1
+                if result is STOP:
+                    self._stop(index)
+                    break
+                if result is not None and not last and not self._put(index, result):
+                    break
+        except BaseException as exc:  # pylint: disable=broad-except
+            self._fail(exc, abort=True)
+        finally:
+            if not last:
+                self._put(index, _END)
+
+
+def run_pipeline(
+    source: Iterable[Any],
+    stages: Sequence[Stage],
+    *,
+    queue_size: int,
+    source_name: str = "fetch",
+) -> PipelineStats:
+    """
+    Feed ``source`` through ``stages`` and return per-stage timings.
+
+    With every stage busy at once, wall-clock time approaches the busiest
+    stage's time instead of the sum of all of them.
+    """
+    if not stages:
+        raise ValueError("run_pipeline needs at least one stage")
+
+    pipeline = _Pipeline(source, stages, source_name, queue_size)
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=pipeline.run_source, name=f"pipeline-{source_name}", daemon=True)
+    ]
+    threads += [
+        threading.Thread(
+            target=pipeline.run_stage, args=(index,), name=f"pipeline-{stage.name}", daemon=True
+        )
+        for index, stage in enumerate(stages[:-1])
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        pipeline.run_stage(len(stages) - 1)
+    finally:
+        # Unblocks the other stages if the last one stopped early.
+        pipeline._stop(len(stages) - 1)
+        for thread in threads:
+            thread.join()
+    pipeline.stats.elapsed = time.perf_counter() - started
+
+    if pipeline._error is not None:
+        raise pipeline._error
+    return pipeline.stats
+
+
+__all__ = ["STOP", "PipelineStats", "Stage", "StageStats", "run_pipeline"]
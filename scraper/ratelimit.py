@@ -0,0 +1,138 @@
+"""
+Adaptive request pacing (additive increase, multiplicative decrease).
+
+The controller hands out request start times at the current rate. Healthy
+responses raise the rate by a fixed step up to RATE_MAX. A 429, a 5xx or a
+latency spike cuts it by half down to RATE_MIN. A ``Retry-After`` header
+pauses every request until that time has passed. The controller is
+thread-safe, so the concurrent fetcher's workers share one budget.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .config import get_settings
+
+logger = logging.getLogger("ScrapeFutGG")
+
+_DECREASE_FACTOR = 0.5
+_LATENCY_SMOOTHING = 0.2
+_LATENCY_SPIKE_FACTOR = 3.0
+_LATENCY_WARMUP = 3
+_MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds requested by a Retry-After header value."""
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), _MAX_RETRY_AFTER)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    delay = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delay, 0.0), _MAX_RETRY_AFTER)
+
+
+class AdaptiveRateController:
+    """AIMD pacing shared by every request of the process."""
+
+    def __init__(
+        self,
+        *,
+        initial_rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+    ) -> None:
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self._rate = min(max(initial_rate, min_rate), max_rate)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._latency_avg: float | None = None
+        self._samples = 0
+
+    @property
+    def rate(self) -> float:
+        """Current request rate in requests per second."""
+        return self._rate
+
+    def acquire(self) -> None:
+        """Block until the caller may start its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self._rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, status: int, latency: float, retry_after: float | None = None) -> None:
+        """Adjust the rate from the outcome of one request."""
+        with self._lock:
+            if status == 429 or status >= 500:
+                self._decrease(f"HTTP {status}")
+                if retry_after:
+                    self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+                    logger.warning("Server asked to retry after %.1fs; pausing requests.", retry_after)
+                return
+
+            spike = (
+                self._latency_avg is not None
+                and self._samples >= _LATENCY_WARMUP
+                and latency > _LATENCY_SPIKE_FACTOR * self._latency_avg
+            )
+            self._samples += 1
+            if self._latency_avg is None:
+                self._latency_avg = latency
+            else:
+                self._latency_avg += _LATENCY_SMOOTHING * (latency - self._latency_avg)
+
+            if spike:
+                self._decrease(f"latency {latency:.2f}s vs {self._latency_avg:.2f}s average")
+            elif self._rate < self.max_rate:
+                self._rate = min(self._rate + self.increase, self.max_rate)
+                logger.debug("Request rate raised to %.2f req/s", self._rate)
+
+    def _decrease(self, reason: str) -> None:
+        previous = self._rate
+        self._rate = max(self._rate * _DECREASE_FACTOR, self.min_rate)
+        logger.warning(
+            "Backing off (%s): request rate %.2f -> %.2f req/s", reason, previous, self._rate
+        )
+
+
+_controller: AdaptiveRateController | None = None
+_controller_lock = threading.Lock()
+
+
+def get_rate_controller() -> AdaptiveRateController:
+    """
+    Return the process-wide controller, created from settings on first use.
+
+    The starting rate is 1 / SCRAPE_DELAY, so an untouched configuration
+    begins exactly as polite as the old fixed sleep and speeds up from there.
+    """
+    global _controller  # pylint: disable=global-statement
+    with _controller_lock:
+        if _controller is None:
+            settings = get_settings()
+            initial = 1.0 / settings.scrape_delay if settings.scrape_delay > 0 else settings.rate_max
+            _controller = AdaptiveRateController(
+                initial_rate=initial,
+                min_rate=settings.rate_min,
+                max_rate=settings.rate_max,
+                increase=settings.rate_increase,
+            )
+        return _controller
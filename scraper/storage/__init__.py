@@ -5,20 +5,51 @@ Public API:
 - CardPayload: Data transfer object for card data
 - session_scope: Context manager for database sessions
 - upsert_players_and_cards: Main upsert function
+- touch_cards_seen: Bulk last_seen_at refresh for unchanged pages
+- BatchWriter: Cross-page batching of upserts, optionally in one transaction
+- CopyIngest: Run-scoped COPY staging and set-based merge (PostgreSQL)
 - normalize_duplicate_display_names: Display name cleanup
+- refresh_search_names: Recompute the folded players.search_name column
 - assign_base_cards: Base card assignment
+- recount_player_cards: Rebuild the per-player card counters
+- record_run_start / record_run_finish: Scrape run bookkeeping
+- prune_stale_cards: Archive cards unseen for the last K full runs
+- ValidatorStore: ETag/Last-Modified validators for conditional requests
+- FingerprintStore: Card-content fingerprints of previously stored pages
+- KnownCards: Stored card signatures for incremental scrapes
+- PlayerIdCache: Run-scoped player slug → id lookups
 """
 
 from .connection import session_scope
 from .payloads import CardPayload
-from .upserts import upsert_players_and_cards
-from .normalization import normalize_duplicate_display_names
+from .upserts import touch_cards_seen, upsert_players_and_cards
+from .batch_writer import BatchWriter
+from .copy_ingest import CopyIngest
+from .normalization import normalize_duplicate_display_names, refresh_search_names
 from .base_cards import assign_base_cards
+from .counters import recount_player_cards
+from .retention import prune_stale_cards, record_run_finish, record_run_start
+from .validators import ValidatorStore
+from .fingerprints import FingerprintStore
+from .known_cards import KnownCards
+from .player_ids import PlayerIdCache
 
 __all__ = [
     "CardPayload",
     "session_scope",
     "upsert_players_and_cards",
+    "touch_cards_seen",
+    "BatchWriter",
+    "CopyIngest",
     "normalize_duplicate_display_names",
+    "refresh_search_names",
     "assign_base_cards",
+    "recount_player_cards",
+    "record_run_start",
+    "record_run_finish",
+    "prune_stale_cards",
+    "ValidatorStore",
+    "FingerprintStore",
+    "KnownCards",
+    "PlayerIdCache",
 ]
\ No newline at end of file
@@ -4,65 +4,84 @@ Base card assignment logic.
 
 from __future__ import annotations
 
+from typing import Iterable
+
+from sqlalchemy import case, func, or_, select, update
+
 from .connection import session_scope
-from ..models import Player
+from ..models import Player, PlayerCard
 
 BASE_CARD_PRIORITY = ["Common", "Rare", "UT Heroes", "Icon"]
 
 
-def assign_base_cards() -> int:
+def assign_base_cards(player_ids: Iterable[int] | None = None) -> int:
     """
     For each player, choose a base card according to the priority rules:
-    1. Prefer versions in BASE_CARD_PRIORITY (in that order).
+    1. Prefer versions in BASE_CARD_PRIORITY (in that order), tie-break by slug.
     2. If none found, pick the lowest rating card; tie-break by slug.
+
+    One UPDATE ranks every player's cards with a window function and only
+    writes players whose base card changed. Pass ``player_ids`` (the players
+    a scrape touched) to rank only their cards instead of the whole table.
     Returns number of players updated.
     """
-    updated = 0
+    ids = None if player_ids is None else sorted(set(player_ids))
+    if ids is not None and not ids:
+        return 0
+
+    priority = case(
+        {version: rank for rank, version in enumerate(BASE_CARD_PRIORITY)},
+        value=PlayerCard.version,
+        else_=len(BASE_CARD_PRIORITY),
+    )
+    # Rating only breaks ties between cards outside the priority list.
+    rating = case((PlayerCard.version.in_(BASE_CARD_PRIORITY), 0), else_=PlayerCard.rating)
+    ranked = select(
+        PlayerCard.player_id,
+        PlayerCard.card_slug,
+        PlayerCard.rating,
+        PlayerCard.version,
+        PlayerCard.image_url,
+        func.row_number()
+        .over(
+            partition_by=PlayerCard.player_id,
+            order_by=(priority, rating, PlayerCard.card_slug),
+        )
+        .label("position"),
+    )
+    if ids is not None:
+        ranked = ranked.where(PlayerCard.player_id.in_(ids))
+    ranked = ranked.subquery()
+    base = (
+        select(
+            ranked.c.player_id,
+            ranked.c.card_slug,
+            ranked.c.rating,
+            ranked.c.version,
+            ranked.c.image_url,
+        )
+        .where(ranked.c.position == 1)
+        .subquery()
+    )
 
     with session_scope() as session:
-        players = session.query(Player).all()
-        for player in players:
-            cards = sorted(
-                player.cards,
-                key=lambda c: (
-                    BASE_CARD_PRIORITY.index(c.version)
-                    if c.version in BASE_CARD_PRIORITY else len(BASE_CARD_PRIORITY),
-                    c.rating if c.version in BASE_CARD_PRIORITY else float("inf"),
-                    c.card_slug,
+        result = session.execute(
+            update(Player)
+            .where(Player.id == base.c.player_id)
+            .where(
+                or_(
+                    Player.base_card_slug.is_distinct_from(base.c.card_slug),
+                    Player.base_card_rating.is_distinct_from(base.c.rating),
+                    Player.base_card_version.is_distinct_from(base.c.version),
+                    Player.base_card_image_url.is_distinct_from(base.c.image_url),
                 )
             )
-
-            if not cards:
-                continue
-
-            # First, try to find best version card
-            preferred = [
-                card for card in cards if card.version in BASE_CARD_PRIORITY
-            ]
-            if preferred:
-                base = sorted(
-                    preferred,
-                    key=lambda c: (
-                        BASE_CARD_PRIORITY.index(c.version),
-                        c.card_slug,
-                    ),
-                )[0]
-            else:
-                base = sorted(
-                    cards,
-                    key=lambda c: (c.rating, c.card_slug),
-                )[0]
-
-            if (
-                player.base_card_slug != base.card_slug
-                or player.base_card_rating != base.rating
-                or player.base_card_version != base.version
-                or player.base_card_image_url != base.image_url
-            ):
-                player.base_card_slug = base.card_slug
-                player.base_card_rating = base.rating
-                player.base_card_version = base.version
-                player.base_card_image_url = base.image_url
-                updated += 1
-
-    return updated
\ No newline at end of file
+            .values(
+                base_card_slug=base.c.card_slug,
+                base_card_rating=base.c.rating,
+                base_card_version=base.c.version,
+                base_card_image_url=base.c.image_url,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -0,0 +1,122 @@
+"""
+Cross-page write batching for the per-page upsert path.
+
+``BatchWriter`` buffers the cards of several pages and upserts them
+together once ``max_pages`` pages or ``max_cards`` cards are pending, so a
+full scrape makes a handful of transactions instead of one per page. With
+``run_transaction`` every batch goes into a single session that is
+committed by :meth:`BatchWriter.finish`. Player ids are preloaded into a
+run-scoped :class:`PlayerIdCache` when the writer is entered.
+"""
+
+from __future__ import annotations
+
+from contextlib import AbstractContextManager
+from typing import Callable, Iterable
+
+from sqlalchemy.orm import Session
+
+from .connection import session_scope
+from .payloads import CardPayload
+from .player_ids import PlayerIdCache
+from .upserts import upsert_players_and_cards, write_cards
+
+
+class BatchWriter:
+    """
+    Buffered card writer: :meth:`add` queues a page, :meth:`finish` flushes.
+
+    ``on_stored`` callbacks passed to :meth:`add` run once the page's cards
+    are committed, so callers only record a page as stored when it is. Use
+    as a context manager; leaving the block with an exception rolls back the
+    run transaction.
+    """
+
+    def __init__(
+        self, max_pages: int = 1, max_cards: int = 0, run_transaction: bool = False
+    ) -> None:
+        if max_pages < 1:
+            raise ValueError(f"max_pages must be at least 1, got {max_pages}")
+        self.max_pages = max_pages
+        self.max_cards = max_cards
+        self.run_transaction = run_transaction
+        self.written = 0
+        self.flushes = 0
+        # Ids of the players whose cards were committed, and of those among
+        # them that the run inserted, for the post-scrape passes.
+        self.touched_player_ids: set[int] = set()
+        self.inserted_player_ids: set[int] = set()
+        self._pending: list[CardPayload] = []
+        self._pending_pages = 0
+        self._pending_callbacks: list[Callable[[], None]] = []
+        self._uncommitted_callbacks: list[Callable[[], None]] = []
+        self._scope: AbstractContextManager[Session] | None = None
+        self._session: Session | None = None
+        self._player_ids: PlayerIdCache | None = None
+
+    def __enter__(self) -> "BatchWriter":
+        self._player_ids = PlayerIdCache.load()
+        if self.run_transaction:
+            self._scope = session_scope()
+            self._session = self._scope.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._scope is not None:
+            scope, self._scope, self._session = self._scope, None, None
+            scope.__exit__(*exc_info)  # type: ignore[arg-type]
+
+    def add(
+        self, cards: Iterable[CardPayload], on_stored: Callable[[], None] | None = None
+    ) -> int:
+        """Queue one page of cards, flushing when a threshold is reached."""
+        self._pending.extend(cards)
+        self._pending_pages += 1
+        if on_stored is not None:
+            self._pending_callbacks.append(on_stored)
+        if self._pending_pages >= self.max_pages or (
+            self.max_cards and len(self._pending) >= self.max_cards
+        ):
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """
+        Write the pending cards now; returns how many were written.
+
+        If the write fails the batch is dropped and its callbacks never run.
+        """
+        pending, callbacks = self._pending, self._pending_callbacks
+        self._pending, self._pending_callbacks, self._pending_pages = [], [], 0
+        if pending:
+            if self._session is None:
+                written = upsert_players_and_cards(pending, self._player_ids)
+            else:
+                written = write_cards(self._session, pending, self._player_ids)
+                # Later batches share the transaction, so the ids are usable
+                # now; a rollback ends the run along with this writer.
+                if self._player_ids is not None:
+                    self._player_ids.remember(written.inserted)
+            self.touched_player_ids.update(written.touched.values())
+            self.inserted_player_ids.update(written.inserted.values())
+            self.flushes += 1
+            self.written += len(pending)
+        if self._session is None:
+            _run(callbacks)
+        else:
+            self._uncommitted_callbacks.extend(callbacks)
+        return len(pending)
+
+    def finish(self) -> int:
+        """Flush the last batch, commit the run transaction and return the cards written."""
+        self.flush()
+        if self._scope is not None:
+            self.__exit__(None, None, None)
+            callbacks, self._uncommitted_callbacks = self._uncommitted_callbacks, []
+            _run(callbacks)
+        return self.written
+
+
+def _run(callbacks: Iterable[Callable[[], None]]) -> None:
+    for callback in callbacks:
+        callback()
@@ -1,36 +1,211 @@
 """
 Database connection and session management.
+
+Engines are built from named profiles, so the API, the scraper and the
+tests each get a pool and driver tuned for how they use the database:
+
+- ``api``: many short concurrent requests; a larger pool, pre-ping on
+  checkout so connections dropped while idle are never handed out.
+- ``scraper``: one long run with a couple of connections and bulk writes;
+  connections are recycled by age instead of pinged on every checkout, and
+  multi-row inserts use large pages.
+- ``test``: a minimal pool for throwaway SQLite databases.
+
+Profile defaults can be overridden with the DB_* settings (see
+``.env.example``); each engine logs its effective configuration once.
+:func:`get_async_engine` builds the asyncio counterpart of a profile for
+the API's async routes.
 """
 
 from __future__ import annotations
 
+import logging
 from contextlib import contextmanager
-from typing import Iterator
+from dataclasses import dataclass, replace
+from typing import Any, Iterator
 
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from ..config import get_settings
 from ..models import Base
 
+logger = logging.getLogger("ScrapeFutGG")
+
 _settings = get_settings()
-_ENGINE: Engine | None = None
+_ENGINES: dict[str, Engine] = {}
+_ASYNC_ENGINES: dict[str, AsyncEngine] = {}
 SessionLocal: sessionmaker[Session] | None = None
 
 
-def get_engine() -> Engine:
-    """Lazily create and cache the SQLAlchemy engine and session factory."""
-    global _ENGINE, SessionLocal  # pylint: disable=global-statement
-    if _ENGINE is None:
-        engine = create_engine(
-            _settings.database_url,
-            pool_pre_ping=True,
+@dataclass(frozen=True)
+class EngineProfile:
+    name: str
+    pool_size: int
+    max_overflow: int
+    # "pre_ping" tests each connection on checkout; "recycle" replaces
+    # connections older than pool_recycle seconds without a round trip.
+    liveness: str
+    pool_recycle: float
+    # Rows per multi-row INSERT (insertmanyvalues / psycopg2 executemany).
+    insert_page_size: int
+    # Compiled statements kept in SQLAlchemy's statement cache.
+    statement_cache_size: int
+    # "psycopg2" or "psycopg" (psycopg 3, optional dependency).
+    driver: str
+
+    def describe(self) -> str:
+        if self.liveness == "pre_ping":
+            liveness = "pre-ping"
+        elif self.pool_recycle > 0:
+            liveness = f"recycle after {self.pool_recycle:g}s"
+        else:
+            liveness = "no liveness check"
+        return (
+            f"pool {self.pool_size}+{self.max_overflow}, {liveness}, "
+            f"insert pages of {self.insert_page_size}, "
+            f"statement cache {self.statement_cache_size}, driver {self.driver}"
         )
-        SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-        Base.metadata.bind = engine
-        _ENGINE = engine
-    return _ENGINE
+
+
+PROFILES: dict[str, EngineProfile] = {
+    "api": EngineProfile(
+        name="api",
+        pool_size=10,
+        max_overflow=20,
+        liveness="pre_ping",
+        pool_recycle=1800.0,
+        insert_page_size=1000,
+        statement_cache_size=500,
+        driver="psycopg2",
+    ),
+    "scraper": EngineProfile(
+        name="scraper",
+        pool_size=2,
+        max_overflow=2,
+        liveness="recycle",
+        pool_recycle=1800.0,
+        insert_page_size=5000,
+        statement_cache_size=200,
+        driver="psycopg2",
+    ),
+    "test": EngineProfile(
+        name="test",
+        pool_size=1,
+        max_overflow=4,
+        liveness="recycle",
+        pool_recycle=-1.0,
+        insert_page_size=1000,
+        statement_cache_size=100,
+        driver="psycopg2",
+    ),
+}
+
+
+def get_profile(name: str) -> EngineProfile:
+    """The named profile with any DB_* setting overrides applied."""
+    try:
+        profile = PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown engine profile {name!r}; expected one of {sorted(PROFILES)}"
+        ) from None
+    overrides = {
+        "pool_size": _settings.db_pool_size,
+        "max_overflow": _settings.db_max_overflow,
+        "liveness": _settings.db_liveness,
+        "pool_recycle": _settings.db_pool_recycle,
+        "insert_page_size": _settings.db_insert_page_size,
+        "statement_cache_size": _settings.db_statement_cache_size,
+        "driver": _settings.db_driver,
+    }
+    return replace(profile, **{key: value for key, value in overrides.items() if value is not None})
+
+
+def create_profile_engine(database_url: str, profile: EngineProfile) -> Engine:
+    """Create an engine for ``database_url`` tuned by ``profile``."""
+    url, kwargs = _engine_arguments(database_url, profile, asynchronous=False)
+    engine = create_engine(url, **kwargs)
+    _log_engine(profile, engine.url)
+    return engine
+
+
+def create_profile_async_engine(database_url: str, profile: EngineProfile) -> AsyncEngine:
+    """
+    Create an asyncio engine for ``database_url`` tuned by ``profile``.
+
+    PostgreSQL goes through asyncpg, or psycopg 3 when the profile selects
+    it; SQLite through aiosqlite.
+    """
+    url, kwargs = _engine_arguments(database_url, profile, asynchronous=True)
+    engine = create_async_engine(url, **kwargs)
+    _log_engine(profile, engine.url)
+    return engine
+
+
+def _engine_arguments(
+    database_url: str, profile: EngineProfile, *, asynchronous: bool
+) -> tuple[URL, dict[str, Any]]:
+    url = make_url(database_url)
+    kwargs: dict[str, Any] = {
+        "pool_pre_ping": profile.liveness == "pre_ping",
+        "pool_recycle": profile.pool_recycle if profile.liveness == "recycle" else -1,
+        "insertmanyvalues_page_size": profile.insert_page_size,
+        "query_cache_size": profile.statement_cache_size,
+    }
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        kwargs["pool_size"] = profile.pool_size
+        kwargs["max_overflow"] = profile.max_overflow
+        if profile.driver == "psycopg":
+            url = url.set(drivername="postgresql+psycopg")
+        elif asynchronous:
+            url = url.set(drivername="postgresql+asyncpg")
+        else:
+            url = url.set(drivername="postgresql+psycopg2")
+            kwargs["executemany_mode"] = "values_plus_batch"
+            kwargs["executemany_batch_page_size"] = profile.insert_page_size
+    elif backend == "sqlite" and asynchronous:
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url, kwargs
+
+
+def _log_engine(profile: EngineProfile, url: URL) -> None:
+    logger.info(
+        "Database engine %r (%s): %s",
+        profile.name,
+        url.render_as_string(hide_password=True),
+        profile.describe(),
+    )
+
+
+def get_engine(profile: str = "scraper") -> Engine:
+    """
+    Lazily create and cache the engine for ``profile``.
+
+    The scraper engine also backs :data:`SessionLocal` and
+    :func:`session_scope`.
+    """
+    global SessionLocal  # pylint: disable=global-statement
+    engine = _ENGINES.get(profile)
+    if engine is None:
+        engine = create_profile_engine(_settings.database_url, get_profile(profile))
+        _ENGINES[profile] = engine
+        if profile == "scraper":
+            SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+            Base.metadata.bind = engine
+    return engine
+
+
+def get_async_engine(profile: str = "api") -> AsyncEngine:
+    """Lazily create and cache the asyncio engine for ``profile``."""
+    engine = _ASYNC_ENGINES.get(profile)
+    if engine is None:
+        engine = create_profile_async_engine(_settings.database_url, get_profile(profile))
+        _ASYNC_ENGINES[profile] = engine
+    return engine
 
 
 @contextmanager
@@ -47,4 +222,4 @@ def session_scope() -> Iterator[Session]:
         session.rollback()
         raise
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
@@ -0,0 +1,195 @@
+"""
+PostgreSQL bulk ingest through ``COPY FROM STDIN``.
+
+Instead of one multi-row ``INSERT ... ON CONFLICT`` per page, every card of
+the run is streamed into a temporary staging table as pages are stored.
+When the run finishes, three set-based statements merge the staging table:
+insert the new players, upsert the cards and refresh ``any_in_club`` for the
+players the run touched. Everything happens in one transaction on one
+connection, so a failed run leaves the tables untouched.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from typing import Any, Callable, Iterable
+
+from sqlalchemy.engine import Engine
+
+from .connection import get_engine
+from .payloads import CardPayload
+from ..names import fold_name
+
+STAGING_TABLE = "card_staging"
+
+_CREATE_STAGING = f"""
+CREATE TEMPORARY TABLE {STAGING_TABLE} (
+    seq BIGINT NOT NULL,
+    player_slug TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    search_name TEXT NOT NULL,
+    card_slug TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    card_url TEXT NOT NULL,
+    image_url TEXT,
+    in_club BOOLEAN NOT NULL
+) ON COMMIT DROP
+"""
+
+_COPY_STAGING = (
+    f"COPY {STAGING_TABLE} (seq, player_slug, display_name, search_name, card_slug, "
+    "name, rating, version, card_url, image_url, in_club) FROM STDIN WITH (FORMAT csv, "
+    "FORCE_NOT_NULL (player_slug, display_name, search_name, card_slug, name, version, "
+    "card_url))"
+)
+
+# The first occurrence of a player names it, like the per-page upsert.
+_MERGE_PLAYERS = f"""
+INSERT INTO players (slug, display_name, search_name)
+SELECT DISTINCT ON (player_slug) player_slug, display_name, search_name
+FROM {STAGING_TABLE}
+ORDER BY player_slug, seq
+ON CONFLICT (slug) DO NOTHING
+RETURNING id
+"""
+
+# The last occurrence of a card wins; in_club is only set for new cards.
+_MERGE_CARDS = f"""
+INSERT INTO player_cards (player_id, card_slug, name, rating, version, card_url, image_url, in_club)
+SELECT p.id, s.card_slug, s.name, s.rating, s.version, s.card_url, s.image_url, s.in_club
+FROM (
+    SELECT DISTINCT ON (card_slug) *
+    FROM {STAGING_TABLE}
+    ORDER BY card_slug, seq DESC
+) AS s
+JOIN players AS p ON p.slug = s.player_slug
+ON CONFLICT (card_slug) DO UPDATE SET
+    name = EXCLUDED.name,
+    rating = EXCLUDED.rating,
+    version = EXCLUDED.version,
+    card_url = EXCLUDED.card_url,
+    image_url = EXCLUDED.image_url,
+    last_seen_at = NOW()
+RETURNING player_id
+"""
+
+_REFRESH_ANY_IN_CLUB = f"""
+UPDATE players AS p
+SET any_in_club = agg.any_in_club
+FROM (
+    SELECT c.player_id, bool_or(c.in_club) AS any_in_club
+    FROM player_cards AS c
+    JOIN players AS touched ON touched.id = c.player_id
+    WHERE touched.slug IN (SELECT DISTINCT player_slug FROM {STAGING_TABLE})
+    GROUP BY c.player_id
+) AS agg
+WHERE p.id = agg.player_id
+"""
+
+
+def encode_copy_rows(cards: Iterable[CardPayload], start: int = 0) -> str:
+    """
+    Render cards as COPY CSV rows numbered from ``start``.
+
+    A missing image URL is written as an empty field and loads as NULL.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for seq, card in enumerate(cards, start):
+        writer.writerow(
+            (
+                seq,
+                card.player_slug,
+                card.display_name,
+                fold_name(card.display_name),
+                card.card_slug,
+                card.name,
+                card.rating,
+                card.version,
+                card.card_url,
+                card.image_url,
+                card.in_club,
+            )
+        )
+    return buffer.getvalue()
+
+
+class CopyIngest:
+    """
+    Run-scoped COPY writer: :meth:`add` stages a page, :meth:`finish` merges.
+
+    ``on_stored`` callbacks passed to :meth:`add` run after the merge is
+    committed. Use as a context manager; leaving the block without calling
+    :meth:`finish` (e.g. on an exception) rolls the staged rows back.
+    """
+
+    def __init__(self, engine: Engine | None = None) -> None:
+        self._engine = engine
+        self._connection: Any = None
+        self.staged = 0
+        # Ids of the players whose cards were merged, and of those among them
+        # that the run inserted, for the post-scrape passes.
+        self.touched_player_ids: set[int] = set()
+        self.inserted_player_ids: set[int] = set()
+        self._callbacks: list[Callable[[], None]] = []
+
+    def __enter__(self) -> "CopyIngest":
+        engine = self._engine or get_engine()
+        if engine.dialect.name != "postgresql":
+            raise RuntimeError(f"COPY ingest needs PostgreSQL, not {engine.dialect.name}")
+        self._connection = engine.raw_connection()
+        with self._connection.cursor() as cursor:
+            cursor.execute(_CREATE_STAGING)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._connection is not None:
+            self._close(commit=False)
+
+    def add(
+        self, cards: Iterable[CardPayload], on_stored: Callable[[], None] | None = None
+    ) -> int:
+        """Stream ``cards`` into the staging table; returns the number staged."""
+        if on_stored is not None:
+            self._callbacks.append(on_stored)
+        cards = list(cards)
+        if not cards:
+            return 0
+        rows = encode_copy_rows(cards, start=self.staged)
+        with self._connection.cursor() as cursor:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                cursor.copy_expert(_COPY_STAGING, io.StringIO(rows))
+            else:  # psycopg 3
+                with cursor.copy(_COPY_STAGING) as copy:
+                    copy.write(rows)
+        self.staged += len(cards)
+        return len(cards)
+
+    def finish(self) -> int:
+        """Merge the staged cards, commit, and return the number of cards upserted."""
+        with self._connection.cursor() as cursor:
+            cursor.execute(_MERGE_PLAYERS)
+            inserted_player_ids = [player_id for (player_id,) in cursor.fetchall()]
+            cursor.execute(_MERGE_CARDS)
+            merged_player_ids = [player_id for (player_id,) in cursor.fetchall()]
+            cursor.execute(_REFRESH_ANY_IN_CLUB)
+        self._close(commit=True)
+        self.touched_player_ids.update(merged_player_ids)
+        self.inserted_player_ids.update(inserted_player_ids)
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+        return len(merged_player_ids)
+
+    def _close(self, *, commit: bool) -> None:
+        connection, self._connection = self._connection, None
+        try:
+            if commit:
+                connection.commit()
+            else:
+                connection.rollback()
+        finally:
+            connection.close()
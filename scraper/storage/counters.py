@@ -0,0 +1,36 @@
+"""
+Repair of the per-player card counters.
+
+``players.total_cards`` and ``players.in_club_count`` are kept up to date
+by triggers on ``player_cards``; this recomputes them from scratch, e.g.
+after the triggers were missing or disabled during a bulk load.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Integer, func, or_, select, update
+
+from .connection import session_scope
+from ..models import Player, PlayerCard
+
+
+def recount_player_cards() -> int:
+    """Recompute both counters for every player; returns how many were wrong."""
+    total = (
+        select(func.count(PlayerCard.id))
+        .where(PlayerCard.player_id == Player.id)
+        .scalar_subquery()
+    )
+    in_club = (
+        select(func.coalesce(func.sum(func.cast(PlayerCard.in_club, Integer)), 0))
+        .where(PlayerCard.player_id == Player.id)
+        .scalar_subquery()
+    )
+    with session_scope() as session:
+        result = session.execute(
+            update(Player)
+            .where(or_(Player.total_cards != total, Player.in_club_count != in_club))
+            .values(total_cards=total, in_club_count=in_club)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
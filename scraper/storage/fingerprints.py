@@ -0,0 +1,90 @@
+"""
+Persisted page fingerprints used to skip unchanged listing pages.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from .connection import session_scope
+from ..fingerprint import PageFingerprint
+from ..models import PageFingerprintRecord
+
+
+class FingerprintStore:
+    """
+    In-memory view of the ``page_fingerprints`` table for the duration of a run.
+
+    Like :class:`~scraper.storage.validators.ValidatorStore`, it is read once
+    at the start of a run and written once at the end.
+    """
+
+    def __init__(self, entries: Mapping[str, PageFingerprint] | None = None) -> None:
+        self._entries: dict[str, PageFingerprint] = dict(entries or {})
+        self._dirty: set[str] = set()
+
+    @classmethod
+    def load(cls) -> "FingerprintStore":
+        with session_scope() as session:
+            rows = session.execute(
+                select(
+                    PageFingerprintRecord.url,
+                    PageFingerprintRecord.fingerprint,
+                    PageFingerprintRecord.card_slugs,
+                )
+            )
+            return cls(
+                {
+                    url: PageFingerprint(digest, tuple(filter(None, slugs.split("\n"))))
+                    for url, digest, slugs in rows
+                }
+            )
+
+    def is_unchanged(self, url: str, fingerprint: PageFingerprint) -> bool:
+        """True when ``url`` had the same non-empty card set on the last run."""
+        if not fingerprint.card_slugs:
+            return False
+        stored = self._entries.get(url)
+        return stored is not None and stored.digest == fingerprint.digest
+
+    def card_slugs(self, url: str) -> tuple[str, ...]:
+        """Card slugs stored for ``url`` (empty if the page was never stored)."""
+        stored = self._entries.get(url)
+        return stored.card_slugs if stored is not None else ()
+
+    def remember(self, url: str, fingerprint: PageFingerprint) -> None:
+        """Record the fingerprint of a page whose cards were stored successfully."""
+        if self._entries.get(url) == fingerprint:
+            return
+        self._entries[url] = fingerprint
+        self._dirty.add(url)
+
+    def save(self) -> int:
+        """Persist fingerprints that changed during the run. Returns rows written."""
+        if not self._dirty:
+            return 0
+        rows = [
+            {
+                "url": url,
+                "fingerprint": self._entries[url].digest,
+                "card_slugs": "\n".join(self._entries[url].card_slugs),
+            }
+            for url in sorted(self._dirty)
+        ]
+        with session_scope() as session:
+            stmt = insert(PageFingerprintRecord).values(rows)
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["url"],
+                    set_={
+                        "fingerprint": stmt.excluded.fingerprint,
+                        "card_slugs": stmt.excluded.card_slugs,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        self._dirty.clear()
+        return len(rows)
@@ -0,0 +1,56 @@
+"""
+Run-scoped snapshot of stored cards for incremental scrapes.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping, NamedTuple
+
+from sqlalchemy import select
+
+from .connection import session_scope
+from .payloads import CardPayload
+from ..models import PlayerCard
+
+
+class CardSignature(NamedTuple):
+    rating: int
+    version: str
+    image_url: str | None
+
+
+class KnownCards:
+    """
+    Card slug → (rating, version, image) for every stored card.
+
+    Loaded with a single query at the start of a run so incremental scrapes
+    can tell whether a page brings anything new without a query per page.
+    """
+
+    def __init__(self, signatures: Mapping[str, CardSignature] | None = None) -> None:
+        self._signatures: dict[str, CardSignature] = dict(signatures or {})
+
+    @classmethod
+    def load(cls) -> "KnownCards":
+        with session_scope() as session:
+            rows = session.execute(
+                select(
+                    PlayerCard.card_slug,
+                    PlayerCard.rating,
+                    PlayerCard.version,
+                    PlayerCard.image_url,
+                )
+            )
+            return cls({slug: CardSignature(rating, version, image) for slug, rating, version, image in rows})
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def is_known(self, payload: CardPayload) -> bool:
+        """True if the card is stored with identical rating, version and image."""
+        return self._signatures.get(payload.card_slug) == CardSignature(
+            payload.rating, payload.version, payload.image_url
+        )
+
+    def all_known(self, payloads: Iterable[CardPayload]) -> bool:
+        return all(self.is_known(payload) for payload in payloads)
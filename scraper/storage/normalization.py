@@ -4,40 +4,91 @@ Display name normalization utilities.
 
 from __future__ import annotations
 
-from sqlalchemy import func, select
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import func, select, update
 
 from .connection import session_scope
 from ..models import Player
+from ..name_index import patch_display_names
+from ..names import fold_name
 
 
-def normalize_duplicate_display_names() -> int:
+def normalize_duplicate_display_names(player_ids: Iterable[int] | None = None) -> int:
     """
     For any display_name shared by multiple players, rewrite the display_name
     using the player's slug converted to title case (e.g., 'ronald-araujo' → 'Ronald Araujo').
+    ``search_name`` is rewritten along with it and ``updated_at`` is bumped,
+    so API processes notice the rename; the in-memory name index (if one is
+    loaded in this process) is patched once the update commits.
+
+    One query fetches every player in a duplicate group and one bulk UPDATE
+    writes the names that change. Pass ``player_ids`` (the players a scrape
+    inserted) to only consider the display names those players carry.
     Returns the number of players that were updated.
     """
+    ids = None if player_ids is None else sorted(set(player_ids))
+    if ids is not None and not ids:
+        return 0
+
+    duplicates = (
+        select(Player.display_name)
+        .group_by(Player.display_name)
+        .having(func.count(Player.id) > 1)
+    )
+    if ids is not None:
+        duplicates = duplicates.where(
+            Player.display_name.in_(select(Player.display_name).where(Player.id.in_(ids)))
+        )
+
     with session_scope() as session:
-        duplicates = [
-            name for (name,) in session.execute(
-                select(Player.display_name)
-                .group_by(Player.display_name)
-                .having(func.count(Player.id) > 1)
+        rows = session.execute(
+            select(Player.id, Player.slug, Player.display_name).where(
+                Player.display_name.in_(duplicates)
             )
-        ]
+        )
+        updates = []
+        renamed: dict[str, str] = {}
+        now = datetime.now(timezone.utc)
+        for player_id, slug, display_name in rows:
+            pretty_name = slug.replace("-", " ").title()
+            if display_name != pretty_name:
+                renamed[slug] = pretty_name
+                updates.append(
+                    {
+                        "id": player_id,
+                        "display_name": pretty_name,
+                        "search_name": fold_name(pretty_name),
+                        "updated_at": now,
+                    }
+                )
 
-        if not duplicates:
-            return 0
+        if updates:
+            session.execute(update(Player), updates)
 
-        updated = 0
-        for name in duplicates:
-            players = session.execute(
-                select(Player).where(Player.display_name == name)
-            ).scalars()
+    patch_display_names(renamed)
+    return len(updates)
 
-            for player in players:
-                pretty_name = player.slug.replace("-", " ").title()
-                if player.display_name != pretty_name:
-                    player.display_name = pretty_name
-                    updated += 1
 
-        return updated
\ No newline at end of file
+def refresh_search_names() -> int:
+    """
+    Recompute ``search_name`` from ``display_name`` for every player.
+
+    Run once after the ``search_name`` migration (``--refresh-search-names``),
+    or after the folding rules change. Rewritten rows get ``updated_at``
+    bumped so API processes rebuild their name index. Returns the number of
+    players that were updated.
+    """
+    now = datetime.now(timezone.utc)
+    with session_scope() as session:
+        updates = [
+            {"id": player_id, "search_name": folded, "updated_at": now}
+            for player_id, display_name, search_name in session.execute(
+                select(Player.id, Player.display_name, Player.search_name)
+            )
+            if (folded := fold_name(display_name)) != search_name
+        ]
+        if updates:
+            session.execute(update(Player), updates)
+        return len(updates)
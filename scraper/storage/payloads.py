@@ -1,20 +1,147 @@
 """
 Data transfer objects for storage operations.
+
+``CardPayload`` is what every scraped card travels as, from the parser
+through the pipeline queues to the writers, so it is kept compact:
+``__slots__`` instead of a per-instance ``__dict__``, interned strings for
+values shared by many cards (player slugs, names, versions), and URLs held
+as an interned prefix plus a per-card suffix. The usual card URL is not
+stored at all: it is the players prefix plus the card slug.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from dataclasses import FrozenInstanceError
+from typing import Any
+
+PLAYERS_URL_PREFIX = sys.intern("https://www.fut.gg/players/")
+
+
+def _split_url(url: str | None) -> tuple[str | None, str | None]:
+    """Split ``url`` into an interned, widely shared prefix and its suffix."""
+    if url is None:
+        return None, None
+    if url.startswith(PLAYERS_URL_PREFIX):
+        cut = len(PLAYERS_URL_PREFIX)
+    else:
+        # Card images share the CDN directory; only the file name differs.
+        cut = url.rfind("/") + 1
+    return sys.intern(url[:cut]), url[cut:]
+
+
+# Constructor arguments, in order.
+_FIELDS = (
+    "player_slug",
+    "display_name",
+    "card_slug",
+    "name",
+    "rating",
+    "version",
+    "card_url",
+    "image_url",
+    "in_club",
+)
 
 
-@dataclass(frozen=True)
 class CardPayload:
-    player_slug: str
-    display_name: str
-    card_slug: str
-    name: str
-    rating: int
-    version: str
-    card_url: str
-    image_url: str | None
-    in_club: bool = False
\ No newline at end of file
+    """One scraped card. Immutable, hashable and compared by value."""
+
+    __slots__ = (
+        "player_slug",
+        "display_name",
+        "card_slug",
+        "name",
+        "rating",
+        "version",
+        "in_club",
+        "_card_url_prefix",
+        "_card_url_suffix",
+        "_image_url_prefix",
+        "_image_url_suffix",
+    )
+
+    def __init__(
+        self,
+        player_slug: str,
+        display_name: str,
+        card_slug: str,
+        name: str,
+        rating: int,
+        version: str,
+        card_url: str,
+        image_url: str | None,
+        in_club: bool = False,
+    ) -> None:
+        init = object.__setattr__
+        init(self, "player_slug", sys.intern(player_slug))
+        init(self, "display_name", sys.intern(display_name))
+        init(self, "card_slug", card_slug)
+        init(self, "name", sys.intern(name))
+        init(self, "rating", rating)
+        init(self, "version", sys.intern(version))
+        init(self, "in_club", in_club)
+        card_prefix, card_suffix = _split_url(card_url)
+        if card_prefix is PLAYERS_URL_PREFIX and card_suffix == f"{card_slug}/":
+            card_suffix = None
+        init(self, "_card_url_prefix", card_prefix)
+        init(self, "_card_url_suffix", card_suffix)
+        image_prefix, image_suffix = _split_url(image_url)
+        init(self, "_image_url_prefix", image_prefix)
+        init(self, "_image_url_suffix", image_suffix)
+
+    @property
+    def card_url(self) -> str:
+        if self._card_url_suffix is None:
+            return f"{self._card_url_prefix}{self.card_slug}/"
+        return self._card_url_prefix + self._card_url_suffix  # type: ignore[operator]
+
+    @property
+    def image_url(self) -> str | None:
+        if self._image_url_prefix is None:
+            return None
+        return self._image_url_prefix + self._image_url_suffix  # type: ignore[operator]
+
+    def replace(self, **changes: Any) -> "CardPayload":
+        """A copy with the given fields changed, like :func:`dataclasses.replace`."""
+        fields = dict(zip(_FIELDS, self._values()))
+        unknown = changes.keys() - fields.keys()
+        if unknown:
+            raise TypeError(f"CardPayload has no field(s) {', '.join(sorted(unknown))}")
+        return CardPayload(**{**fields, **changes})
+
+    # copy.replace() support (Python 3.13+).
+    __replace__ = replace
+
+    def _values(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, field) for field in _FIELDS)
+
+    def _key(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()  # type: ignore[attr-defined]
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Rebuild through __init__ so cards returned by parse worker
+        # processes are interned in the receiving process too.
+        return (CardPayload, self._values())
+
+    def __repr__(self) -> str:
+        return (
+            f"CardPayload(player_slug={self.player_slug!r}, display_name={self.display_name!r}, "
+            f"card_slug={self.card_slug!r}, name={self.name!r}, rating={self.rating!r}, "
+            f"version={self.version!r}, card_url={self.card_url!r}, "
+            f"image_url={self.image_url!r}, in_club={self.in_club!r})"
+        )
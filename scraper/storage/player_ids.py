@@ -0,0 +1,50 @@
+"""
+Run-scoped player slug → id cache.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .connection import session_scope
+from ..models import Player
+
+
+class PlayerIdCache:
+    """
+    Player slug → id for the players a run writes cards for.
+
+    Loaded with a single query at the start of a run so each batch resolves
+    its players from memory. Slugs the cache has never seen are looked up in
+    the database once; ids of newly inserted players come from ``RETURNING``
+    and are added with :meth:`remember` once their insert is committed.
+    """
+
+    def __init__(self, ids: Mapping[str, int] | None = None) -> None:
+        self._ids: dict[str, int] = dict(ids or {})
+
+    @classmethod
+    def load(cls) -> "PlayerIdCache":
+        with session_scope() as session:
+            return cls(dict(session.execute(select(Player.slug, Player.id)).all()))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def resolve(self, session: Session, slugs: Iterable[str]) -> dict[str, int]:
+        """Ids of the stored players among ``slugs``, querying only unseen slugs."""
+        slugs = set(slugs)
+        unseen = slugs.difference(self._ids)
+        if unseen:
+            self._ids.update(
+                session.execute(
+                    select(Player.slug, Player.id).where(Player.slug.in_(unseen))
+                ).all()
+            )
+        return {slug: self._ids[slug] for slug in slugs if slug in self._ids}
+
+    def remember(self, ids: Mapping[str, int]) -> None:
+        self._ids.update(ids)
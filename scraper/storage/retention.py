@@ -0,0 +1,126 @@
+"""
+Scrape run bookkeeping and stale-card pruning.
+
+Every card stored or seen unchanged has its ``last_seen_at`` bumped, so a
+card that was not seen since the start of the K-th most recent finished
+full scrape has left FUT.GG. Runs that did not check every page (MAX_PAGES,
+or pages dropped after parse or store errors) are recorded as "partial"
+and do not count. :func:`prune_stale_cards` moves such cards to
+``player_cards_archive`` and refreshes the players they belonged to.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import delete, func, insert, inspect, select, update
+
+from .base_cards import assign_base_cards
+from .connection import session_scope
+from .upserts import _refresh_any_in_club
+from ..models import Player, PlayerCard, PlayerCardArchive, ScrapeRun
+
+_ARCHIVED_COLUMNS = (
+    "id",
+    "player_id",
+    "card_slug",
+    "name",
+    "rating",
+    "version",
+    "card_url",
+    "image_url",
+    "in_club",
+    "scraped_at",
+    "last_seen_at",
+)
+
+
+def record_run_start(mode: str) -> int:
+    """
+    Insert a ``scrape_runs`` row for a starting run and return its id.
+
+    ``mode`` is "full" for a run that walks the whole listing, "incremental",
+    or "partial" for a full run that cannot see every page (e.g. MAX_PAGES).
+    """
+    with session_scope() as session:
+        return session.execute(
+            insert(ScrapeRun).values(mode=mode).returning(ScrapeRun.id)
+        ).scalar_one()
+
+
+def record_run_finish(run_id: int, mode: str | None = None) -> None:
+    """
+    Mark a run as finished; only finished full runs count for retention.
+
+    Pass ``mode`` to record a different mode than the run started with, e.g.
+    "partial" for a full run that dropped pages it failed to parse or store.
+    """
+    values = {"finished_at": func.now()}
+    if mode is not None:
+        values["mode"] = mode
+    with session_scope() as session:
+        session.execute(update(ScrapeRun).where(ScrapeRun.id == run_id).values(**values))
+
+
+def prune_stale_cards(keep_runs: int) -> int:
+    """
+    Archive cards not seen during the last ``keep_runs`` finished full runs.
+
+    Players that lose cards get ``any_in_club`` recomputed and their base
+    card reassigned; players left without cards have both cleared. The card
+    counters follow through the ``player_cards`` triggers. Nothing is pruned
+    until ``keep_runs`` full runs have finished. Returns the number of cards
+    archived.
+    """
+    if keep_runs < 1:
+        return 0
+
+    cutoff = (
+        select(ScrapeRun.started_at)
+        .where(ScrapeRun.mode == "full", ScrapeRun.finished_at.is_not(None))
+        .order_by(ScrapeRun.started_at.desc())
+        .offset(keep_runs - 1)
+        .limit(1)
+        .scalar_subquery()
+    )
+    cards = PlayerCard.__table__
+    archive = PlayerCardArchive.__table__
+    columns = [cards.c[column] for column in _ARCHIVED_COLUMNS]
+    stale = cards.c.last_seen_at < cutoff
+
+    with session_scope() as session:
+        if inspect(session.bind).dialect.name == "postgresql":
+            # One statement: DELETE ... RETURNING feeds the archive INSERT.
+            moved = delete(cards).where(stale).returning(*columns).cte("moved")
+            player_ids = list(
+                session.scalars(
+                    insert(archive)
+                    .from_select(_ARCHIVED_COLUMNS, select(moved))
+                    .returning(archive.c.player_id)
+                )
+            )
+        else:
+            player_ids = list(session.scalars(select(cards.c.player_id).where(stale)))
+            if player_ids:
+                session.execute(
+                    insert(archive).from_select(_ARCHIVED_COLUMNS, select(*columns).where(stale))
+                )
+                session.execute(delete(cards).where(stale))
+
+        if not player_ids:
+            return 0
+        affected = sorted(set(player_ids))
+        _refresh_any_in_club(session, affected)
+        session.execute(
+            update(Player)
+            .where(Player.id.in_(affected), ~Player.cards.any())
+            .values(
+                any_in_club=False,
+                base_card_slug=None,
+                base_card_rating=None,
+                base_card_version=None,
+                base_card_image_url=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    assign_base_cards(affected)
+    return len(player_ids)
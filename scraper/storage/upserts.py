@@ -4,7 +4,7 @@ Player and card upsert operations.
 
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+from typing import Collection, Iterable, NamedTuple, Sequence
 
 from sqlalchemy import func, insert, select, update, Integer
 from sqlalchemy.orm import Session
@@ -12,60 +12,122 @@ from sqlalchemy.dialects.postgresql import insert
 
 from .connection import session_scope
 from .payloads import CardPayload
+from .player_ids import PlayerIdCache
 from ..models import Player, PlayerCard
+from ..names import fold_name
 
 
-def upsert_players_and_cards(cards: Iterable[CardPayload]) -> None:
+class WrittenPlayers(NamedTuple):
+    """Slug → id of the players a batch wrote cards for, and of those it inserted."""
+
+    touched: dict[str, int]
+    inserted: dict[str, int]
+
+
+def upsert_players_and_cards(
+    cards: Iterable[CardPayload], player_ids: PlayerIdCache | None = None
+) -> WrittenPlayers:
+    """
+    Upsert one batch of cards (and their players) in its own transaction.
+
+    Pass the run's ``player_ids`` cache to resolve known players from memory;
+    the ids of players this batch inserts are added to it after the commit.
+    """
     payloads = list(cards)
     if not payloads:
-        return
+        return WrittenPlayers({}, {})
 
     with session_scope() as session:
-        _ensure_players(session, payloads)
-        _upsert_cards(session, payloads)
-        _refresh_any_in_club(session, payloads)
+        written = write_cards(session, payloads, player_ids)
+    if player_ids is not None:
+        player_ids.remember(written.inserted)
+    return written
+
+
+def write_cards(
+    session: Session,
+    payloads: Sequence[CardPayload],
+    player_ids: PlayerIdCache | None = None,
+) -> WrittenPlayers:
+    """
+    Upsert players and cards within ``session`` without committing.
+
+    The caller adds the inserted players to ``player_ids`` once the
+    transaction is committed.
+    """
+    ids, inserted = _ensure_players(session, payloads, player_ids or PlayerIdCache())
+    _upsert_cards(session, payloads, ids)
+    _refresh_any_in_club(session, sorted(set(ids.values())))
+    return WrittenPlayers(ids, inserted)
+
+
+def touch_cards_seen(card_slugs: Iterable[str]) -> int:
+    """
+    Bump ``last_seen_at`` for cards on pages skipped as unchanged.
+
+    One bulk UPDATE replaces the full upsert for those pages. Returns the
+    number of rows touched.
+    """
+    slugs = sorted(set(card_slugs))
+    if not slugs:
+        return 0
 
+    with session_scope() as session:
+        result = session.execute(
+            update(PlayerCard)
+            .where(PlayerCard.card_slug.in_(slugs))
+            .values(last_seen_at=func.now())
+        )
+        return result.rowcount
 
-def _ensure_players(session: Session, payloads: Sequence[CardPayload]) -> None:
+
+def _ensure_players(
+    session: Session, payloads: Sequence[CardPayload], player_ids: PlayerIdCache
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Insert missing players; returns (slug → id for every payload, inserted only)."""
     slugs = {payload.player_slug for payload in payloads}
-    existing = {
-        slug.lower()
-        for (slug,) in session.execute(
-            select(Player.slug).where(Player.slug.in_(slugs))
-        )
-    }
+    ids = player_ids.resolve(session, slugs)
 
     new_players = []
-    seen = set(existing)
+    seen = {slug.lower() for slug in ids}
     for payload in payloads:
         slug = payload.player_slug.lower()
         if slug in seen:
             continue
         seen.add(slug)
         new_players.append(
-            {"slug": payload.player_slug, "display_name": payload.display_name}
+            {
+                "slug": payload.player_slug,
+                "display_name": payload.display_name,
+                "search_name": fold_name(payload.display_name),
+            }
         )
 
+    inserted: dict[str, int] = {}
     if new_players:
-        stmt = insert(Player).values(new_players)
-        session.execute(stmt.on_conflict_do_nothing(index_elements=["slug"]))
-
-
-def _upsert_cards(session: Session, payloads: Sequence[CardPayload]) -> None:
+        stmt = (
+            insert(Player)
+            .values(new_players)
+            .on_conflict_do_nothing(index_elements=["slug"])
+            .returning(Player.slug, Player.id)
+        )
+        inserted = dict(session.execute(stmt).all())
+        ids.update(inserted)
+        # Rows skipped by ON CONFLICT were inserted concurrently.
+        missing = slugs.difference(ids)
+        if missing:
+            ids.update(player_ids.resolve(session, missing))
+    return ids, inserted
+
+
+def _upsert_cards(
+    session: Session, payloads: Sequence[CardPayload], player_id_map: dict[str, int]
+) -> None:
     unique_payloads: dict[str, CardPayload] = {}
     for payload in payloads:
         unique_payloads[payload.card_slug] = payload
     payloads = list(unique_payloads.values())
 
-    player_id_map = {
-        slug: player_id
-        for slug, player_id in session.execute(
-            select(Player.slug, Player.id).where(
-                Player.slug.in_({payload.player_slug for payload in payloads})
-            )
-        )
-    }
-
     insert_stmt = insert(PlayerCard).values(
         [
             {
@@ -95,14 +157,7 @@ def _upsert_cards(session: Session, payloads: Sequence[CardPayload]) -> None:
     session.execute(upsert_stmt)
 
 
-def _refresh_any_in_club(session: Session, payloads: Sequence[CardPayload]) -> None:
-    player_ids = list(
-        session.scalars(
-            select(Player.id).where(
-                Player.slug.in_({payload.player_slug for payload in payloads})
-            )
-        )
-    )
+def _refresh_any_in_club(session: Session, player_ids: Collection[int]) -> None:
     if not player_ids:
         return
 
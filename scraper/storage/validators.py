@@ -0,0 +1,113 @@
+"""
+Persisted ETag / Last-Modified validators for conditional page requests.
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, NamedTuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from .connection import session_scope
+from ..models import PageValidator
+
+
+class Validators(NamedTuple):
+    etag: str | None
+    last_modified: str | None
+    # Page count advertised by the page body these validators belong to.
+    page_count: int | None = None
+
+
+class ValidatorStore:
+    """
+    In-memory view of the ``page_validators`` table for the duration of a run.
+
+    The table is read once by :meth:`load` and written once by :meth:`save`,
+    so conditional requests cost no extra round trips per page.
+
+    The page count a 200 body advertises is noted by :meth:`note_page_count`
+    and only kept once :meth:`remember` records that body's validators, so a
+    304 (same body) can trust :meth:`page_count`.
+    """
+
+    def __init__(self, entries: Mapping[str, Validators] | None = None) -> None:
+        self._entries: dict[str, Validators] = dict(entries or {})
+        self._dirty: set[str] = set()
+        self._noted_counts: dict[str, int] = {}
+
+    @classmethod
+    def load(cls) -> "ValidatorStore":
+        with session_scope() as session:
+            rows = session.execute(
+                select(
+                    PageValidator.url,
+                    PageValidator.etag,
+                    PageValidator.last_modified,
+                    PageValidator.page_count,
+                )
+            )
+            return cls({url: Validators(*values) for url, *values in rows})
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Return the If-None-Match / If-Modified-Since headers for ``url``."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return {}
+        headers: dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def page_count(self, url: str) -> int | None:
+        """The page count advertised by the body behind ``url``'s stored validators."""
+        entry = self._entries.get(url)
+        return entry.page_count if entry is not None else None
+
+    def note_page_count(self, url: str, page_count: int) -> None:
+        """Note the page count parsed from a 200 body, kept by the next :meth:`remember`."""
+        self._noted_counts[url] = page_count
+
+    def remember(self, url: str, headers: Mapping[str, str]) -> None:
+        """Record the validators sent with a full (200) response."""
+        entry = Validators(
+            headers.get("ETag"),
+            headers.get("Last-Modified"),
+            self._noted_counts.pop(url, None),
+        )
+        if entry[:2] == (None, None) or self._entries.get(url) == entry:
+            return
+        self._entries[url] = entry
+        self._dirty.add(url)
+
+    def save(self) -> int:
+        """Persist validators that changed during the run. Returns rows written."""
+        if not self._dirty:
+            return 0
+        rows = [
+            {
+                "url": url,
+                "etag": self._entries[url].etag,
+                "last_modified": self._entries[url].last_modified,
+                "page_count": self._entries[url].page_count,
+            }
+            for url in sorted(self._dirty)
+        ]
+        with session_scope() as session:
+            stmt = insert(PageValidator).values(rows)
+            session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["url"],
+                    set_={
+                        "etag": stmt.excluded.etag,
+                        "last_modified": stmt.excluded.last_modified,
+                        "page_count": stmt.excluded.page_count,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        self._dirty.clear()
+        return len(rows)
@@ -0,0 +1,329 @@
+"""
+HTTP transport tuning: pooled adapters, compressed transfer and run stats.
+
+Two backends plug into the same ``requests.Session`` interface used by
+``scraper.client.fetch_page``:
+
+- ``requests``: urllib3 connection pools sized from HTTP_POOL_SIZE with TCP
+  keep-alive probes after HTTP_TCP_KEEPIDLE idle seconds.
+- ``httpx``: an HTTP/2-capable ``httpx.Client`` behind a requests adapter,
+  closing pooled connections idle for HTTP_KEEPALIVE_EXPIRY seconds.
+  Needs the optional ``h2`` package; without it the requests backend is used.
+
+:class:`TunedSession` counts bytes on the wire vs decoded bytes for every
+response. The adapters report how many connections (and TLS handshakes) they
+opened, which gives the connection reuse count for a run.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import socket
+import threading
+from dataclasses import dataclass, fields
+from functools import partial
+from typing import Any, Iterator
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING as URLLIB3_ACCEPT_ENCODING
+
+logger = logging.getLogger("ScrapeFutGG")
+
+@dataclass(frozen=True)
+class TransportStats:
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+    def __sub__(self, other: "TransportStats") -> "TransportStats":
+        return TransportStats(
+            **{f.name: getattr(self, f.name) - getattr(other, f.name) for f in fields(self)}
+        )
+
+    def describe(self) -> str:
+        ratio = self.decoded_bytes / self.wire_bytes if self.wire_bytes else 1.0
+        return (
+            f"{self.requests} requests, {self.wire_bytes / 1e6:.2f} MB on the wire / "
+            f"{self.decoded_bytes / 1e6:.2f} MB decoded ({ratio:.1f}x), "
+            f"{self.connections_opened} connections opened, "
+            f"{self.connections_reused} reused, {self.tls_handshakes} TLS handshakes"
+        )
+
+
+def httpx_accept_encoding() -> str:
+    """Content codings the httpx backend can decode with the installed packages."""
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    if importlib.util.find_spec("zstandard"):
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def requests_accept_encoding() -> str:
+    """Content codings urllib3 can decode (brotli/zstd when their packages are installed)."""
+    return ", ".join(URLLIB3_ACCEPT_ENCODING.split(","))
+
+
+def _keepalive_socket_options(idle_seconds: float) -> list[tuple[int, int, int]]:
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    if hasattr(socket, "TCP_KEEPIDLE") and idle_seconds > 0:
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, max(int(idle_seconds), 1)))
+    return options
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    """Connection pool that reports every connection it creates."""
+
+    def __init__(self, *args: Any, on_new_conn: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._on_new_conn = on_new_conn
+
+    def _new_conn(self):  # type: ignore[no-untyped-def]
+        self._on_new_conn(tls=False)
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    """HTTPS variant of :class:`_CountingHTTPConnectionPool`."""
+
+    def __init__(self, *args: Any, on_new_conn: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._on_new_conn = on_new_conn
+
+    def _new_conn(self):  # type: ignore[no-untyped-def]
+        self._on_new_conn(tls=True)
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """urllib3-backed adapter with explicit pool sizing and TCP keep-alive."""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["_tcp_keepidle"]
+
+    def __init__(self, *, pool_size: int, tcp_keepidle: float) -> None:
+        self._tcp_keepidle = tcp_keepidle
+        # Counted as connections are created, so pools evicted from the
+        # pool manager's LRU keep their share of the totals.
+        self._counts_lock = threading.Lock()
+        self._opened = 0
+        self._tls = 0
+        # Retries are handled by tenacity in fetch_page.
+        super().__init__(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):  # type: ignore[no-untyped-def]
+        pool_kwargs.setdefault("socket_options", _keepalive_socket_options(self._tcp_keepidle))
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": partial(_CountingHTTPConnectionPool, on_new_conn=self._connection_opened),
+            "https": partial(_CountingHTTPSConnectionPool, on_new_conn=self._connection_opened),
+        }
+
+    def _connection_opened(self, *, tls: bool) -> None:
+        with self._counts_lock:
+            self._opened += 1
+            self._tls += tls
+
+    def connection_counts(self) -> tuple[int, int]:
+        """Return (connections opened, TLS handshakes) since the adapter was created."""
+        with self._counts_lock:
+            return self._opened, self._tls
+
+
+class _HttpxRaw:
+    """Minimal stand-in for ``response.raw`` so requests can read httpx bodies."""
+
+    def __init__(self, response: Any) -> None:
+        self._response = response
+
+    def stream(self, chunk_size: int | None = None, decode_content: bool = True) -> Iterator[bytes]:
+        import httpx
+
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TransportError as exc:
+            # Surface body read failures as requests errors so fetch_page retries them.
+            raise requests.ConnectionError(exc) from exc
+
+    def read(self, amt: int | None = None, decode_content: bool = True) -> bytes:
+        return self._response.read()
+
+    def tell(self) -> int:
+        return self._response.num_bytes_downloaded
+
+    def release_conn(self) -> None:
+        self._response.close()
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class HttpxAdapter(BaseAdapter):
+    """Send requests through an HTTP/2-capable ``httpx.Client``."""
+
+    def __init__(self, *, pool_size: int, keepalive_expiry: float) -> None:
+        super().__init__()
+        import httpx
+
+        self._httpx = httpx
+        self._client = httpx.Client(
+            http2=True,
+            follow_redirects=False,  # requests resolves redirects itself
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._tls = 0
+
+    def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._opened += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self._tls += 1
+
+    def _timeout(self, timeout: Any) -> Any:
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self._httpx.Timeout(read, connect=connect)
+        return self._httpx.Timeout(timeout)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):  # type: ignore[no-untyped-def]
+        httpx = self._httpx
+        outgoing = self._client.build_request(
+            request.method,
+            request.url,
+            headers=dict(request.headers),
+            content=request.body,
+            timeout=self._timeout(timeout),
+            extensions={"trace": self._trace},
+        )
+        try:
+            incoming = self._client.send(outgoing, stream=True)
+        except httpx.TimeoutException as exc:
+            raise requests.Timeout(exc, request=request) from exc
+        except httpx.TransportError as exc:
+            raise requests.ConnectionError(exc, request=request) from exc
+
+        response = requests.Response()
+        response.status_code = incoming.status_code
+        response.headers = CaseInsensitiveDict(incoming.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = incoming.reason_phrase
+        response.raw = _HttpxRaw(incoming)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def connection_counts(self) -> tuple[int, int]:
+        with self._lock:
+            return self._opened, self._tls
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class TunedSession(requests.Session):
+    """``requests.Session`` that records per-response transfer statistics."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._wire_bytes = 0
+        self._decoded_bytes = 0
+
+    def send(self, request, **kwargs):  # type: ignore[no-untyped-def]
+        response = super().send(request, **kwargs)
+        if not kwargs.get("stream"):
+            self.record_transfer(response)
+        return response
+
+    def record_transfer(self, response: requests.Response) -> None:
+        """Account a fully read response (streaming callers call this themselves)."""
+        raw = response.raw
+        decoded = len(response.content) if response._content_consumed else 0  # type: ignore[attr-defined]
+        wire = raw.tell() if raw is not None and hasattr(raw, "tell") else decoded
+        with self._stats_lock:
+            self._requests += 1
+            self._wire_bytes += wire
+            self._decoded_bytes += decoded
+
+    def transport_stats(self) -> TransportStats:
+        opened = tls = 0
+        # One adapter is usually mounted for both http:// and https://.
+        unique_adapters = {id(adapter): adapter for adapter in self.adapters.values()}
+        for adapter in unique_adapters.values():
+            counts = getattr(adapter, "connection_counts", None)
+            if counts is not None:
+                adapter_opened, adapter_tls = counts()
+                opened += adapter_opened
+                tls += adapter_tls
+        with self._stats_lock:
+            return TransportStats(
+                requests=self._requests,
+                wire_bytes=self._wire_bytes,
+                decoded_bytes=self._decoded_bytes,
+                connections_opened=opened,
+                tls_handshakes=tls,
+            )
+
+
+def transport_stats(session: requests.Session) -> TransportStats:
+    """Stats of a :class:`TunedSession`, or empty stats for any other session."""
+    if isinstance(session, TunedSession):
+        return session.transport_stats()
+    return TransportStats()
+
+
+def mount_transport(
+    session: requests.Session,
+    *,
+    backend: str,
+    pool_size: int,
+    keepalive_expiry: float,
+    tcp_keepidle: float,
+) -> str:
+    """
+    Mount the adapter for ``backend`` on ``session`` and return the backend used.
+
+    ``keepalive_expiry`` only applies to httpx (idle pooled connections are
+    closed after it) and ``tcp_keepidle`` only to requests (idle seconds
+    before TCP keep-alive probes). Falls back to the requests backend when
+    httpx's HTTP/2 support is missing.
+    """
+    if backend == "httpx":
+        if importlib.util.find_spec("httpx") and importlib.util.find_spec("h2"):
+            adapter: BaseAdapter = HttpxAdapter(
+                pool_size=pool_size, keepalive_expiry=keepalive_expiry
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Accept-Encoding"] = httpx_accept_encoding()
+            return "httpx"
+        logger.warning("HTTP_BACKEND=httpx needs the 'httpx' and 'h2' packages; using requests.")
+
+    adapter = PooledHTTPAdapter(pool_size=pool_size, tcp_keepidle=tcp_keepidle)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = requests_accept_encoding()
+    return "requests"
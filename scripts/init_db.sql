@@ -9,11 +9,16 @@ CREATE TABLE IF NOT EXISTS players (
     -- Normalised identifier derived from the FUT.GG player slug (e.g., "claudia-pina").
     slug TEXT NOT NULL,
     display_name TEXT NOT NULL,
+    -- scraper.names.fold_name(display_name): what player search matches against.
+    search_name TEXT NOT NULL DEFAULT '',
     any_in_club BOOLEAN NOT NULL DEFAULT FALSE,
     base_card_slug TEXT,
     base_card_rating INTEGER,
     base_card_version TEXT,
     base_card_image_url TEXT,
+    -- Card counters, maintained by trg_player_cards_counts below.
+    total_cards INTEGER NOT NULL DEFAULT 0,
+    in_club_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     CONSTRAINT ux_players_slug UNIQUE (slug)
@@ -34,6 +39,57 @@ CREATE TABLE IF NOT EXISTS player_cards (
     CONSTRAINT ux_player_cards_slug UNIQUE (card_slug),
 );
 
+-- HTTP validators (ETag / Last-Modified) per listing page URL, used to send
+-- conditional requests so unchanged pages come back as 304 Not Modified.
+CREATE TABLE IF NOT EXISTS page_validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    -- Page count advertised by the response these validators came with; a
+    -- 304 for the page reuses it instead of probing for the last page.
+    page_count INTEGER,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+ALTER TABLE page_validators ADD COLUMN IF NOT EXISTS page_count INTEGER;
+
+-- Card-content fingerprint per listing page from the last stored run. Pages
+-- whose fingerprint matches skip parsing/upserting; their card_slugs
+-- (newline-separated) only get last_seen_at bumped.
+CREATE TABLE IF NOT EXISTS page_fingerprints (
+    url TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    card_slugs TEXT NOT NULL DEFAULT '',
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Cards pruned from player_cards after not being seen for RETENTION_RUNS full
+-- scrapes. No foreign keys: archived rows outlive their player.
+CREATE TABLE IF NOT EXISTS player_cards_archive (
+    id INTEGER PRIMARY KEY,
+    player_id INTEGER NOT NULL,
+    card_slug TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    card_url TEXT NOT NULL,
+    image_url TEXT,
+    in_club BOOLEAN NOT NULL DEFAULT FALSE,
+    scraped_at TIMESTAMPTZ NOT NULL,
+    last_seen_at TIMESTAMPTZ NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- One row per scrape; finished full runs define the retention window.
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id SERIAL PRIMARY KEY,
+    mode TEXT NOT NULL,
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS ix_player_cards_last_seen_at
+    ON player_cards (last_seen_at);
+
 CREATE INDEX IF NOT EXISTS ix_player_cards_player_id
     ON player_cards (player_id);
 
@@ -53,6 +109,78 @@ CREATE INDEX IF NOT EXISTS ix_players_base_card_rating
 CREATE INDEX IF NOT EXISTS ix_players_any_in_club_rating
     ON players (any_in_club, base_card_rating);
 
-CREATE EXTENSION IF NOT EXISTS unaccent;
+-- Per-player card counters. Added in place for databases created before the
+-- columns existed, then kept up to date by a trigger on player_cards.
+ALTER TABLE players ADD COLUMN IF NOT EXISTS total_cards INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE players ADD COLUMN IF NOT EXISTS in_club_count INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION player_cards_maintain_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE players
+        SET total_cards = total_cards - 1,
+            in_club_count = in_club_count - OLD.in_club::int
+        WHERE id = OLD.player_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE players
+        SET total_cards = total_cards + 1,
+            in_club_count = in_club_count + NEW.in_club::int
+        WHERE id = NEW.player_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_player_cards_counts ON player_cards;
+CREATE TRIGGER trg_player_cards_counts
+AFTER INSERT OR DELETE OR UPDATE OF in_club, player_id ON player_cards
+FOR EACH ROW EXECUTE FUNCTION player_cards_maintain_counts();
+
+-- Backfill (same as scraper.storage.recount_player_cards).
+UPDATE players AS p
+SET total_cards = COALESCE(c.total, 0),
+    in_club_count = COALESCE(c.in_club, 0)
+FROM players AS target
+LEFT JOIN (
+    SELECT player_id, COUNT(*) AS total, COUNT(*) FILTER (WHERE in_club) AS in_club
+    FROM player_cards
+    GROUP BY player_id
+) AS c ON c.player_id = target.id
+WHERE p.id = target.id
+  AND (p.total_cards, p.in_club_count) IS DISTINCT FROM (COALESCE(c.total, 0), COALESCE(c.in_club, 0));
+
+-- Sort by completion (share of cards in club) without aggregating at read time.
+CREATE INDEX IF NOT EXISTS ix_players_completion_ratio
+    ON players ((CAST(in_club_count AS FLOAT) / NULLIF(total_cards, 0)) DESC NULLS LAST);
+
+-- Accent/case-folded display name for search (scraper.names.fold_name).
+-- Added in place for databases created before the column existed and
+-- backfilled here with the same folding for the common accented letters, so
+-- search keeps working straight after the migration. translate() only covers
+-- those letters, so after migrating an existing database run once:
+--     python -m scraper.main --refresh-search-names
+-- which recomputes every name that differs from fold_name exactly.
+ALTER TABLE players ADD COLUMN IF NOT EXISTS search_name TEXT NOT NULL DEFAULT '';
+
+UPDATE players
+SET search_name = btrim(regexp_replace(
+    replace(replace(replace(replace(
+        translate(
+            lower(display_name),
+            'áàâäãåāăąçćčďđéèêëēėęěíìîïīįıñńňóòôöõøōőŕřśšşťţúùûüūůűųýÿźżžðł',
+            'aaaaaaaaacccddeeeeeeeeiiiiiiinnnoooooooorrsssttuuuuuuuuyyzzzdl'
+        ),
+        'æ', 'ae'), 'œ', 'oe'), 'þ', 'th'), 'ß', 'ss'),
+    '\s+', ' ', 'g'
+)),
+    updated_at = NOW()
+WHERE search_name = '';
+
+-- Trigram index so substring search (search_name LIKE '%term%') avoids a
+-- sequential scan.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS ix_players_search_name_trgm
+    ON players USING gin (search_name gin_trgm_ops);
 
 COMMIT;
\ No newline at end of file
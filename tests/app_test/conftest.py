@@ -6,10 +6,13 @@ import pytest
 import tempfile
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
 
 from scraper.models import Base, Player, PlayerCard
+from scraper.name_index import set_name_index
 from scraper.storage.connection import get_engine
 from app.main import app
 
@@ -113,13 +116,31 @@ def client(db_session: Session):
         finally:
             pass  # Don't close the session, it's managed by the fixture
     
-    from app.dependencies import get_db
+    # Async routes read the same temporary database through aiosqlite;
+    # NullPool so no connection outlives the TestClient's event loop.
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{_test_db_file}", poolclass=NullPool
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+            await session.commit()
+
+    from app.dependencies import get_async_db, get_db
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
+    # The suggest endpoint builds its name index from this test's database.
+    set_name_index(None)
     with TestClient(app) as test_client:
         yield test_client
     
     app.dependency_overrides.clear()
+    set_name_index(None)
 
 
 @pytest.fixture(scope="session", autouse=True)
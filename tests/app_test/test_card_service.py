@@ -42,6 +42,10 @@ def test_toggle_card_in_club_found(db_session: Session):
     db_session.refresh(card)
     assert card.in_club is True
 
+    db_session.refresh(player)
+    assert player.any_in_club is True
+    assert (player.total_cards, player.in_club_count) == (1, 1)
+
 
 def test_toggle_card_in_club_not_found(db_session: Session):
     """Test toggling a card's in_club status when card doesn't exist."""
@@ -5,8 +5,10 @@ Tests for player service functions.
 import pytest
 from sqlalchemy.orm import Session
 
-from app.services.player_service import get_players_list, get_player_by_slug
+from app.services import player_service
+from app.services.player_service import get_players_list, get_player_by_slug, suggest_players
 from scraper.models import Player, PlayerCard
+from scraper.name_index import set_name_index
 
 
 def test_get_players_list_empty(db_session: Session):
@@ -44,6 +46,20 @@ def test_get_players_list_search(db_session: Session, sample_player: Player):
     assert len(result) == 0
 
 
+def test_get_players_list_search_is_accent_insensitive(db_session: Session):
+    """Search matches the folded name whatever the accents and case."""
+    db_session.add(Player(slug="vinicius-junior", display_name="Vinícius Júnior"))
+    db_session.add(Player(slug="odegaard", display_name="Martin Ødegaard"))
+    db_session.commit()
+
+    assert [p.slug for p in get_players_list(db_session, search="VINICIUS")] == [
+        "vinicius-junior"
+    ]
+    assert [p.slug for p in get_players_list(db_session, search="ødeg")] == ["odegaard"]
+    assert [p.slug for p in get_players_list(db_session, search="odég")] == ["odegaard"]
+    assert get_players_list(db_session, search="100%") == []
+
+
 def test_get_players_list_filter_in_club(
     db_session: Session, sample_player: Player, sample_cards: list[PlayerCard]
 ):
@@ -88,6 +104,34 @@ def test_get_players_list_sort_by_rating(
     assert result[1].base_card_rating == 90
 
 
+def test_get_players_list_sort_by_completion(
+    db_session: Session, sample_player: Player, sample_cards: list[PlayerCard]
+):
+    """Test sorting players by the share of their cards in club."""
+    complete = Player(slug="complete-player", display_name="Complete Player")
+    empty = Player(slug="empty-player", display_name="Empty Player")
+    db_session.add_all([complete, empty])
+    db_session.commit()
+    db_session.add(
+        PlayerCard(
+            player_id=complete.id,
+            card_slug="complete-card",
+            name="Complete Player",
+            rating=80,
+            version="Rare",
+            card_url="https://www.fut.gg/complete-card",
+            in_club=True,
+        )
+    )
+    db_session.commit()
+
+    result = get_players_list(db_session, sort_by="completion", sort_by_rating="desc")
+    assert [player.slug for player in result] == ["complete-player", "test-player", "empty-player"]
+
+    result = get_players_list(db_session, sort_by="completion", sort_by_rating="asc")
+    assert [player.slug for player in result] == ["test-player", "complete-player", "empty-player"]
+
+
 def test_get_player_by_slug_found(
     db_session: Session, sample_player: Player, sample_cards: list[PlayerCard]
 ):
@@ -104,4 +148,24 @@ def test_get_player_by_slug_found(
 def test_get_player_by_slug_not_found(db_session: Session):
     """Test getting a player by slug when not found."""
     result = get_player_by_slug(db_session, "nonexistent")
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+def test_suggest_players_rebuilds_index_when_players_change(
+    db_session: Session, sample_player: Player, monkeypatch
+):
+    """A player added outside this process shows up after the recheck interval."""
+    set_name_index(None)
+    try:
+        assert [s.slug for s in suggest_players(db_session, "test")] == ["test-player"]
+
+        db_session.add(Player(slug="test-runner", display_name="Test Runner"))
+        db_session.commit()
+        assert [s.slug for s in suggest_players(db_session, "test")] == ["test-player"]
+
+        monkeypatch.setattr(player_service, "NAME_INDEX_RECHECK_SECONDS", 0.0)
+        assert [s.slug for s in suggest_players(db_session, "test")] == [
+            "test-player",
+            "test-runner",
+        ]
+    finally:
+        set_name_index(None)
@@ -31,6 +31,16 @@ def test_list_players_with_search(client: TestClient, sample_player: Player):
     assert len(data) == 0
 
 
+def test_suggest_players_endpoint(client: TestClient, sample_player: Player):
+    """Test GET /players/suggest with a typo in the query."""
+    response = client.get("/players/suggest?q=tset pla")
+    assert response.status_code == 200
+    assert response.json() == [{"slug": "test-player", "display_name": "Test Player"}]
+
+    response = client.get("/players/suggest?q=")
+    assert response.status_code == 422
+
+
 def test_list_players_with_filter(
     client: TestClient, sample_player: Player, sample_cards: list[PlayerCard]
 ):
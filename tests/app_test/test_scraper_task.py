@@ -8,6 +8,12 @@ from unittest.mock import patch, MagicMock
 from app.tasks.scraper_task import is_scraping, run_scraper_task
 
 
+@pytest.fixture(autouse=True)
+def mock_rebuild_name_index(mocker):
+    """Keep the post-scrape name index rebuild off the database."""
+    return mocker.patch("app.tasks.scraper_task.rebuild_name_index")
+
+
 def test_is_scraping_initial_state():
     """Test that is_scraping() returns False initially."""
     # Reset state by importing fresh
@@ -62,6 +68,15 @@ def test_run_scraper_task_calls_main(mocker):
     mock_main.assert_called_once()
 
 
+def test_run_scraper_task_rebuilds_name_index(mocker, mock_rebuild_name_index):
+    """Test that the name index is rebuilt after a successful scrape."""
+    mocker.patch("app.tasks.scraper_task.main")
+
+    run_scraper_task()
+
+    mock_rebuild_name_index.assert_called_once()
+
+
 def test_run_scraper_task_handles_exceptions(mocker):
     """Test that run_scraper_task handles exceptions and resets flag."""
     from app.tasks import scraper_task
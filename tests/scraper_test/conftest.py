@@ -0,0 +1,41 @@
+"""
+Pytest fixtures for scraper storage tests.
+"""
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from scraper import ratelimit
+from scraper.models import Base
+from scraper.storage import connection
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_controller(monkeypatch):
+    """
+    Give each test its own process-wide rate controller.
+
+    A 429 halves the shared controller's rate and pushes its next slot out on
+    the real monotonic clock, which would otherwise slow down later tests.
+    """
+    monkeypatch.setattr(ratelimit, "_controller", None)
+
+
+@pytest.fixture
+def storage_db(tmp_path, monkeypatch):
+    """
+    Point ``session_scope`` at a fresh file-based SQLite database.
+    """
+    engine = connection.create_profile_engine(
+        f"sqlite:///{tmp_path / 'scraper.db'}", connection.get_profile("test")
+    )
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(
+        connection,
+        "SessionLocal",
+        sessionmaker(bind=engine, autoflush=False, autocommit=False),
+    )
+    try:
+        yield engine
+    finally:
+        engine.dispose()
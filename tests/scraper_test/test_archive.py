@@ -0,0 +1,65 @@
+"""
+Unit tests for the raw-page archive and offline replay.
+"""
+
+from pathlib import Path
+
+from scraper.archive import (
+    PageArchiveReader,
+    PageArchiveWriter,
+    index_path_for,
+    pack_html_files,
+)
+from scraper.models import PlayerCard
+from scraper.storage.connection import session_scope
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+def test_archive_round_trip(tmp_path):
+    path = tmp_path / "run.htmlz"
+    with PageArchiveWriter(path) as writer:
+        writer.append(2, "https://example.com/?page=2", "<p>Dembélé</p>".encode("utf-8"), "utf-8")
+        writer.append(1, "https://example.com", b"<p>one</p>", None)
+
+    assert index_path_for(path).exists()
+    with PageArchiveReader(path) as reader:
+        assert [entry.page_number for entry in reader.entries] == [1, 2]
+        assert list(reader.iter_pages()) == [(1, "<p>one</p>"), (2, "<p>Dembélé</p>")]
+
+
+def test_archive_is_append_only(tmp_path):
+    path = tmp_path / "run.htmlz"
+    with PageArchiveWriter(path) as writer:
+        writer.append(1, "u1", b"first", "utf-8")
+    size_after_first = path.stat().st_size
+
+    with PageArchiveWriter(path) as writer:
+        entry = writer.append(2, "u2", b"second", "utf-8")
+    assert entry.offset == size_after_first
+
+    with PageArchiveReader(path) as reader:
+        assert dict(reader.iter_pages()) == {1: "first", 2: "second"}
+
+
+def test_pack_compresses_fixture(tmp_path):
+    path = tmp_path / "fixtures.htmlz"
+    assert pack_html_files(path, [FIXTURES_DIR / "live_page.html"]) == 1
+
+    with PageArchiveReader(path) as reader:
+        (entry,) = reader.entries
+        assert entry.length < entry.size
+        assert reader.read(entry) == (FIXTURES_DIR / "live_page.html").read_text(encoding="utf-8")
+
+
+def test_replay_archive_stores_cards_without_network(tmp_path, storage_db, mocker):
+    from scraper.main import replay_archive
+
+    path = tmp_path / "fixtures.htmlz"
+    pack_html_files(path, [FIXTURES_DIR / "live_page.html"])
+    get = mocker.patch("requests.Session.get")
+
+    assert replay_archive(path) == 30
+    get.assert_not_called()
+    with session_scope() as session:
+        assert session.query(PlayerCard).count() == 30
@@ -0,0 +1,71 @@
+"""
+Smoke tests for the offline benchmarks.
+"""
+
+from scraper.bench import (
+    bench_parser,
+    bench_payloads,
+    compare_parser_runs,
+    enlarge_page,
+    load_fixture_pages,
+)
+from scraper.parser import parse_cards
+
+CARD_PAGE = (
+    b"<html><body><div>"
+    b'<a href="/players/231443-ousmane-dembele/26-50563091/">'
+    b'<img alt="Ousmane Dembele - 90 - Past and Present" src="/img/1.png"></a>'
+    b"</div></body></html>"
+)
+
+
+def test_bench_payloads_reports_per_thousand_cards():
+    result = bench_payloads(load_fixture_pages(), cards=60)
+
+    assert result["cards"] == 60
+    assert result["pages_parsed"] == 2
+    assert result["bytes_per_1000_cards"] > 0
+    assert result["live_allocations_per_1000_cards"] > 0
+
+
+def test_enlarge_page_yields_distinct_cards_per_copy():
+    cards = parse_cards(enlarge_page(CARD_PAGE, 3))
+
+    assert len(cards) == 3
+    assert len({card.card_slug for card in cards}) == 3
+    assert {card.player_slug for card in cards} == {"ousmane-dembele"}
+
+
+def test_bench_parser_reports_throughput_and_latency_per_engine():
+    result = bench_parser({"tiny": CARD_PAGE}, engines=("lxml", "bs4"), repeat=3, measure_rss=False)
+
+    assert [(row["engine"], row["page"]) for row in result["results"]] == [
+        ("lxml", "tiny"),
+        ("bs4", "tiny"),
+    ]
+    for row in result["results"]:
+        assert row["cards"] == 1
+        assert row["mb_per_s"] > 0
+        assert row["p50_ms"] <= row["p95_ms"]
+        assert row["peak_traced_bytes"] > 0
+        assert row["peak_rss_growth_bytes"] is None
+
+
+def test_compare_parser_runs_matches_rows_by_engine_and_page():
+    row = {
+        "engine": "lxml",
+        "page": "tiny",
+        "mb_per_s": 10.0,
+        "p50_ms": 2.0,
+        "p95_ms": 4.0,
+        "peak_traced_bytes": 100,
+        "peak_rss_growth_bytes": None,
+    }
+    faster = dict(row, mb_per_s=20.0, p50_ms=1.0, p95_ms=2.0)
+
+    [comparison] = compare_parser_runs({"results": [row]}, {"results": [faster]})
+
+    assert comparison["speedup"] == 2.0
+    assert comparison["p95_ratio"] == 0.5
+    assert comparison["peak_traced_ratio"] == 1.0
+    assert comparison["peak_rss_ratio"] is None
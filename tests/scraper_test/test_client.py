@@ -53,4 +53,51 @@ def test_fetch_page_raises_on_500(mocker):
     mocker.patch("time.sleep")
     
     with pytest.raises(FetchError):
-        fetch_page(mock_session, "https://example.com")
\ No newline at end of file
+        fetch_page(mock_session, "https://example.com")
+
+def test_fetch_page_sends_conditional_headers(mocker):
+    from scraper.storage import ValidatorStore
+    from scraper.storage.validators import Validators
+
+    mock_session = Mock()
+    mock_session.get.return_value = Mock(status_code=304, text="")
+    mocker.patch("time.sleep")
+
+    store = ValidatorStore(
+        {"https://example.com": Validators('"abc"', "Wed, 01 Oct 2025 10:00:00 GMT")}
+    )
+    result = fetch_page(mock_session, "https://example.com", validators=store)
+
+    assert result.status_code == 304
+    mock_session.get.assert_called_once_with(
+        "https://example.com",
+        timeout=15,
+        headers={
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Oct 2025 10:00:00 GMT",
+        },
+    )
+
+
+def test_fetch_page_retries_429_after_retry_after(mocker):
+    mock_session = Mock()
+    limited = Mock(status_code=429, headers={"Retry-After": "7"})
+    mock_session.get.side_effect = [limited, Mock(status_code=200, text="ok")]
+    sleep = mocker.patch("time.sleep")
+
+    result = fetch_page(mock_session, "https://example.com")
+    assert result.status_code == 200
+    assert mock_session.get.call_count == 2
+    assert any(call.args[0] == pytest.approx(7) for call in sleep.call_args_list)
+
+
+def test_fetch_page_does_not_retry_404(mocker):
+    mock_session = Mock()
+    missing = Mock(status_code=404)
+    missing.raise_for_status.side_effect = requests.HTTPError(response=missing)
+    mock_session.get.return_value = missing
+    mocker.patch("time.sleep")
+
+    with pytest.raises(requests.HTTPError):
+        fetch_page(mock_session, "https://example.com")
+    assert mock_session.get.call_count == 1
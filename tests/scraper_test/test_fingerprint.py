@@ -0,0 +1,54 @@
+"""
+Unit tests for page fingerprinting.
+"""
+
+from pathlib import Path
+
+from scraper.fingerprint import fingerprint_page
+from scraper.parser import parse_cards
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def _card(href: str, alt: str, src: str = "img.webp") -> str:
+    return f'<a href="{href}"><div><img src="{src}" alt="{alt}"/></div></a>'
+
+
+def test_fingerprint_ignores_markup_outside_cards():
+    # Both fixtures list the same cards inside differently built pages.
+    sample = fingerprint_page(load_fixture("sample_page.html"))
+    live = fingerprint_page(load_fixture("live_page.html"))
+    assert sample.digest == live.digest
+
+
+def test_fingerprint_of_raw_body_matches_decoded_text():
+    body = (FIXTURES_DIR / "sample_page.html").read_bytes()
+    assert fingerprint_page(body) == fingerprint_page(body.decode("utf-8"))
+
+
+def test_fingerprint_card_slugs_match_parser():
+    html = load_fixture("live_page.html")
+    expected = sorted(card.card_slug for card in parse_cards(html))
+    assert list(fingerprint_page(html).card_slugs) == expected
+
+
+def test_fingerprint_is_order_independent_and_content_sensitive():
+    first = _card("/players/1-a/26-1/", "A - 80 - Rare")
+    second = _card("/players/2-b/26-2/", "B - 81 - Rare")
+
+    base = fingerprint_page(f"<div>{first}{second}</div>")
+    assert fingerprint_page(f"<div>{second}{first}</div>").digest == base.digest
+
+    upgraded = _card("/players/2-b/26-2/", "B - 85 - Rare")
+    assert fingerprint_page(f"<div>{first}{upgraded}</div>").digest != base.digest
+
+    new_image = _card("/players/2-b/26-2/", "B - 81 - Rare", src="img2.webp")
+    assert fingerprint_page(f"<div>{first}{new_image}</div>").digest != base.digest
+
+
+def test_fingerprint_of_empty_page_has_no_cards():
+    assert fingerprint_page("<html><body></body></html>").card_slugs == ()
@@ -25,4 +25,97 @@ def test_full_scrape_flow_mocked(mocker):
     mocker.patch("time.sleep")
     
     # Should not raise
-    main()
\ No newline at end of file
+    main()
+
+def test_incremental_scrape_stops_after_known_pages(storage_db, mocker):
+    """An incremental run stops after INCREMENTAL_STOP_PAGES (default 2) known pages."""
+    from pathlib import Path
+
+    import scraper.main as scraper_main
+    from scraper.storage import upsert_players_and_cards
+
+    html = (Path(__file__).parent.parent / "fixtures" / "live_page.html").read_text(encoding="utf-8")
+    upsert_players_and_cards(parse_cards(html))
+
+    fetched = []
+
+    def pages(session, **kwargs):
+        for page_number in range(1, 21):
+            fetched.append(page_number)
+            yield page_number, Mock(
+                status_code=200, text=html, content=html.encode(), encoding="utf-8", headers={}
+            )
+
+    mocker.patch.object(scraper_main, "select_page_iterator", side_effect=pages)
+    mocker.patch.object(scraper_main, "throttled_session", return_value=Mock(
+        __enter__=lambda _: Mock(), __exit__=lambda *_: None
+    ))
+    upsert = mocker.patch("scraper.storage.batch_writer.upsert_players_and_cards")
+
+    main(incremental=True)
+
+    # Fetching may run ahead of the parser by the pages queued or in progress
+    # in the decode and parse stages.
+    assert fetched[:2] == [1, 2]
+    assert len(fetched) <= 2 + 2 * (scraper_main.settings.pipeline_queue_size + 1) + 1
+    upsert.assert_not_called()
+
+
+def test_max_pages_run_is_partial_and_does_not_prune(storage_db, mocker, monkeypatch):
+    """A MAX_PAGES run never checks later pages, so it must not archive their cards."""
+    import dataclasses
+    from datetime import datetime, timezone
+    from pathlib import Path
+
+    import scraper.main as scraper_main
+    import scraper.pagination as pagination
+    from scraper.models import PlayerCard, PlayerCardArchive, ScrapeRun
+    from scraper.storage import CardPayload, upsert_players_and_cards
+    from scraper.storage.connection import session_scope
+
+    limited = dataclasses.replace(
+        scraper_main.settings, max_pages=1, retention_runs=1, fetch_concurrency=1
+    )
+    monkeypatch.setattr(scraper_main, "settings", limited)
+    monkeypatch.setattr(pagination, "_settings", limited)
+
+    # A card listed on a later page, last seen long before this run.
+    upsert_players_and_cards(
+        [
+            CardPayload(
+                player_slug="later-player",
+                display_name="Later Player",
+                card_slug="999-later-player/26-999",
+                name="Later Player",
+                rating=70,
+                version="Rare",
+                card_url="https://www.fut.gg/players/999-later-player/26-999/",
+                image_url=None,
+            )
+        ]
+    )
+    with session_scope() as session:
+        for card in session.query(PlayerCard):
+            card.last_seen_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    html = (Path(__file__).parent.parent / "fixtures" / "live_page.html").read_text(encoding="utf-8")
+    fetched = []
+
+    def fetch_page(session, url, **kwargs):
+        fetched.append(url)
+        return Mock(
+            status_code=200, text=html, content=html.encode(), encoding="utf-8", headers={}
+        )
+
+    mocker.patch.object(pagination, "fetch_page", side_effect=fetch_page)
+    mocker.patch.object(scraper_main, "throttled_session", return_value=Mock(
+        __enter__=lambda _: Mock(), __exit__=lambda *_: None
+    ))
+
+    main(incremental=False)
+
+    assert fetched == [pagination.build_page_url(1)]
+    with session_scope() as session:
+        assert [run.mode for run in session.query(ScrapeRun)] == ["partial"]
+        assert session.query(PlayerCard).filter_by(card_slug="999-later-player/26-999").count() == 1
+        assert session.query(PlayerCardArchive).count() == 0
@@ -0,0 +1,83 @@
+"""
+Unit tests for the in-memory player name index.
+"""
+
+import pytest
+
+from scraper.name_index import (
+    NameIndex,
+    _prefix_distance,
+    current_name_index,
+    patch_display_names,
+    set_name_index,
+)
+
+
+@pytest.fixture
+def index():
+    return NameIndex(
+        [
+            ("martin-odegaard", "Martin Ødegaard"),
+            ("vinicius-junior", "Vinícius Júnior"),
+            ("ronaldo", "Ronaldo"),
+            ("cristiano-ronaldo", "Cristiano Ronaldo"),
+            ("ronald-araujo", "Araujo"),
+        ]
+    )
+
+
+def _slugs(suggestions):
+    return [suggestion.slug for suggestion in suggestions]
+
+
+def test_suggest_prefers_full_name_prefix(index):
+    # Exact matches come first; near misses only fill the remaining slots.
+    assert _slugs(index.suggest("Ronaldo")) == [
+        "ronaldo",
+        "cristiano-ronaldo",
+        "ronald-araujo",
+    ]
+    assert _slugs(index.suggest("martin ØDE")) == ["martin-odegaard"]
+
+
+def test_suggest_matches_words_and_slugs(index):
+    assert _slugs(index.suggest("junior vini")) == ["vinicius-junior"]
+    # "Araujo" is only called "ronald" in the slug.
+    assert _slugs(index.suggest("ronald")) == ["ronald-araujo", "ronaldo", "cristiano-ronaldo"]
+    assert _slugs(index.suggest("ronald", limit=1)) == ["ronald-araujo"]
+
+
+def test_suggest_tolerates_small_typos(index):
+    assert _slugs(index.suggest("odegard")) == ["martin-odegaard"]
+    assert _slugs(index.suggest("vinicus jun")) == ["vinicius-junior"]
+    assert _slugs(index.suggest("araujp")) == ["ronald-araujo"]
+    assert index.suggest("xyzzy") == []
+    assert index.suggest("  ") == []
+
+
+def test_adjacent_swaps_count_as_one_typo(index):
+    assert _prefix_distance("tset", "test", 1) == 1
+    assert _prefix_distance("odegaadr", "odegaard", 2) == 1
+    assert _prefix_distance("ab", "ba", 0) is None
+    assert _slugs(index.suggest("odegaadr")) == ["martin-odegaard"]
+    assert _slugs(index.suggest("vinicuis")) == ["vinicius-junior"]
+    assert _slugs(NameIndex([("test-player", "Test Player")]).suggest("tset pla")) == [
+        "test-player"
+    ]
+
+
+def test_patch_display_names_swaps_the_current_index(index):
+    set_name_index(None)
+    patch_display_names({"ronaldo": "R9"})
+    assert current_name_index() is None
+
+    set_name_index(index)
+    try:
+        patch_display_names({"ronaldo": "R9", "unknown": "Nobody"})
+        patched = current_name_index()
+        assert patched is not index
+        assert _slugs(patched.suggest("r9")) == ["ronaldo"]
+        assert len(patched) == len(index)
+        assert _slugs(index.suggest("r9")) == []
+    finally:
+        set_name_index(None)
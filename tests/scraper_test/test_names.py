@@ -0,0 +1,16 @@
+"""
+Tests for search name folding.
+"""
+
+from scraper.names import fold_name
+
+
+def test_fold_name_strips_accents_and_case():
+    assert fold_name("Vinícius Júnior") == "vinicius junior"
+    assert fold_name("Martin ØDEGAARD") == "martin odegaard"
+    assert fold_name("Łukasz Fabiański") == "lukasz fabianski"
+
+
+def test_fold_name_collapses_whitespace():
+    assert fold_name("  Kylian \t Mbappé ") == "kylian mbappe"
+    assert fold_name("   ") == ""
@@ -5,7 +5,7 @@ Unit tests for pagination logic.
 import pytest
 from unittest.mock import Mock
 
-from scraper.pagination import build_page_url, iter_pages
+from scraper.pagination import build_page_url, iter_pages, iter_pages_concurrent
 from scraper.config import get_settings
 
 settings = get_settings()
@@ -22,6 +22,7 @@ def test_iter_pages_stops_on_404(mocker):
     mock_response_1 = Mock()
     mock_response_1.status_code = 200
     mock_response_1.text = "<html>...</html>"
+    mock_response_1.content = b"<html>...</html>"
     
     mock_response_2 = Mock()
     mock_response_2.status_code = 404
@@ -45,8 +46,99 @@ def test_iter_pages_respects_max_pages(mocker):
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.text = "<html>...</html>"
+    mock_response.content = b"<html>...</html>"
     
     mocker.patch("scraper.pagination.fetch_page", return_value=mock_response)
     
     pages = list(iter_pages(mock_session, max_pages=3))
-    assert len(pages) == 3
\ No newline at end of file
+    assert len(pages) == 3
+
+def test_iter_pages_concurrent_yields_in_page_order(mocker):
+    import time
+
+    def fake_fetch(session, url, **kwargs):
+        # Earlier pages answer slower so responses complete out of order.
+        page = int(url.rsplit("=", 1)[1]) if "?page=" in url else 1
+        time.sleep(0.05 / page)
+        return Mock(status_code=200, text=url, content=b"<html></html>")
+
+    mocker.patch("scraper.pagination.fetch_page", side_effect=fake_fetch)
+
+    pages = list(iter_pages_concurrent(Mock(), max_pages=5, concurrency=3))
+    assert [number for number, _ in pages] == [1, 2, 3, 4, 5]
+    assert pages[1][1].text == build_page_url(2)
+
+
+def test_iter_pages_concurrent_stops_on_404(mocker):
+    from requests import HTTPError
+
+    not_found = Mock(status_code=404)
+
+    def fake_fetch(session, url, **kwargs):
+        if url.endswith("?page=3") or url.endswith("?page=4"):
+            raise HTTPError(response=not_found)
+        return Mock(status_code=200, text=url, content=b"<html></html>")
+
+    mocker.patch("scraper.pagination.fetch_page", side_effect=fake_fetch)
+
+    pages = list(iter_pages_concurrent(Mock(), max_pages=10, concurrency=4))
+    assert [number for number, _ in pages] == [1, 2]
+
+
+def _listing_page(last_page):
+    links = "".join(
+        f'<a href="/clubs/241-fc-barcelona/past-and-present/?page={number}">{number}</a>'
+        for number in range(1, last_page + 1)
+    )
+    return f"<html><body>{links}</body></html>".encode("utf-8")
+
+
+def test_iter_pages_stops_at_advertised_last_page(mocker):
+    fetch = mocker.patch(
+        "scraper.pagination.fetch_page",
+        return_value=Mock(status_code=200, content=_listing_page(3)),
+    )
+
+    pages = list(iter_pages(Mock(), max_pages=10))
+    assert [number for number, _ in pages] == [1, 2, 3]
+    assert fetch.call_count == 3  # no trailing probe for page 4
+
+
+def test_iter_pages_concurrent_schedules_advertised_pages_only(mocker):
+    requested = []
+
+    def fake_fetch(session, url, **kwargs):
+        requested.append(url)
+        return Mock(status_code=200, content=_listing_page(5))
+
+    mocker.patch("scraper.pagination.fetch_page", side_effect=fake_fetch)
+
+    pages = list(iter_pages_concurrent(Mock(), concurrency=2))
+    assert [number for number, _ in pages] == [1, 2, 3, 4, 5]
+    assert sorted(requested) == sorted(build_page_url(n) for n in range(1, 6))
+
+
+def test_iter_pages_reuses_stored_page_count_when_page_one_is_not_modified(mocker):
+    from scraper.storage.validators import ValidatorStore, Validators
+
+    validators = ValidatorStore(
+        {build_page_url(1): Validators('W/"v1"', None, page_count=3)}
+    )
+    requested = []
+
+    def fake_fetch(session, url, **kwargs):
+        requested.append(url)
+        if url == build_page_url(1):
+            return Mock(status_code=304, content=b"")
+        return Mock(status_code=200, content=b"<html></html>")
+
+    mocker.patch("scraper.pagination.fetch_page", side_effect=fake_fetch)
+
+    pages = list(iter_pages(Mock(), max_pages=10, validators=validators))
+    assert [number for number, _ in pages] == [1, 2, 3]
+    assert requested == [build_page_url(n) for n in range(1, 4)]  # no probe for page 4
+
+    requested.clear()
+    pages = list(iter_pages_concurrent(Mock(), concurrency=2, validators=validators))
+    assert [number for number, _ in pages] == [1, 2, 3]
+    assert sorted(requested) == sorted(build_page_url(n) for n in range(1, 4))
@@ -0,0 +1,36 @@
+"""
+Tests for in-process and process-pool page parsing.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from scraper.parse_pool import ParsePool
+from scraper.parser import ParseError, parse_cards
+
+FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_parse_pool_matches_serial_parse(workers):
+    pages = [
+        (FIXTURES_DIR / name).read_text(encoding="utf-8")
+        for name in ("sample_page.html", "live_page.html")
+    ]
+
+    with ParsePool(workers=workers) as pool:
+        results = [future.result() for future in [pool.submit(html) for html in pages]]
+
+    assert results == [parse_cards(html) for html in pages]
+    assert all(len(cards) == 30 for cards in results)
+
+
+def test_parse_errors_surface_from_the_future(mocker):
+    mocker.patch("scraper.parse_pool.parse_cards", side_effect=ParseError("bad markup"))
+
+    with ParsePool(workers=0) as pool:
+        future = pool.submit("<html></html>")
+
+    with pytest.raises(ParseError):
+        future.result()
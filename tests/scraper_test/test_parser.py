@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from scraper.parser import ParseError, parse_cards, _parse_anchor, _split_alt_text, _derive_player_slug
+from scraper.parser import ParseError, iter_cards_streaming, parse_cards, parse_page_count, _parse_anchor, _split_alt_text, _derive_player_slug
 from bs4 import BeautifulSoup
 
 FIXTURES_DIR = Path(__file__).parent.parent / "fixtures"
@@ -62,4 +62,61 @@ def test_split_alt_text_invalid_format():
 def test_derive_player_slug():
     assert _derive_player_slug("231443-ousmane-dembele") == "ousmane-dembele"
     assert _derive_player_slug("41-iniesta") == "iniesta"
-    assert _derive_player_slug("ronaldo") == "ronaldo"  # edge case
\ No newline at end of file
+    assert _derive_player_slug("ronaldo") == "ronaldo"  # edge case
+
+
+def test_parse_page_count_from_pagination_links():
+    html = load_fixture("live_page.html")
+    assert parse_page_count(html) == 9
+    assert parse_page_count(html.encode("utf-8")) == 9
+
+
+def test_parse_page_count_ignores_other_listings():
+    assert parse_page_count('<a href="/clubs/1-other/past-and-present/?page=40">40</a>') is None
+    assert parse_page_count("<html><body></body></html>") is None
+    assert parse_page_count('<a href="?sort=new&amp;page=4">4</a>') == 4
+
+
+@pytest.mark.parametrize("engine", ["lxml", "stream"])
+@pytest.mark.parametrize("fixture", ["sample_page.html", "live_page.html"])
+def test_engines_match_bs4_reference(fixture, engine):
+    html = load_fixture(fixture)
+    reference = parse_cards(html, engine="bs4")
+
+    assert len(reference) == 30
+    assert parse_cards(html, engine=engine) == reference
+    body = (FIXTURES_DIR / fixture).read_bytes()
+    assert parse_cards(body, engine=engine, encoding="utf-8") == reference
+
+
+def test_streaming_parser_yields_cards_before_the_body_ends():
+    body = (FIXTURES_DIR / "live_page.html").read_bytes()
+    chunks = [body[i : i + 4096] for i in range(0, len(body), 4096)]
+    fed = []
+
+    def feed():
+        for chunk in chunks:
+            fed.append(chunk)
+            yield chunk
+
+    cards = iter_cards_streaming(feed(), "utf-8")
+    first = next(cards)
+
+    assert first == parse_cards(body, engine="bs4", encoding="utf-8")[0]
+    assert len(fed) < len(chunks)
+    assert len(list(cards)) == 29
+
+
+@pytest.mark.parametrize("engine", ["lxml", "stream", "bs4"])
+def test_engines_skip_malformed_cards_and_duplicates(engine):
+    html = """
+    <a href="/players/1-a/26-1/"><img alt="A - 80 - Rare" src="/a.webp"></a>
+    <a href="/players/1-a/26-1/"><img alt="A - 80 - Rare" src="/a.webp"></a>
+    <a href="/players/2-b/26-2/"><img alt="B - ?? - Rare" src="/b.webp"></a>
+    <a href="/players/3-c/26-3/"><img src="/c.webp"></a>
+    <a href="/players/4-d/26-4/"><span><img alt="D - 81 - Icon" data-src="/d.webp"></span></a>
+    """
+    cards = parse_cards(html, engine=engine)
+    assert [card.card_slug for card in cards] == ["1-a/26-1", "4-d/26-4"]
+    assert cards[1].image_url == "https://www.fut.gg/d.webp"
+    assert parse_cards("", engine=engine) == []
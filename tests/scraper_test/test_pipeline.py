@@ -0,0 +1,84 @@
+"""
+Tests for the staged fetch → parse → store pipeline.
+"""
+
+import threading
+
+import pytest
+
+from scraper.parser import ParseError
+from scraper.pipeline import STOP, Stage, run_pipeline
+
+
+def test_pipeline_keeps_source_order():
+    stored = []
+
+    stats = run_pipeline(
+        range(50),
+        [Stage("double", lambda n: n * 2), Stage("store", stored.append)],
+        queue_size=2,
+    )
+
+    assert stored == [n * 2 for n in range(50)]
+    assert [stage.items for stage in stats.stages] == [50, 50, 50]
+
+
+def test_stop_drains_later_stages_and_stops_the_source():
+    produced = []
+    stored = []
+
+    def source():
+        for n in range(1000):
+            produced.append(n)
+            yield n
+
+    def parse(n):
+        return STOP if n == 5 else n
+
+    run_pipeline(source(), [Stage("parse", parse), Stage("store", stored.append)], queue_size=2)
+
+    assert stored == [0, 1, 2, 3, 4]
+    # Bounded queues keep the source from running far ahead of the parser.
+    assert len(produced) < 20
+
+
+def test_isolated_errors_only_drop_their_item():
+    stored = []
+
+    def parse(n):
+        if n == 2:
+            raise ParseError("broken page")
+        return n
+
+    stats = run_pipeline(
+        range(5),
+        [Stage("parse", parse, isolate=(ParseError,)), Stage("store", stored.append)],
+        queue_size=1,
+    )
+
+    assert stored == [0, 1, 3, 4]
+    assert stats.stages[1].failures == 1
+
+
+def test_unexpected_error_stops_every_stage_and_is_raised():
+    def store(n):
+        if n == 3:
+            raise RuntimeError("database gone")
+
+    threads_before = threading.active_count()
+    with pytest.raises(RuntimeError, match="database gone"):
+        run_pipeline(range(10_000), [Stage("parse", lambda n: n), Stage("store", store)], queue_size=1)
+    assert threading.active_count() == threads_before
+
+
+def test_source_failure_is_raised_after_fetched_items_are_stored():
+    stored = []
+
+    def source():
+        yield 1
+        yield 2
+        raise ConnectionError("network down")
+
+    with pytest.raises(ConnectionError):
+        run_pipeline(source(), [Stage("parse", lambda n: n), Stage("store", stored.append)], queue_size=4)
+    assert stored == [1, 2]
@@ -0,0 +1,68 @@
+"""
+Unit tests for the adaptive (AIMD) rate controller.
+"""
+
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scraper.ratelimit import AdaptiveRateController, parse_retry_after
+
+
+def make_controller(**overrides):
+    options = dict(initial_rate=1.0, min_rate=0.25, max_rate=2.0, increase=0.5)
+    options.update(overrides)
+    return AdaptiveRateController(**options)
+
+
+def test_rate_increases_additively_up_to_max():
+    controller = make_controller()
+    controller.record(200, 0.1)
+    assert controller.rate == pytest.approx(1.5)
+    controller.record(304, 0.1)
+    controller.record(200, 0.1)
+    assert controller.rate == pytest.approx(2.0)
+
+
+def test_rate_halves_on_429_and_5xx_down_to_min():
+    controller = make_controller()
+    controller.record(429, 0.1)
+    assert controller.rate == pytest.approx(0.5)
+    controller.record(503, 0.1)
+    assert controller.rate == pytest.approx(0.25)
+    controller.record(500, 0.1)
+    assert controller.rate == pytest.approx(0.25)
+
+
+def test_latency_spike_backs_off():
+    controller = make_controller(max_rate=10.0)
+    for _ in range(4):
+        controller.record(200, 0.2)
+    before = controller.rate
+    controller.record(200, 2.0)
+    assert controller.rate == pytest.approx(before / 2)
+
+
+def test_acquire_spaces_requests_and_honors_retry_after(mocker):
+    clock = {"now": 100.0}
+    mocker.patch("scraper.ratelimit.time.monotonic", side_effect=lambda: clock["now"])
+    sleeps = []
+    mocker.patch("scraper.ratelimit.time.sleep", side_effect=sleeps.append)
+
+    controller = make_controller(initial_rate=2.0)
+    controller.acquire()
+    controller.acquire()
+    assert sleeps == [pytest.approx(0.5)]
+
+    controller.record(429, 0.1, retry_after=30.0)
+    controller.acquire()
+    assert sleeps[-1] == pytest.approx(30.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    later = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 55 <= parse_retry_after(format_datetime(later, usegmt=True)) <= 60
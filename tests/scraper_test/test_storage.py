@@ -13,6 +13,7 @@ from scraper.storage import (
     upsert_players_and_cards,
     normalize_duplicate_display_names,
     assign_base_cards,
+    recount_player_cards,
 )
 from scraper.models import Player, PlayerCard
 from scraper.storage.connection import session_scope
@@ -59,13 +60,475 @@ def test_card_payload_immutable():
         payload.rating = 90
 
 
-def test_normalize_duplicate_display_names():
-    # This test requires a test database setup
-    # You'd create duplicate players, run the function, then verify
-    pass  # Implement when you have test DB fixtures
+def test_card_payload_shares_repeated_strings_and_url_prefixes(sample_payloads):
+    import pickle
 
+    first, second = sample_payloads
+    assert first.player_slug is second.player_slug
+    assert first.card_url == "https://www.fut.gg/players/123-test-player/26-123/"
+    assert second.image_url == "https://example.com/image2.webp"
+    assert first._image_url_prefix is second._image_url_prefix
+    assert not hasattr(first, "__dict__")
 
-def test_assign_base_cards_priority():
-    # This test requires a test database setup
-    # Create a player with multiple cards, verify base card selection
-    pass  # Implement when you have test DB fixtures
\ No newline at end of file
+    restored = pickle.loads(pickle.dumps(sample_payloads))
+    assert restored == sample_payloads
+    assert restored[0].version is first.version
+    assert len({first, restored[0]}) == 1
+
+
+def test_card_payload_replace(sample_payloads):
+    first = sample_payloads[0]
+    changed = first.replace(rating=90, in_club=True)
+
+    assert (changed.rating, changed.in_club) == (90, True)
+    assert changed.card_url == first.card_url
+    assert changed.replace(rating=85, in_club=False) == first
+    with pytest.raises(TypeError):
+        first.replace(colour="gold")
+
+
+def test_normalize_duplicate_display_names(storage_db):
+    def card(player_slug, display_name, card_id):
+        return CardPayload(
+            player_slug=player_slug,
+            display_name=display_name,
+            card_slug=f"{card_id}-{player_slug}/26-{card_id}",
+            name=display_name,
+            rating=80,
+            version="Rare",
+            card_url=f"https://www.fut.gg/players/{card_id}-{player_slug}/26-{card_id}/",
+            image_url=None,
+        )
+
+    first = upsert_players_and_cards(
+        [card("ronaldo", "Ronaldo", 1), card("unique-player", "Unique", 2)]
+    )
+    second = upsert_players_and_cards(
+        [card("cristiano-ronaldo", "Ronaldo", 3), card("ronald-araujo", "Araujo", 4)]
+    )
+
+    # Only names carried by the given players are considered.
+    assert normalize_duplicate_display_names([second.inserted["ronald-araujo"]]) == 0
+    assert normalize_duplicate_display_names(second.inserted.values()) == 1
+    assert normalize_duplicate_display_names() == 0
+
+    with session_scope() as session:
+        players = session.query(Player).all()
+        names = {player.slug: player.display_name for player in players}
+        search_names = {player.slug: player.search_name for player in players}
+    assert names == {
+        "ronaldo": "Ronaldo",
+        "unique-player": "Unique",
+        "cristiano-ronaldo": "Cristiano Ronaldo",
+        "ronald-araujo": "Araujo",
+    }
+    assert search_names["cristiano-ronaldo"] == "cristiano ronaldo"
+    assert search_names["ronald-araujo"] == "araujo"
+    assert set(first.inserted) == {"ronaldo", "unique-player"}
+
+
+def test_refresh_search_names_fills_rows_missing_them(storage_db):
+    from sqlalchemy import update
+
+    from scraper.storage import refresh_search_names
+
+    with session_scope() as session:
+        session.add_all(
+            [
+                Player(slug="vinicius-junior", display_name="Vinícius Júnior"),
+                Player(slug="ronaldo", display_name="Ronaldo"),
+            ]
+        )
+    with session_scope() as session:
+        # As left by ALTER TABLE ... ADD COLUMN search_name ... DEFAULT ''.
+        session.execute(
+            update(Player).where(Player.slug == "vinicius-junior").values(search_name="")
+        )
+
+        session.execute(update(Player).values(updated_at=datetime(2020, 1, 1)))
+
+    assert refresh_search_names() == 1
+    assert refresh_search_names() == 0
+    with session_scope() as session:
+        players = {
+            player.slug: (player.search_name, player.updated_at.year)
+            for player in session.query(Player)
+        }
+    # updated_at is bumped so the API's name index revalidation notices the rewrite.
+    assert players["vinicius-junior"][0] == "vinicius junior"
+    assert players["vinicius-junior"][1] > 2020
+    assert players["ronaldo"] == ("ronaldo", 2020)
+
+
+def _card(player_slug, card_id, rating, version):
+    return CardPayload(
+        player_slug=player_slug,
+        display_name=player_slug.replace("-", " ").title(),
+        card_slug=f"1-{player_slug}/26-{card_id}",
+        name=player_slug.replace("-", " ").title(),
+        rating=rating,
+        version=version,
+        card_url=f"https://www.fut.gg/players/1-{player_slug}/26-{card_id}/",
+        image_url=f"https://example.com/{card_id}.webp",
+    )
+
+
+def test_assign_base_cards_priority(storage_db):
+    upsert_players_and_cards(
+        [
+            _card("priority-player", 3, 90, "Icon"),
+            _card("priority-player", 2, 88, "Rare"),
+            _card("priority-player", 1, 70, "Team of the Week"),
+            _card("fallback-player", 5, 91, "Team of the Week"),
+            _card("fallback-player", 4, 84, "Future Stars"),
+        ]
+    )
+
+    assert assign_base_cards() == 2
+    with session_scope() as session:
+        base = {
+            player.slug: (player.base_card_slug, player.base_card_rating, player.base_card_version)
+            for player in session.query(Player)
+        }
+    assert base == {
+        "priority-player": ("1-priority-player/26-2", 88, "Rare"),
+        "fallback-player": ("1-fallback-player/26-4", 84, "Future Stars"),
+    }
+
+    # Unchanged base cards are not rewritten.
+    assert assign_base_cards() == 0
+
+
+def test_assign_base_cards_limited_to_dirty_players(storage_db):
+    written = upsert_players_and_cards(
+        [_card("dirty-player", 1, 80, "Rare"), _card("clean-player", 2, 81, "Rare")]
+    )
+
+    assert assign_base_cards([written.touched["dirty-player"]]) == 1
+    assert assign_base_cards([]) == 0
+    with session_scope() as session:
+        base = {player.slug: player.base_card_slug for player in session.query(Player)}
+    assert base == {"dirty-player": "1-dirty-player/26-1", "clean-player": None}
+
+def test_validator_store_round_trip(storage_db):
+    from scraper.storage import ValidatorStore
+
+    store = ValidatorStore.load()
+    assert store.conditional_headers("https://example.com/?page=2") == {}
+
+    store.remember("https://example.com/?page=2", {"ETag": 'W/"v1"'})
+    store.remember("https://example.com/?page=3", {})
+    assert store.save() == 1
+
+    reloaded = ValidatorStore.load()
+    assert reloaded.conditional_headers("https://example.com/?page=2") == {
+        "If-None-Match": 'W/"v1"'
+    }
+    assert reloaded.conditional_headers("https://example.com/?page=3") == {}
+
+    reloaded.remember("https://example.com/?page=2", {"ETag": 'W/"v2"'})
+    reloaded.save()
+    assert ValidatorStore.load().conditional_headers("https://example.com/?page=2") == {
+        "If-None-Match": 'W/"v2"'
+    }
+
+
+def test_validator_store_keeps_page_count_with_remembered_validators(storage_db):
+    from scraper.storage import ValidatorStore
+
+    store = ValidatorStore.load()
+    store.note_page_count("https://example.com/", 12)
+    store.note_page_count("https://example.com/?page=2", 12)
+    # Only page 1 was stored; page 2's body (and its count) was dropped.
+    store.remember("https://example.com/", {"ETag": 'W/"v1"'})
+    assert store.save() == 1
+
+    reloaded = ValidatorStore.load()
+    assert reloaded.page_count("https://example.com/") == 12
+    assert reloaded.page_count("https://example.com/?page=2") is None
+
+    # New validators without a parsed count replace the stored one.
+    reloaded.remember("https://example.com/", {"ETag": 'W/"v2"'})
+    reloaded.save()
+    assert ValidatorStore.load().page_count("https://example.com/") is None
+
+
+def test_fingerprint_store_round_trip(storage_db):
+    from scraper.fingerprint import PageFingerprint
+    from scraper.storage import FingerprintStore
+
+    url = "https://example.com/?page=2"
+    fingerprint = PageFingerprint("abc", ("1-a/26-1", "2-b/26-2"))
+
+    store = FingerprintStore.load()
+    assert not store.is_unchanged(url, fingerprint)
+    store.remember(url, fingerprint)
+    assert store.save() == 1
+
+    reloaded = FingerprintStore.load()
+    assert reloaded.is_unchanged(url, fingerprint)
+    assert reloaded.card_slugs(url) == ("1-a/26-1", "2-b/26-2")
+    assert not reloaded.is_unchanged(url, PageFingerprint("def", fingerprint.card_slugs))
+    # A page without cards is never treated as unchanged, so the stop
+    # condition still sees it.
+    assert not reloaded.is_unchanged(url, PageFingerprint("abc", ()))
+
+
+def test_touch_cards_seen_updates_only_listed_cards(storage_db, sample_payloads):
+    from scraper.storage import touch_cards_seen
+
+    upsert_players_and_cards(sample_payloads)
+    old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    with session_scope() as session:
+        for card in session.query(PlayerCard):
+            card.last_seen_at = old
+
+    assert touch_cards_seen(["123-test-player/26-123", "missing/26-0"]) == 1
+
+    with session_scope() as session:
+        seen = {
+            card.card_slug: card.last_seen_at.replace(tzinfo=timezone.utc) > old
+            for card in session.query(PlayerCard)
+        }
+    assert seen == {"123-test-player/26-123": True, "123-test-player/26-456": False}
+
+
+def test_known_cards_match_on_rating_version_and_image(storage_db, sample_payloads):
+    from scraper.storage import KnownCards
+
+    assert len(KnownCards.load()) == 0
+    upsert_players_and_cards(sample_payloads)
+
+    known = KnownCards.load()
+    assert len(known) == 2
+    assert known.all_known(sample_payloads)
+    assert not known.is_known(sample_payloads[0].replace(rating=86))
+    assert not known.is_known(sample_payloads[0].replace(image_url=None))
+    assert not known.is_known(sample_payloads[0].replace(card_slug="123-test-player/26-789"))
+
+
+def test_encode_copy_rows_round_trips_through_csv(sample_payloads):
+    import csv
+    import io
+
+    from scraper.storage.copy_ingest import encode_copy_rows
+
+    card = CardPayload(
+        player_slug="quote-player",
+        display_name='Quote "Q" Player',
+        card_slug="9-quote-player/26-9",
+        name='Quote "Q" Player',
+        rating=80,
+        version="Team, of the Week",
+        card_url="https://www.fut.gg/players/9-quote-player/26-9/",
+        image_url=None,
+    )
+    rows = list(csv.reader(io.StringIO(encode_copy_rows([*sample_payloads, card], start=5))))
+
+    assert [row[0] for row in rows] == ["5", "6", "7"]
+    assert rows[0][1:] == [
+        "test-player",
+        "Test Player",
+        "test player",
+        "123-test-player/26-123",
+        "Test Player",
+        "85",
+        "Rare",
+        "https://www.fut.gg/players/123-test-player/26-123/",
+        "https://example.com/image.webp",
+        "False",
+    ]
+    assert rows[2][2] == 'Quote "Q" Player'
+    assert rows[2][3] == 'quote "q" player'
+    assert rows[2][7] == "Team, of the Week"
+    assert rows[2][9] == ""
+
+
+def test_copy_ingest_requires_postgresql(storage_db):
+    from scraper.storage import CopyIngest
+
+    with pytest.raises(RuntimeError, match="PostgreSQL"):
+        with CopyIngest(storage_db):
+            pass
+
+
+def test_batch_writer_flushes_on_page_and_card_thresholds(storage_db, sample_payloads):
+    from scraper.storage import BatchWriter
+
+    first, second = sample_payloads
+    stored = []
+
+    def card_count():
+        with session_scope() as session:
+            return session.query(PlayerCard).count()
+
+    with BatchWriter(max_pages=2, max_cards=3) as writer:
+        assert writer.add([first], on_stored=lambda: stored.append(1)) == 0
+        assert card_count() == 0 and stored == []
+
+        assert writer.add([second], on_stored=lambda: stored.append(2)) == 2
+        assert card_count() == 2 and stored == [1, 2]
+
+        assert writer.add([first, second, first], on_stored=lambda: stored.append(3)) == 3
+        assert stored == [1, 2, 3]
+
+        writer.add([second], on_stored=lambda: stored.append(4))
+        assert stored == [1, 2, 3]
+        assert writer.finish() == 6
+
+    assert stored == [1, 2, 3, 4]
+    assert writer.flushes == 3
+
+
+def test_batch_writer_run_transaction_commits_once_at_finish(storage_db, sample_payloads):
+    from scraper.storage import BatchWriter
+
+    stored = []
+    with BatchWriter(max_pages=1, run_transaction=True) as writer:
+        writer.add(sample_payloads[:1], on_stored=lambda: stored.append(1))
+        writer.add(sample_payloads[1:], on_stored=lambda: stored.append(2))
+        assert writer.flushes == 2
+        assert stored == []
+        writer.finish()
+
+    assert stored == [1, 2]
+    with session_scope() as session:
+        assert session.query(PlayerCard).count() == 2
+
+
+def test_batch_writer_run_transaction_rolls_back_on_error(storage_db, sample_payloads):
+    from scraper.storage import BatchWriter
+
+    with pytest.raises(RuntimeError):
+        with BatchWriter(run_transaction=True) as writer:
+            writer.add(sample_payloads)
+            raise RuntimeError("scrape failed")
+
+    with session_scope() as session:
+        assert session.query(Player).count() == 0
+
+
+def test_player_id_cache_learns_inserted_players(storage_db, sample_payloads):
+    from scraper.storage import PlayerIdCache
+
+    cache = PlayerIdCache.load()
+    assert len(cache) == 0
+
+    upsert_players_and_cards(sample_payloads, cache)
+    assert len(cache) == 1
+
+    with session_scope() as session:
+        player_id = session.query(Player.id).filter_by(slug="test-player").scalar()
+        # Known slugs resolve from memory; unknown ones fall back to the database.
+        assert cache.resolve(session, ["test-player", "missing"]) == {"test-player": player_id}
+    assert PlayerIdCache.load().resolve(None, ["test-player"]) == {"test-player": player_id}
+
+    with session_scope() as session:
+        cards = session.query(PlayerCard).all()
+        assert {card.player_id for card in cards} == {player_id}
+        assert session.get(Player, player_id).any_in_club is False
+
+
+def test_card_counters_follow_upserts_toggles_and_deletes(storage_db, sample_payloads):
+    upsert_players_and_cards(sample_payloads)
+    upsert_players_and_cards(sample_payloads)  # conflicts do not double count
+
+    def counters():
+        with session_scope() as session:
+            player = session.query(Player).one()
+            return player.total_cards, player.in_club_count
+
+    assert counters() == (2, 0)
+    with session_scope() as session:
+        session.query(PlayerCard).filter_by(card_slug="123-test-player/26-123").one().in_club = True
+    assert counters() == (2, 1)
+    with session_scope() as session:
+        session.delete(session.query(PlayerCard).filter_by(card_slug="123-test-player/26-123").one())
+    assert counters() == (1, 0)
+
+    assert recount_player_cards() == 0
+    with session_scope() as session:
+        session.query(Player).one().total_cards = 7
+    assert recount_player_cards() == 1
+    assert counters() == (1, 0)
+
+
+def test_prune_stale_cards_archives_cards_unseen_for_k_full_runs(storage_db):
+    from scraper.models import PlayerCardArchive
+    from scraper.storage import (
+        prune_stale_cards,
+        record_run_finish,
+        record_run_start,
+        touch_cards_seen,
+    )
+
+    upsert_players_and_cards(
+        [
+            _card("kept-player", 1, 80, "Rare"),
+            _card("kept-player", 2, 85, "Icon"),
+            _card("gone-player", 3, 75, "Rare"),
+        ]
+    )
+    assign_base_cards()
+    old = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    with session_scope() as session:
+        for card in session.query(PlayerCard).filter(PlayerCard.card_slug != "1-kept-player/26-2"):
+            card.last_seen_at = old
+            card.in_club = True
+
+    record_run_finish(record_run_start("full"))
+    record_run_start("full")  # unfinished runs do not count
+    record_run_finish(record_run_start("incremental"))
+    assert prune_stale_cards(2) == 0
+
+    record_run_finish(record_run_start("full"))
+    touch_cards_seen(["1-kept-player/26-2"])
+    assert prune_stale_cards(2) == 2
+
+    with session_scope() as session:
+        assert [card.card_slug for card in session.query(PlayerCard)] == ["1-kept-player/26-2"]
+        assert {card.card_slug for card in session.query(PlayerCardArchive)} == {
+            "1-kept-player/26-1",
+            "1-gone-player/26-3",
+        }
+        players = {player.slug: player for player in session.query(Player)}
+        kept, gone = players["kept-player"], players["gone-player"]
+        assert (kept.base_card_slug, kept.any_in_club, kept.total_cards) == (
+            "1-kept-player/26-2",
+            False,
+            1,
+        )
+        assert (gone.base_card_slug, gone.any_in_club, gone.total_cards) == (None, False, 0)
+
+
+def test_prune_stale_cards_keeps_cards_inserted_during_the_run(storage_db):
+    from scraper.models import PlayerCardArchive
+    from scraper.storage import prune_stale_cards, record_run_finish, record_run_start
+
+    run_id = record_run_start("full")
+    upsert_players_and_cards([_card("new-player", 1, 80, "Rare")])
+    record_run_finish(run_id)
+
+    assert prune_stale_cards(1) == 0
+    with session_scope() as session:
+        assert session.query(PlayerCard).count() == 1
+        assert session.query(PlayerCardArchive).count() == 0
+
+
+def test_engine_profiles_tune_the_engine(caplog):
+    import logging
+
+    from scraper.storage.connection import PROFILES, create_profile_engine, get_profile
+
+    assert get_profile("api").liveness == "pre_ping"
+    assert get_profile("scraper").insert_page_size > get_profile("api").insert_page_size
+    with pytest.raises(ValueError, match="Unknown engine profile"):
+        get_profile("batch")
+
+    with caplog.at_level(logging.INFO, logger="ScrapeFutGG"):
+        engine = create_profile_engine("sqlite://", PROFILES["api"])
+    try:
+        assert engine.pool._pre_ping is True
+        assert "'api'" in caplog.text and "pre-ping" in caplog.text
+    finally:
+        engine.dispose()
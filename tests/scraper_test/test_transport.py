@@ -0,0 +1,104 @@
+"""
+Unit tests for the tuned HTTP transport, against a local keep-alive server.
+"""
+
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scraper.transport import TransportStats, TunedSession, mount_transport
+
+BODY = ("<a href='/players/1-a/26-1/'>card</a>" * 2000).encode("utf-8")
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        payload = gzip.compress(BODY)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize("backend", ["requests", "httpx"])
+def test_session_reuses_connections_and_counts_bytes(server_url, backend):
+    if backend == "httpx":
+        pytest.importorskip("h2")
+    session = TunedSession()
+    assert (
+        mount_transport(
+            session, backend=backend, pool_size=2, keepalive_expiry=30, tcp_keepidle=30
+        )
+        == backend
+    )
+
+    before = session.transport_stats()
+    for _ in range(3):
+        response = session.get(server_url, timeout=5)
+        assert response.content == BODY
+    stats = session.transport_stats() - before
+    session.close()
+
+    assert stats.requests == 3
+    assert stats.decoded_bytes == 3 * len(BODY)
+    assert 0 < stats.wire_bytes < stats.decoded_bytes
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 2
+    assert stats.tls_handshakes == 0
+
+
+def test_requests_backend_counts_connections_of_evicted_pools():
+    """Connections opened by pools the pool manager evicted still count."""
+    servers = []
+    urls = []
+    for _ in range(6):  # more hosts than the adapter's 4 cached pools
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        urls.append(f"http://127.0.0.1:{server.server_port}/")
+    session = TunedSession()
+    mount_transport(
+        session, backend="requests", pool_size=2, keepalive_expiry=30, tcp_keepidle=30
+    )
+    try:
+        before = session.transport_stats()
+        for url in urls:
+            assert session.get(url, timeout=5).content == BODY
+        stats = session.transport_stats() - before
+    finally:
+        session.close()
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    assert stats.connections_opened == 6
+    assert stats.connections_reused == 0
+
+
+def test_transport_stats_difference():
+    later = TransportStats(requests=5, wire_bytes=50, decoded_bytes=500, connections_opened=2)
+    earlier = TransportStats(requests=2, wire_bytes=20, decoded_bytes=200, connections_opened=1)
+    delta = later - earlier
+    assert delta == TransportStats(3, 30, 300, 1, 0)
+    assert delta.connections_reused == 2